@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Author: Michal Szymanski <misiektoja-github@rm-rf.ninja>
+v1.0
+
+Offline benchmark harness for spotify_profile_monitor:
+https://github.com/misiektoja/spotify_profile_monitor/
+
+It starts a local HTTP stub serving synthetic (or recorded) Spotify responses for profile-view, followers, following,
+playlists and tracks endpoints, then runs the monitoring cycle and the -l / -i / -x modes against it at configurable
+scale (users x playlists x tracks) and reports cycle time, requests per cycle, peak RSS and CPU time. The timestamps
+mode measures added_at handling of a single --tracks long playlist without any HTTP traffic.
+
+No real Spotify requests are sent and no secrets are needed.
+
+Usage:
+
+python3 spotify_profile_monitor_benchmark.py --users 2 --playlists 20 --tracks 500 --cycles 5
+python3 spotify_profile_monitor_benchmark.py --modes cycle,list --churn 10 --json
+python3 spotify_profile_monitor_benchmark.py --modes timestamps --tracks 10000 --cycles 10
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ("cycle", "list", "info", "liked", "timestamps")
+
+# Page size used by the stub for playlist and liked tracks
+TRACKS_PAGE_SIZE = 100
+
+
+# Returns synthetic Spotify user ID for user with specified index
+def bench_user_id(idx):
+    return f"benchuser{idx:04d}"
+
+
+# Returns synthetic 22 characters long Spotify playlist ID
+def bench_playlist_id(user_idx, playlist_idx):
+    return f"p{user_idx:05d}x{playlist_idx:06d}".ljust(22, "0")
+
+
+# Class used to serve synthetic Spotify API responses
+class StubState(object):
+
+    def __init__(self, playlists, tracks, followers, churn, recorded_dir=""):
+        self.playlists = playlists
+        self.tracks = tracks
+        self.followers = followers
+        self.churn = churn
+        self.recorded_dir = recorded_dir
+        self.generation = 0
+        self.requests = 0
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def user_index(self, user_id):
+        match = re.search(r"(\d+)$", user_id)
+        return int(match.group(1)) if match else 0
+
+    def profile(self, user_id, playlist_limit):
+        user_idx = self.user_index(user_id)
+        count = min(self.playlists, playlist_limit) if playlist_limit > 0 else 0
+        return {
+            "uri": f"spotify:user:{user_id}",
+            "name": f"Bench User {user_id}",
+            "image_url": "",
+            "followers_count": self.followers,
+            "following_count": self.followers,
+            "public_playlists": [{
+                "uri": f"spotify:playlist:{bench_playlist_id(user_idx, i)}",
+                "name": f"Bench playlist {i}",
+                "owner_uri": f"spotify:user:{user_id}",
+                "owner_name": f"Bench User {user_id}",
+                "followers_count": i,
+            } for i in range(count)],
+            "recently_played_artists": [],
+        }
+
+    def profiles(self):
+        start = self.generation * self.churn
+        return {"profiles": [{"uri": f"spotify:user:benchfollower{i}", "name": f"Bench follower {i}"} for i in range(start, start + self.followers)]}
+
+    def playlist_tracks_total(self, playlist_id):
+        # With churn enabled the first playlist of every user grows on each cycle
+        total = self.tracks
+        if re.match(r"^p\d{5}x0{6}", playlist_id):
+            total += self.generation * self.churn
+        return total
+
+    def playlist(self, playlist_id):
+        user_idx = int(playlist_id[1:6]) if playlist_id[1:6].isdigit() else 0
+        user_id = bench_user_id(user_idx)
+        return {
+            "name": f"Bench playlist {playlist_id}",
+            "description": "Synthetic playlist served by the benchmark stub",
+            "collaborative": False,
+            "owner": {"display_name": f"Bench User {user_id}", "uri": f"spotify:user:{user_id}", "external_urls": {"spotify": f"https://open.spotify.com/user/{user_id}"}},
+            "followers": {"total": 1},
+            "external_urls": {"spotify": f"https://open.spotify.com/playlist/{playlist_id}"},
+            "tracks": {"total": self.playlist_tracks_total(playlist_id)},
+            "images": [],
+        }
+
+    def tracks_page(self, path, total, offset, owner_id, seed):
+        items = []
+        for i in range(offset, min(offset + TRACKS_PAGE_SIZE, total)):
+            items.append({
+                "added_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1600000000 + i * 3600)),
+                "added_by": {"id": owner_id, "uri": f"spotify:user:{owner_id}"},
+                "track": {
+                    "name": f"Track {seed} {i}",
+                    "uri": f"spotify:track:{seed[:10]}{i:012d}",
+                    "duration_ms": 180000 + i,
+                    "artists": [{"name": f"Artist {i % 50}", "uri": f"spotify:artist:bench{i % 50:017d}"}],
+                },
+            })
+        next_offset = offset + TRACKS_PAGE_SIZE
+        next_url = f"https://api.spotify.com{path}?offset={next_offset}&limit={TRACKS_PAGE_SIZE}" if next_offset < total else None
+        return {"items": items, "total": total, "next": next_url}
+
+    def recorded(self, path):
+        if not self.recorded_dir:
+            return None
+        file_path = os.path.join(self.recorded_dir, path.strip("/") + ".json")
+        if os.path.isfile(file_path):
+            with open(file_path, encoding="utf-8") as f:
+                return json.load(f)
+        return None
+
+    def respond(self, path, query):
+        params = parse_qs(query)
+        offset = int((params.get("offset") or ["0"])[0])
+
+        recorded = self.recorded(path)
+        if recorded is not None:
+            return 200, recorded
+
+        match = re.match(r"^/user-profile-view/v3/profile/([^/]+)/(followers|following)$", path)
+        if match:
+            return 200, self.profiles()
+
+        match = re.match(r"^/user-profile-view/v3/profile/([^/]+)$", path)
+        if match:
+            return 200, self.profile(match.group(1), int((params.get("playlist_limit") or ["0"])[0]))
+
+        match = re.match(r"^/v1/playlists/([^/]+)/tracks$", path)
+        if match:
+            playlist_id = match.group(1)
+            owner_id = bench_user_id(int(playlist_id[1:6]) if playlist_id[1:6].isdigit() else 0)
+            return 200, self.tracks_page(path, self.playlist_tracks_total(playlist_id), offset, owner_id, playlist_id)
+
+        match = re.match(r"^/v1/playlists/([^/]+)$", path)
+        if match:
+            return 200, self.playlist(match.group(1))
+
+        if path == "/v1/me/tracks":
+            return 200, self.tracks_page(path, self.tracks, offset, bench_user_id(0), "liked")
+
+        return 404, {"error": {"status": 404, "message": "Not found"}}
+
+
+# Starts local HTTP stub in a background thread
+def start_stub(state):
+
+    class StubHandler(BaseHTTPRequestHandler):
+
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+
+            if parsed.path == "/__bench/stats":
+                self.send_json(200, {"requests": state.requests, "bytes": state.bytes, "generation": state.generation}, count=False)
+                return
+
+            if parsed.path == "/__bench/tick":
+                with state.lock:
+                    state.generation += 1
+                self.send_json(200, {"generation": state.generation}, count=False)
+                return
+
+            with state.lock:
+                status, payload = state.respond(parsed.path, parsed.query)
+            self.send_json(status, payload)
+
+        def send_json(self, status, payload, count=True):
+            body = json.dumps(payload).encode("utf-8")
+            if count:
+                with state.lock:
+                    state.requests += 1
+                    state.bytes += len(body)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Returns peak RSS of the current process in MB
+def get_peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+# Class used to stop the monitoring loop after the requested number of cycles
+class BenchmarkDone(BaseException):
+    pass
+
+
+# Runs single benchmark mode inside a worker process and prints results as JSON
+def run_worker(args):
+    sys.path.insert(0, REPO_DIR)
+    import requests
+    from requests.adapters import HTTPAdapter
+    import spotify_profile_monitor as monitor
+
+    stub_url = args.stub_url
+    stub = urlparse(stub_url)
+
+    # Redirect all requests sent via the tool's shared session to the local stub
+    class StubAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            parsed = urlparse(request.url)
+            request.url = parsed._replace(scheme=stub.scheme, netloc=stub.netloc).geturl()
+            return super().send(request, **kwargs)
+
+    adapter = StubAdapter(max_retries=monitor.retry, pool_connections=10, pool_maxsize=10)
+    monitor.SESSION.mount("https://", adapter)
+    monitor.SESSION.mount("http://", adapter)
+
+    monitor.TOKEN_SOURCE = "cookie"
+    monitor.DETECT_CHANGES_IN_PLAYLISTS = True
+    monitor.DETECT_CHANGED_PROFILE_PIC = False
+    monitor.PROFILE_NOTIFICATION = False
+    monitor.FOLLOWERS_FOLLOWINGS_NOTIFICATION = False
+    monitor.ERROR_NOTIFICATION = False
+    monitor.PLAYLISTS_LIMIT = args.playlists
+    monitor.FILE_SUFFIX = args.user
+    monitor.LOCAL_TIMEZONE = "UTC"
+    monitor.refresh_credentials_pools()
+
+    # Token retrieval is not benchmarked, it needs real Spotify endpoints
+    monitor.spotify_get_access_token_from_sp_dc = lambda *a, **kw: "bench-token"
+    monitor.spotify_get_access_token_from_oauth_app = lambda *a, **kw: "bench-token"
+
+    def stub_stats(action="stats"):
+        return requests.get(f"{stub_url}/__bench/{action}", timeout=5).json()
+
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+
+    samples = []
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    try:
+        if args.worker == "cycle":
+
+            def bench_next_check_delay(user_uri_id, interval):
+                samples.append((time.perf_counter(), time.process_time(), stub_stats()["requests"]))
+                if len(samples) > args.cycles:
+                    raise BenchmarkDone()
+                stub_stats("tick")
+                return 0
+
+            monitor.get_next_check_delay = bench_next_check_delay
+            try:
+                monitor.spotify_profile_monitor_uri(args.user, "", [])
+            except BenchmarkDone:
+                pass
+
+        elif args.worker == "timestamps":
+
+            # Timestamp handling for a single playlist of --tracks tracks (parsing, min / max added_at, localized
+            # datetimes), measured in isolation from HTTP traffic
+            added_at_list = [time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1600000000 + i * 3600)) for i in range(args.tracks)]
+            samples.append((time.perf_counter(), time.process_time(), 0))
+            for _ in range(args.cycles):
+                added_at_ts_list = [monitor.convert_iso_str_to_ts(added_at) for added_at in added_at_list]
+                min(added_at_ts_list), max(added_at_ts_list)
+                [monitor.convert_iso_str_to_datetime(added_at) for added_at in added_at_list]
+                samples.append((time.perf_counter(), time.process_time(), 0))
+
+        else:
+            before = stub_stats()["requests"]
+            start = (time.perf_counter(), time.process_time())
+            user_idx = int(args.user[-4:])
+            if args.worker == "list":
+                for i in range(args.playlists):
+                    monitor.spotify_list_tracks_for_playlist("bench-token", bench_playlist_id(user_idx, i), "")
+            elif args.worker == "info":
+                monitor.spotify_get_user_details("bench-token", args.user)
+            elif args.worker == "liked":
+                monitor.spotify_list_liked_tracks("bench-token", "")
+            samples = [start + (before,), (time.perf_counter(), time.process_time(), stub_stats()["requests"])]
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+
+    # For the monitoring loop the first sample marks the end of the initial fetch, so only full cycles are measured
+    durations = [b[0] - a[0] for a, b in zip(samples, samples[1:])]
+    cpu = [b[1] - a[1] for a, b in zip(samples, samples[1:])]
+    requests_count = [b[2] - a[2] for a, b in zip(samples, samples[1:])]
+
+    result = {
+        "mode": args.worker,
+        "user": args.user,
+        "runs": len(durations),
+        "wall_total": round(time.perf_counter() - wall_start, 4),
+        "cpu_total": round(time.process_time() - cpu_start, 4),
+        "time_avg": round(sum(durations) / len(durations), 4) if durations else None,
+        "time_max": round(max(durations), 4) if durations else None,
+        "cpu_avg": round(sum(cpu) / len(cpu), 4) if cpu else None,
+        "requests_avg": round(sum(requests_count) / len(requests_count), 1) if requests_count else None,
+        "peak_rss_mb": get_peak_rss_mb(),
+    }
+    print(json.dumps(result))
+
+
+# Runs worker process for every requested mode and user and prints a summary
+def run_benchmark(args):
+    state = StubState(args.playlists, args.tracks, args.followers, args.churn, args.recorded)
+    server = start_stub(state)
+    stub_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    for mode in modes:
+        if mode not in MODES:
+            print(f"* Error: unknown mode '{mode}', use one of: {', '.join(MODES)}")
+            sys.exit(1)
+
+    if not args.json:
+        print(f"* Stub:\t\t{stub_url}")
+        print(f"* Scale:\t{args.users} user(s) x {args.playlists} playlist(s) x {args.tracks} track(s), {args.followers} followers, churn {args.churn}/cycle")
+        print(f"* Modes:\t{', '.join(modes)}\n")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="spotify_profile_monitor_bench_") as work_dir:
+        for mode in modes:
+            for user_idx in range(args.users):
+                state.generation = 0
+                cmd = [sys.executable, os.path.abspath(__file__), "--worker", mode, "--stub-url", stub_url, "--user", bench_user_id(user_idx), "--playlists", str(args.playlists), "--tracks", str(args.tracks), "--cycles", str(args.cycles)]
+                proc = subprocess.run(cmd, cwd=work_dir, capture_output=True, text=True)
+                if proc.returncode != 0 or not proc.stdout.strip():
+                    print(f"* Error: {mode} run for {bench_user_id(user_idx)} failed:\n{proc.stderr.strip()}")
+                    continue
+                results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    server.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'Mode':<12}{'User':<16}{'Runs':>6}{'Time avg [s]':>14}{'Time max [s]':>14}{'CPU avg [s]':>13}{'Requests':>10}{'Peak RSS [MB]':>15}")
+    print("-" * 100)
+    for r in results:
+        print(f"{r['mode']:<12}{r['user']:<16}{r['runs']:>6}{r['time_avg'] or 0:>14.4f}{r['time_max'] or 0:>14.4f}{r['cpu_avg'] or 0:>13.4f}{r['requests_avg'] or 0:>10}{r['peak_rss_mb'] or 0:>15}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark harness for spotify_profile_monitor")
+    parser.add_argument("--users", type=int, default=1, help="Number of monitored users (default: 1)")
+    parser.add_argument("--playlists", type=int, default=10, help="Number of public playlists per user (default: 10)")
+    parser.add_argument("--tracks", type=int, default=200, help="Number of tracks per playlist and liked tracks (default: 200)")
+    parser.add_argument("--followers", type=int, default=100, help="Number of followers / followings per user (default: 100)")
+    parser.add_argument("--cycles", type=int, default=3, help="Number of monitoring cycles measured after the initial fetch (default: 3)")
+    parser.add_argument("--churn", type=int, default=0, help="Followers replaced and tracks added to the first playlist on every cycle (default: 0)")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma separated modes to run (default: {','.join(MODES)})")
+    parser.add_argument("--recorded", metavar="DIR", default="", help="Directory with recorded JSON responses (<path>.json) served instead of synthetic ones")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--stub-url", help=argparse.SUPPRESS)
+    parser.add_argument("--user", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+    else:
+        run_benchmark(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,7 @@ python-dotenv (optional)
 spotipy
 wcwidth (optional, needed by TRUNCATE_CHARS feature)
 pathvalidate (optional, needed by --export-all-playlists)
+pyarrow (optional, needed by parquet export format)
 """
 
 VERSION = "3.4.1"
@@ -49,6 +50,12 @@ TOKEN_SOURCE = "cookie"
 #   - Fallback: hard-code it in the code or config file
 SP_DC_COOKIE = "your_sp_dc_cookie_value"
 
+# Optional: additional sp_dc cookies (e.g. from other Spotify accounts) to rotate across together with SP_DC_COOKIE
+# A cookie is temporarily sidelined when Spotify answers with 429 (rate limited) or 401 (unauthorized)
+# Can also be provided as a comma-separated environment variable or ".env" entry (SP_DC_COOKIES=...)
+# Example: SP_DC_COOKIES = ["your_sp_dc_cookie_value2", "your_sp_dc_cookie_value3"]
+SP_DC_COOKIES = []
+
 # ---------------------------------------------------------------------
 
 # The section below is used when the token source is set to 'oauth_app' (Client Credentials OAuth Flow)
@@ -75,6 +82,21 @@ SP_APP_CLIENT_SECRET = "your_spotify_app_client_secret"
 # Set to empty to use in-memory cache only
 SP_APP_TOKENS_FILE = ".spotify-profile-monitor-oauth-app.json"
 
+# Optional: additional OAuth app credentials to rotate across together with SP_APP_CLIENT_ID / SP_APP_CLIENT_SECRET
+# Use SP_APP_CLIENT_ID:SP_APP_CLIENT_SECRET format (note the colon separator)
+# Credentials are temporarily sidelined when Spotify answers with 429 (rate limited) or 401 (unauthorized)
+# Can also be provided as a comma-separated environment variable or ".env" entry (SP_APP_CREDS=...)
+# Example: SP_APP_CREDS = ["your_spotify_app_client_id2:your_spotify_app_client_secret2"]
+SP_APP_CREDS = []
+
+# Strategy used to pick credentials when more than one sp_dc cookie or OAuth app is defined:
+#   round_robin  - use each credential in turn
+#   least_loaded - use the credential which served the fewest token requests so far
+CREDENTIALS_ROTATION = "round_robin"
+
+# How long a credential is sidelined after Spotify answers with 429 or 401; in seconds
+CREDENTIALS_COOLDOWN = 300  # 5 mins
+
 # ---------------------------------------------------------------------
 
 # SMTP settings for sending email notifications
@@ -93,6 +115,29 @@ SMTP_SSL = True
 SENDER_EMAIL = "your_sender_email"
 RECEIVER_EMAIL = "your_receiver_email"
 
+# Whether to send email notifications in the background via an outbound mail queue
+# A single worker thread reuses one authenticated SMTP connection for subsequent emails, so a slow or unavailable
+# SMTP server does not block detection of changes; unsent messages are spooled to disk and retried (also after restart)
+EMAIL_QUEUE = True
+
+# Directory where queued messages are spooled until they are delivered
+# If empty, it defaults to spotify_profile_{file_suffix}_mail_spool in the current directory
+EMAIL_SPOOL_DIR = ""
+
+# How long an idle SMTP connection is kept open before it is closed; in seconds
+SMTP_IDLE_TIMEOUT = 60
+
+# How often delivery of spooled messages is retried after an SMTP failure; in seconds
+EMAIL_RETRY_INTERVAL = 120  # 2 mins
+
+# Whether to collect change notifications and send them as a single consolidated digest email
+# instead of a separate email for every detected change (error notifications are always sent right away)
+EMAIL_DIGEST = False
+
+# How long change notifications are collected before the digest email is sent; in seconds
+# If set to 0, one digest email is sent per check cycle (if any changes were detected)
+EMAIL_DIGEST_WINDOW = 0
+
 # Whether to send an email when the user's profile changes
 # Can also be enabled via the -p flag
 PROFILE_NOTIFICATION = False
@@ -114,6 +159,15 @@ SPOTIFY_CHECK_INTERVAL = 1800  # 30 mins
 # Can also be set using the -m flag
 SPOTIFY_ERROR_INTERVAL = 300  # 5 mins
 
+# Whether to align checks to a deterministic per-user phase within the check interval (derived from the user URI ID)
+# Useful when running several instances of the tool for different users, so their checks are spread evenly over
+# the interval instead of hitting Spotify at the same time
+STAGGER_CHECKS = False
+
+# Max random jitter added to (or subtracted from) each check interval; in seconds
+# Set to 0 to disable
+CHECK_INTERVAL_JITTER = 0
+
 # Set your local time zone so that Spotify timestamps are converted accordingly (e.g. 'Europe/Warsaw')
 # Use this command to list all time zones supported by pytz:
 #   python3 -c "import pytz; print('\\n'.join(pytz.all_timezones))"
@@ -150,6 +204,24 @@ IMGCAT_PATH = "imgcat"
 #   - Fallback: hard-code it in the code or config file
 SP_SHA256 = "your_spotify_client_sha256"
 
+# Max number of users returned per search query (-s) and number of results to skip (to page through results)
+# Can also be set via the --search-limit and --search-offset flags
+SEARCH_LIMIT = 5
+SEARCH_OFFSET = 0
+
+# Number of search queries sent in parallel when searching for names listed in a file (--search-file)
+SEARCH_WORKERS = 4
+
+# Max number of search requests sent per second (shared by all search threads), 0 disables the limit
+SEARCH_RATE_LIMIT = 2
+
+# Path to cache file used to store search results across tool runs, so repeated lookups cost no requests
+# Set to empty to disable the cache
+SEARCH_CACHE_FILE = ".spotify-profile-monitor-search-cache.json"
+
+# How long cached search results stay valid, in seconds
+SEARCH_CACHE_TTL = 86400  # 1 day
+
 # Notify when user's public playlists change? (via console and email if PROFILE_NOTIFICATION / -p is enabled)
 # Detects:
 #   - added/removed tracks
@@ -183,6 +255,28 @@ IGNORE_SPOTIFY_PLAYLISTS = True
 # Max number of public playlists to monitor
 PLAYLISTS_LIMIT = 50
 
+# Number of playlists fetched and written in parallel when exporting them with --export-all-playlists
+EXPORT_WORKERS = 8
+
+# Number of users inspected in parallel in batch mode (--batch-users-file)
+BATCH_WORKERS = 8
+
+# Whether to poll each monitored playlist on its own adaptive schedule instead of fetching all of them every check
+# Playlists which changed recently are checked every PLAYLIST_MIN_CHECK_INTERVAL, dormant ones back off exponentially
+# (by PLAYLIST_BACKOFF_FACTOR after each check without changes) up to PLAYLIST_MAX_CHECK_INTERVAL
+# The user profile itself (followers, followings, list of playlists) is still checked every SPOTIFY_CHECK_INTERVAL
+PLAYLIST_ADAPTIVE_POLLING = False
+
+# Lower bound of the adaptive playlist check interval; in seconds
+# Set to 0 to use SPOTIFY_CHECK_INTERVAL
+PLAYLIST_MIN_CHECK_INTERVAL = 0
+
+# Upper bound of the adaptive playlist check interval; in seconds
+PLAYLIST_MAX_CHECK_INTERVAL = 21600  # 6 hours
+
+# Multiplier applied to the playlist check interval after each check without changes
+PLAYLIST_BACKOFF_FACTOR = 2
+
 # Max number of recently played artists to show (when using -a)
 RECENTLY_PLAYED_ARTISTS_LIMIT = 50
 
@@ -199,6 +293,17 @@ PLAYLISTS_DISAPPEARED_COUNTER = 3
 # PLAYLISTS_CHANGE_COUNTER times in a row (set to 0 to disable this protection)
 PLAYLISTS_CHANGE_COUNTER = 2
 
+# Whether to fetch the full lists of followers / followings only when their counts reported by the user profile change
+# Saves two requests per check for users whose followers / followings rarely change
+# Note: if someone follows and someone else unfollows between checks, the count stays the same - such changes are
+# picked up by the full reconciliation done every FOLLOWERS_FOLLOWINGS_RECONCILE_CYCLES checks
+# Only applies to 'cookie' and 'client' token sources (other sources do not report these counts reliably)
+FOLLOWERS_FOLLOWINGS_COUNT_GATING = False
+
+# Number of checks after which the full lists of followers / followings are fetched even if their counts did not change
+# Set to 0 to disable periodic reconciliation
+FOLLOWERS_FOLLOWINGS_RECONCILE_CYCLES = 12
+
 # Occasionally, the Spotify API glitches and returns an empty list of user followers / followings
 # To avoid false alarms, we delay notifications until this happens FOLLOWERS_FOLLOWINGS_DISAPPEARED_COUNTER times in a row
 FOLLOWERS_FOLLOWINGS_DISAPPEARED_COUNTER = 3
@@ -209,6 +314,11 @@ FOLLOWERS_FOLLOWINGS_DISAPPEARED_COUNTER = 3
 # COLLABORATORS_CHANGE_COUNTER times in a row
 COLLABORATORS_CHANGE_COUNTER = 2
 
+# Save the state used by the checks above (glitch, pending and baseline caches plus the zeroed counters)
+# to spotify_profile_<user_uri_id/file_suffix>_state.json after every check and restore it on start,
+# so restarting the tool does not reset confirmation streaks or re-alert on already suppressed glitches
+PERSIST_GLITCH_STATE = True
+
 # Optional: specify user agent manually
 #
 # When the token source is 'cookie' - set it to web browser user agent, some examples:
@@ -239,11 +349,28 @@ VERIFY_SSL = True
 # Can also be set using the -b flag
 CSV_FILE = ""
 
+# File to stream all detected changes to as newline-delimited JSON (one typed event per line, e.g. follower_added,
+# playlist_track_added, playlist_likes_changed, profile_picture_changed) for consumption by other tools
+# Set to "-" to write events to standard output (best combined with --headless)
+# Can also be set via the --events-file flag
+EVENTS_FILE = ""
+
 # Format used when exporting playlists (-l) or liked songs (-x) to CSV file:
 # 1 - default format used for activity logging ['Date', 'Type', 'Name', 'Old', 'New']
 # 2 - playlist dump format ['Date', 'Playlist Name', 'Artist', 'Track']
 CSV_FILE_FORMAT_EXPORT = 2
 
+# Output format used when exporting playlists (-l, --export-all-playlists) or liked songs (-x):
+# csv     - CSV file in format set by CSV_FILE_FORMAT_EXPORT (default)
+# ndjson  - newline-delimited JSON, one track per line
+# parquet - columnar Apache Parquet file (requires pyarrow)
+# ndjson and parquet use the columns: uri, artist, track, duration (in seconds), added_at (UTC), added_by
+# Can also be set via the --export-format flag
+EXPORT_FORMAT = "csv"
+
+# Number of tracks buffered in memory before being written out to ndjson / parquet export file
+EXPORT_BATCH_SIZE = 5000
+
 # Set to true if you want the simplified output when exporting playlists (-l) or liked songs (-x) to allow
 # direct import into spotify_monitor tool
 CLEAN_OUTPUT = False
@@ -270,10 +397,57 @@ SP_LOGFILE = "spotify_profile_monitor"
 # Can also be disabled via the -d flag
 DISABLE_LOGGING = False
 
+# How often buffered output is flushed to the log file; in seconds
+# The log file is also flushed when the tool exits
+LOG_FLUSH_INTERVAL = 5
+
+# Rotate the log file once it grows over this size; in bytes
+# Set to 0 to disable size-based rotation
+LOG_MAX_SIZE = 0  # e.g. 10 * 1024 * 1024 for 10 MB
+
+# Rotate the log file after it has been written to for this long; in seconds
+# Set to 0 to disable time-based rotation
+LOG_ROTATE_INTERVAL = 0  # e.g. 86400 for daily rotation
+
+# Number of rotated log files to keep (<log>.1 being the most recent one)
+LOG_BACKUP_COUNT = 5
+
+# Whether to skip rendering output to the terminal and write it only to the log file (e.g. when running as a service)
+# Can also be enabled via the --headless flag
+HEADLESS = False
+
 # Enable debug mode for technical logging (can also be enabled via --debug flag)
 # Shows request flow, selected params and internal state changes (with sensitive values redacted)
 DEBUG_MODE = False
 
+# File (cassette) where every HTTP request and response sent by the tool is recorded, with secrets masked
+# Can also be set via the --record flag
+HTTP_RECORD_FILE = ""
+
+# Cassette file with previously recorded HTTP responses which are served back instead of querying Spotify
+# Replay never touches the network, token functions return a placeholder token instead
+# Can also be set via the --replay flag
+HTTP_REPLAY_FILE = ""
+
+# Whether to profile monitoring cycles (or the -l / -i / -x one-shot commands)
+# For every profiled cycle cProfile stats (.pstats) and sampled collapsed stacks (.folded, usable with flamegraph.pl
+# or speedscope) are written next to the log file
+# Can also be enabled via the --profile flag
+CODE_PROFILING = False
+
+# Profile only every Nth monitoring cycle to keep the overhead low
+# Can also be set via the --profile-every flag
+CODE_PROFILING_EVERY = 1
+
+# Port of the local HTTP endpoint exposing runtime metrics (request latencies, counters, cycle duration, cache hits,
+# token refreshes, queue depths) in Prometheus text format at http://<METRICS_HOST>:<METRICS_PORT>/metrics
+# Set to 0 to disable
+# Can also be set via the --metrics-port flag
+METRICS_PORT = 0
+
+# Address the metrics endpoint listens on
+METRICS_HOST = "127.0.0.1"
+
 # Width of horizontal line
 HORIZONTAL_LINE = 113
 
@@ -524,9 +698,13 @@ APP_VERSION = ""
 # Do not change values below - modify them in the configuration section or config file instead
 TOKEN_SOURCE = ""
 SP_DC_COOKIE = ""
+SP_DC_COOKIES = []
 SP_APP_CLIENT_ID = ""
 SP_APP_CLIENT_SECRET = ""
 SP_APP_TOKENS_FILE = ""
+SP_APP_CREDS = []
+CREDENTIALS_ROTATION = ""
+CREDENTIALS_COOLDOWN = 0
 SP_USER_CLIENT_ID = ""
 SP_USER_CLIENT_SECRET = ""
 SP_USER_REDIRECT_URI = ""
@@ -555,25 +733,48 @@ SMTP_PASSWORD = ""
 SMTP_SSL = False
 SENDER_EMAIL = ""
 RECEIVER_EMAIL = ""
+EMAIL_QUEUE = False
+EMAIL_SPOOL_DIR = ""
+SMTP_IDLE_TIMEOUT = 0
+EMAIL_RETRY_INTERVAL = 0
+EMAIL_DIGEST = False
+EMAIL_DIGEST_WINDOW = 0
 PROFILE_NOTIFICATION = False
 FOLLOWERS_FOLLOWINGS_NOTIFICATION = False
 ERROR_NOTIFICATION = False
 SPOTIFY_CHECK_INTERVAL = 0
 SPOTIFY_ERROR_INTERVAL = 0
+STAGGER_CHECKS = False
+CHECK_INTERVAL_JITTER = 0
 LOCAL_TIMEZONE = ""
 DETECT_CHANGED_PROFILE_PIC = False
 IMGCAT_PATH = ""
 SP_SHA256 = ""
+SEARCH_LIMIT = 0
+SEARCH_OFFSET = 0
+SEARCH_WORKERS = 0
+SEARCH_RATE_LIMIT = 0
+SEARCH_CACHE_FILE = ""
+SEARCH_CACHE_TTL = 0
 DETECT_CHANGES_IN_PLAYLISTS = False
 GET_ALL_PLAYLISTS = False
 ADD_PLAYLISTS_TO_MONITOR = []
 IGNORE_SPOTIFY_PLAYLISTS = False
 PLAYLISTS_LIMIT = 0
+EXPORT_WORKERS = 0
+BATCH_WORKERS = 0
+PLAYLIST_ADAPTIVE_POLLING = False
+PLAYLIST_MIN_CHECK_INTERVAL = 0
+PLAYLIST_MAX_CHECK_INTERVAL = 0
+PLAYLIST_BACKOFF_FACTOR = 0
 RECENTLY_PLAYED_ARTISTS_LIMIT = 0
 RECENTLY_PLAYED_ARTISTS_LIMIT_INFO = 0
 PLAYLISTS_DISAPPEARED_COUNTER = 0
 FOLLOWERS_FOLLOWINGS_DISAPPEARED_COUNTER = 0
+FOLLOWERS_FOLLOWINGS_COUNT_GATING = False
+FOLLOWERS_FOLLOWINGS_RECONCILE_CYCLES = 0
 COLLABORATORS_CHANGE_COUNTER = 0
+PERSIST_GLITCH_STATE = False
 PLAYLISTS_CHANGE_COUNTER = 0
 USER_AGENT = ""
 LIVENESS_CHECK_INTERVAL = 0
@@ -581,14 +782,28 @@ CHECK_INTERNET_URL = ""
 CHECK_INTERNET_TIMEOUT = 0
 VERIFY_SSL = False
 CSV_FILE = ""
+EVENTS_FILE = ""
 CSV_FILE_FORMAT_EXPORT = 0
+EXPORT_FORMAT = ""
+EXPORT_BATCH_SIZE = 0
 CLEAN_OUTPUT = False
 PLAYLISTS_TO_SKIP_FILE = ""
 DOTENV_FILE = ""
 FILE_SUFFIX = ""
 SP_LOGFILE = ""
 DISABLE_LOGGING = False
+LOG_FLUSH_INTERVAL = 0
+LOG_MAX_SIZE = 0
+LOG_ROTATE_INTERVAL = 0
+LOG_BACKUP_COUNT = 0
+HEADLESS = False
 DEBUG_MODE = False
+HTTP_RECORD_FILE = ""
+HTTP_REPLAY_FILE = ""
+CODE_PROFILING = False
+CODE_PROFILING_EVERY = 0
+METRICS_PORT = 0
+METRICS_HOST = ""
 HORIZONTAL_LINE = 0
 CLEAR_SCREEN = False
 SPOTIFY_CHECK_SIGNAL_VALUE = 0
@@ -616,18 +831,26 @@ exec(CONFIG_BLOCK, globals())
 DEFAULT_CONFIG_FILENAME = "spotify_profile_monitor.conf"
 
 # List of secret keys to load from env/config
-SECRET_KEYS = ("SP_DC_COOKIE", "SP_APP_CLIENT_ID", "SP_APP_CLIENT_SECRET", "SP_USER_CLIENT_ID", "SP_USER_CLIENT_SECRET", "REFRESH_TOKEN", "SP_SHA256", "SMTP_PASSWORD")
+SECRET_KEYS = ("SP_DC_COOKIE", "SP_DC_COOKIES", "SP_APP_CLIENT_ID", "SP_APP_CLIENT_SECRET", "SP_APP_CREDS", "SP_USER_CLIENT_ID", "SP_USER_CLIENT_SECRET", "REFRESH_TOKEN", "SP_SHA256", "SMTP_PASSWORD")
 
 # Strings removed from track names for generating proper Genius search URLs
 re_search_str = r'remaster|extended|original mix|remix|original soundtrack|radio( |-)edit|\(feat\.|( \(.*version\))|( - .*version)'
 re_replace_str = r'( - (\d*)( )*remaster$)|( - (\d*)( )*remastered( version)*( \d*)*.*$)|( \((\d*)( )*remaster\)$)|( - (\d+) - remaster$)|( - extended$)|( - extended mix$)|( - (.*); extended mix$)|( - extended version$)|( - (.*) remix$)|( - remix$)|( - remixed by .*$)|( - original mix$)|( - .*original soundtrack$)|( - .*radio( |-)edit$)|( \(feat\. .*\)$)|( \(\d+.*Remaster.*\)$)|( \(.*Version\))|( - .*version)'
 
-# Default value for network-related timeouts in functions; in seconds
+# Default value for network-related timeouts in functions (read timeout and total time budget per request); in seconds
 FUNCTION_TIMEOUT = 15
 
-# Default value for alarm signal handler timeout; in seconds
-ALARM_TIMEOUT = 15
-ALARM_RETRY = 10
+# Timeout for establishing connections to Spotify servers; in seconds
+CONNECT_TIMEOUT = 5
+
+# Total time budget for getting the access token and user profile info in each check of the monitoring loop
+# and the retry interval after it is exceeded; in seconds
+CHECK_TIME_BUDGET = 60
+CHECK_TIME_BUDGET_RETRY = 10
+
+# Total time budget for all HTTP requests sent during a single monitoring cycle, including the parallel fetches
+# of followers, followings, profile picture and playlists; in seconds
+CYCLE_TIME_BUDGET = 900
 
 # Variables for caching functionality of the Spotify 'cookie' access token / 'client' refresh token to avoid unnecessary refreshing
 SP_CACHED_ACCESS_TOKEN = None
@@ -635,9 +858,17 @@ SP_CACHED_REFRESH_TOKEN = None
 SP_ACCESS_TOKEN_EXPIRES_AT = 0
 SP_CACHED_CLIENT_ID = ""
 
+# sp_dc cookie the cached access token above belongs to and per-cookie token cache used when rotating across SP_DC_COOKIES
+SP_CACHED_SP_DC = None
+SP_DC_TOKENS_CACHE = {}
+
 # Separate cache for OAuth app access token (Client Credentials Flow) used in hybrid mode
 SP_CACHED_OAUTH_APP_TOKEN = None
 
+# OAuth app client ID the cached token above belongs to and per-app token cache used when rotating across SP_APP_CREDS
+SP_CACHED_OAUTH_APP_CLIENT_ID = None
+SP_OAUTH_APP_TOKENS_CACHE = {}
+
 # URL of the Spotify Web Player endpoint to get access token
 TOKEN_URL = "https://open.spotify.com/api/token"
 
@@ -648,12 +879,16 @@ SERVER_TIME_URL = "https://open.spotify.com/"
 SP_CACHED_CLIENT_TOKEN = None
 SP_CLIENT_TOKEN_EXPIRES_AT = 0
 
-# Cache for playlist info to avoid redundant API calls
-PLAYLIST_INFO_CACHE = {}
+# Variables for caching the /v1/me owner ID of the current access token to avoid redundant lookups
+SP_CACHED_TOKEN_OWNER_ACCESS_TOKEN = None
+SP_CACHED_TOKEN_OWNER_ID = None
 
-# Cache TTL for playlist info
+# Cache TTL for playlist info (PLAYLIST_INFO_CACHE is created below TTLCache class)
 PLAYLIST_INFO_CACHE_TTL = (SPOTIFY_CHECK_INTERVAL * 2 if SPOTIFY_CHECK_INTERVAL > 43200 else 43200)  # 12h
 
+# Max number of playlists kept in playlist info cache, the least recently used ones are evicted first
+PLAYLIST_INFO_CACHE_MAX_ENTRIES = 5000
+
 # Tracks temporarily glitched playlists to suppress false alerts
 GLITCH_CACHE = {}
 
@@ -691,45 +926,40 @@ import string
 import json
 import os
 from datetime import datetime, timezone, timedelta
-from dateutil import relativedelta
-from dateutil.parser import isoparse
 import calendar
 import requests as req
 import shutil
 import signal
-import smtplib
-import ssl
-from email.header import Header
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.image import MIMEImage
 import argparse
-import csv
 try:
     import pytz
 except ModuleNotFoundError:
     raise SystemExit("Error: Couldn't find the pytz library !\n\nTo install it, run:\n    pip install pytz\n\nOnce installed, re-run this tool")
-try:
-    from tzlocal import get_localzone
-except ImportError:
-    get_localzone = None
 import platform
 import html
-from urllib.parse import quote_plus, quote, urlparse
+from urllib.parse import quote_plus, quote, urlparse, parse_qsl, urlencode
 import re
-import ipaddress
 from itertools import zip_longest
 from html import escape
-import subprocess
 import base64
 import random
-from collections import Counter
+import hashlib
+from collections import Counter, OrderedDict
+import heapq
 from email.utils import parsedate_to_datetime
 from pathlib import Path
 import secrets
+import threading
+import queue
+import atexit
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed, Future
 from typing import Optional
 from email.utils import parsedate_to_datetime
 
+# Heavy or mode specific modules (smtplib, ssl, email.mime, dateutil, tzlocal, csv, subprocess, cProfile, http.server)
+# are imported in the functions which need them, so short-lived one-shot commands start faster
+
 import urllib3
 if not VERIFY_SSL:
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -744,6 +974,11 @@ MAX_RETRY_AFTER_SECONDS = 60
 
 
 class CappedRetry(Retry):
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        reason = str(response.status) if response is not None else type(error).__name__ if error is not None else "unknown"
+        METRICS.inc("spotify_http_retries_total", reason=reason)
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
     def get_retry_after(self, response):
         retry_after = super().get_retry_after(response)
         if retry_after is None:
@@ -767,6 +1002,717 @@ SESSION.mount("https://", adapter)
 SESSION.mount("http://", adapter)
 
 
+# Class used to rotate across several credentials (sp_dc cookies or OAuth app client ID/secret pairs)
+# Credentials answering with 429 or 401 are sidelined for CREDENTIALS_COOLDOWN seconds
+class CredentialPool(object):
+    def __init__(self, name):
+        self.name = name
+        self.items = []
+        self.uses = {}
+        self.sidelined_until = {}
+        self.tokens = {}
+        self.index = 0
+        self.lock = threading.Lock()
+
+    # Replaces the list of credentials, keeping usage stats of the ones still present
+    def set_items(self, items):
+        with self.lock:
+            new_items = []
+            for item in items:
+                if item not in new_items:
+                    new_items.append(item)
+            self.items = new_items
+            self.uses = {c: self.uses.get(c, 0) for c in new_items}
+            self.sidelined_until = {c: ts for c, ts in self.sidelined_until.items() if c in new_items}
+            self.tokens = {t: c for t, c in self.tokens.items() if c in new_items}
+
+    # Returns the next credential to use according to CREDENTIALS_ROTATION
+    def acquire(self):
+        with self.lock:
+            if not self.items:
+                return None
+
+            now = time.time()
+            available = [c for c in self.items if self.sidelined_until.get(c, 0) <= now]
+
+            if not available:
+                # All credentials are sidelined, so use the one released first
+                cred = min(self.items, key=lambda c: self.sidelined_until.get(c, 0))
+            elif CREDENTIALS_ROTATION == "least_loaded":
+                cred = min(available, key=lambda c: self.uses.get(c, 0))
+            else:
+                cred = available[0]
+                for _ in range(len(self.items)):
+                    candidate = self.items[self.index % len(self.items)]
+                    self.index += 1
+                    if candidate in available:
+                        cred = candidate
+                        break
+
+            self.uses[cred] = self.uses.get(cred, 0) + 1
+            return cred
+
+    # Remembers which credential the access token was obtained with
+    def bind_token(self, token, cred):
+        if not token:
+            return
+        with self.lock:
+            self.tokens = {t: c for t, c in self.tokens.items() if c != cred}
+            self.tokens[token] = cred
+
+    # Sidelines the credential for CREDENTIALS_COOLDOWN seconds (only makes sense if there is more than one)
+    def sideline(self, cred, status_code):
+        with self.lock:
+            if cred not in self.items or len(self.items) < 2:
+                return
+            self.sidelined_until[cred] = time.time() + CREDENTIALS_COOLDOWN
+        debug_print(f"Credential pool {self.name}: sidelined {mask_secret(self.describe(cred))} for {display_time(CREDENTIALS_COOLDOWN)} after HTTP {status_code}")
+
+    # Sidelines the credential the access token was obtained with
+    def sideline_token(self, token, status_code):
+        cred = self.tokens.get(token)
+        if cred is not None:
+            self.sideline(cred, status_code)
+
+    def describe(self, cred):
+        return cred[0] if isinstance(cred, tuple) else cred
+
+    def __len__(self):
+        return len(self.items)
+
+
+# Pools of sp_dc cookies and OAuth app credentials, filled in by refresh_credentials_pools()
+SP_DC_POOL = CredentialPool("sp_dc")
+SP_APP_CREDS_POOL = CredentialPool("oauth_app")
+
+
+# Response hook sidelining the pooled credential used for a request which was answered with 429 or 401
+def credentials_pool_response_hook(response, *args, **kwargs):
+    if response.status_code not in (401, 429):
+        return
+
+    headers = response.request.headers
+
+    auth = headers.get("Authorization", "")
+    if auth.startswith("Bearer "):
+        token = auth[len("Bearer "):]
+        SP_DC_POOL.sideline_token(token, response.status_code)
+        SP_APP_CREDS_POOL.sideline_token(token, response.status_code)
+
+    sp_dc_match = re.search(r"sp_dc=([^;\s]+)", headers.get("Cookie", ""))
+    if sp_dc_match:
+        SP_DC_POOL.sideline(sp_dc_match.group(1), response.status_code)
+
+
+SESSION.hooks["response"].append(credentials_pool_response_hook)
+
+
+# Returns list of credentials from a list or a comma-separated string (as read from environment / dotenv file)
+def parse_credentials_list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(v).strip() for v in value if str(v).strip()]
+
+
+# (Re)builds the pools of sp_dc cookies and OAuth app credentials used for rotation
+def refresh_credentials_pools():
+    SP_DC_POOL.set_items([SP_DC_COOKIE] + parse_credentials_list(SP_DC_COOKIES))
+
+    app_creds = [(SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET)]
+    for entry in parse_credentials_list(SP_APP_CREDS):
+        client_id, sep, client_secret = entry.partition(":")
+        if not sep or not client_id or not client_secret:
+            print(f"* Warning: SP_APP_CREDS entry '{mask_secret(entry)}' has invalid format - use SP_APP_CLIENT_ID:SP_APP_CLIENT_SECRET")
+            continue
+        app_creds.append((client_id, client_secret))
+    SP_APP_CREDS_POOL.set_items(app_creds)
+
+
+# Class used to collect runtime metrics (counters, histograms and gauges) and render them in Prometheus text format
+# Recording is a no-op until the metrics endpoint is enabled
+class Metrics(object):
+
+    REQUEST_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+    CYCLE_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+
+    @staticmethod
+    def key(name, labels):
+        return (name, tuple(sorted(labels.items())))
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = self.key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, buckets=REQUEST_BUCKETS, **labels):
+        if not self.enabled:
+            return
+        key = self.key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {"buckets": buckets, "counts": [0] * len(buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram["counts"][i] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    # Registers a callable returning the current value of a gauge (evaluated on every scrape)
+    def gauge(self, name, fn, **labels):
+        with self.lock:
+            self.gauges[self.key(name, labels)] = fn
+
+    @staticmethod
+    def format_labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        escaped = []
+        for k, v in pairs:
+            v = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            escaped.append(f'{k}="{v}"')
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self):
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted((key, dict(h, counts=list(h["counts"]))) for key, h in self.histograms.items())
+            gauges = sorted(self.gauges.items(), key=lambda item: item[0])
+
+        lines = []
+        last_name = None
+        for (name, labels), value in counters:
+            if name != last_name:
+                lines.append(f"# TYPE {name} counter")
+                last_name = name
+            lines.append(f"{name}{self.format_labels(labels)} {value}")
+
+        for (name, labels), fn in gauges:
+            try:
+                value = fn()
+            except Exception:
+                continue
+            if name != last_name:
+                lines.append(f"# TYPE {name} gauge")
+                last_name = name
+            lines.append(f"{name}{self.format_labels(labels)} {value}")
+
+        for (name, labels), histogram in histograms:
+            if name != last_name:
+                lines.append(f"# TYPE {name} histogram")
+                last_name = name
+            for bound, count in zip(histogram["buckets"], histogram["counts"]):
+                lines.append(f"{name}_bucket{self.format_labels(labels, [('le', bound)])} {count}")
+            lines.append(f"{name}_bucket{self.format_labels(labels, [('le', '+Inf')])} {histogram['count']}")
+            lines.append(f"{name}_sum{self.format_labels(labels)} {round(histogram['sum'], 6)}")
+            lines.append(f"{name}_count{self.format_labels(labels)} {histogram['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+# Class used to cache dict entries for ttl seconds with at most max_entries entries (least recently used are evicted first)
+# Expiry is based on the entry's "timestamp" field, so entries refreshed in place (entry.update({"timestamp": ...}))
+# stay alive; expired entries are found through a heap ordered by expiry time instead of scanning the whole cache
+class TTLCache(object):
+
+    def __init__(self, name, ttl, max_entries=0):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.expiry_heap = []
+        self.expiry = {}
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def __getitem__(self, key):
+        with self.lock:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def __setitem__(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self.schedule(key, entry)
+            while self.max_entries and len(self.entries) > self.max_entries:
+                old_key, _ = self.entries.popitem(last=False)
+                self.expiry.pop(old_key, None)
+                self.evictions += 1
+                METRICS.inc("spotify_cache_evictions_total", cache=self.name, reason="lru")
+
+    # Returns the entry (marking it as recently used) and counts the lookup as hit or miss (also in metrics)
+    # All lookups which should count towards hit ratio have to go through get()
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                METRICS.inc("spotify_cache_lookups_total", cache=self.name, result="miss")
+                return default
+            self.hits += 1
+            METRICS.inc("spotify_cache_lookups_total", cache=self.name, result="hit")
+            self.entries.move_to_end(key)
+            return entry
+
+    def schedule(self, key, entry):
+        expires_at = entry.get("timestamp", 0) + self.ttl
+        self.expiry[key] = expires_at
+        heapq.heappush(self.expiry_heap, (expires_at, key))
+
+    # Removes entries older than ttl, heap items of overwritten or evicted entries are skipped
+    def expire(self, now=None):
+        if now is None:
+            now = time.time()
+        with self.lock:
+            while self.expiry_heap and self.expiry_heap[0][0] <= now:
+                expires_at, key = heapq.heappop(self.expiry_heap)
+                if self.expiry.get(key) != expires_at:
+                    continue
+                entry = self.entries[key]
+                if entry.get("timestamp", 0) + self.ttl > now:
+                    self.schedule(key, entry)
+                    continue
+                del self.entries[key]
+                del self.expiry[key]
+                self.expirations += 1
+                METRICS.inc("spotify_cache_evictions_total", cache=self.name, reason="ttl")
+            # Drop stale heap items once they outnumber live entries, so the heap stays proportional to the cache
+            if len(self.expiry_heap) > 2 * len(self.entries) + 64:
+                self.expiry_heap = [(expires_at, key) for key, expires_at in self.expiry.items()]
+                heapq.heapify(self.expiry_heap)
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions, "expirations": self.expirations}
+
+
+# Cache for playlist info to avoid redundant API calls
+PLAYLIST_INFO_CACHE = TTLCache("playlist_info", PLAYLIST_INFO_CACHE_TTL, PLAYLIST_INFO_CACHE_MAX_ENTRIES)
+
+
+# Class used to share playlist info fetched during one monitoring cycle by all code paths (playlists loop, prefetch,
+# notifications), so each playlist is fetched at most once per cycle; concurrent requests wait for the first fetch
+class PlaylistCycleStore(object):
+
+    def __init__(self):
+        self.results = {}
+        self.lock = threading.Lock()
+
+    # Starts a new cycle, results fetched in the previous one are dropped
+    def clear(self):
+        with self.lock:
+            self.results = {}
+
+    # Returns playlist info, results fetched with tracks also serve requests without them (errors are shared as well)
+    def get(self, access_token, playlist_uri, get_tracks):
+        with self.lock:
+            item = self.results.get(playlist_uri)
+            reuse = item is not None and (item[0] or not get_tracks)
+            if reuse:
+                future = item[1]
+            else:
+                future = Future()
+                self.results[playlist_uri] = (get_tracks, future)
+
+        METRICS.inc("spotify_cache_lookups_total", cache="playlist_cycle", result="hit" if reuse else "miss")
+        if not reuse:
+            try:
+                future.set_result(spotify_get_playlist_info(access_token, playlist_uri, get_tracks))
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+
+# Per-cycle playlist info store, created in spotify_profile_monitor_uri() (one-shot modes fetch directly)
+PLAYLIST_CYCLE_STORE = None
+
+
+# Returns playlist info through the per-cycle store when monitoring, otherwise fetches it directly
+def spotify_get_playlist_info_for_cycle(access_token, playlist_uri, get_tracks):
+    if PLAYLIST_CYCLE_STORE is None:
+        return spotify_get_playlist_info(access_token, playlist_uri, get_tracks)
+    return PLAYLIST_CYCLE_STORE.get(access_token, playlist_uri, get_tracks)
+
+
+# Returns endpoint label used in metrics for the URL, with user / playlist / track IDs replaced by a placeholder
+def get_metrics_endpoint(url):
+    parsed = urlparse(url)
+    path = re.sub(r"/(profile|playlists|users|tracks|artists|albums|episodes|shows)/[^/]+", r"/\1/{id}", parsed.path)
+    return f"{parsed.netloc}{path}"
+
+
+# Starts local HTTP server exposing collected metrics at /metrics
+def start_metrics_server(host, port):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = METRICS.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    METRICS.enabled = True
+    return server
+
+
+# Class used to record HTTP interactions into a cassette file (one JSON object per line) and to replay them back
+# Requests are matched by method and URL in the recorded order, falling back to method and path if the query
+# differs (e.g. timestamps or TOTP values); once all matching interactions were used, the last one is repeated
+class HttpCassette(object):
+
+    SECRET_BODY_KEYS = {"accessToken", "access_token", "refresh_token", "refreshToken", "clientId", "client_id", "client_secret", "token", "granted_token", "id_token"}
+
+    def __init__(self, path, mode):
+        self.path = path
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.exact = {}
+        self.by_path = {}
+
+        if mode == "replay":
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    self.exact.setdefault((entry["method"], entry["url"]), []).append(entry)
+                    self.by_path.setdefault((entry["method"], urlparse(entry["url"]).path), []).append(entry)
+        else:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            open(path, "a", encoding="utf-8").close()
+
+    def __len__(self):
+        return sum(len(v) for v in self.exact.values())
+
+    # Returns URL with secret query parameters masked
+    @staticmethod
+    def sanitize_url(url):
+        parsed = urlparse(url)
+        if not parsed.query:
+            return url
+        params = sanitize_debug_params(dict(parse_qsl(parsed.query, keep_blank_values=True)))
+        return parsed._replace(query=urlencode(params, safe=",(){}:")).geturl()
+
+    # Returns True for endpoints handing out tokens (their responses are protobuf or carry the tokens themselves)
+    @staticmethod
+    def is_token_endpoint(url):
+        return url.split("?", 1)[0] in {LOGIN_URL, CLIENTTOKEN_URL, TOKEN_URL, "https://accounts.spotify.com/api/token"}
+
+    # Returns secrets currently known to the tool (tokens, cookies, client secrets) which must never end up in the cassette
+    @staticmethod
+    def known_secrets():
+        values = [SP_CACHED_ACCESS_TOKEN, SP_CACHED_REFRESH_TOKEN, SP_CACHED_CLIENT_TOKEN, SP_CACHED_OAUTH_APP_TOKEN, SP_CACHED_SP_DC, REFRESH_TOKEN, SP_DC_COOKIE, SP_APP_CLIENT_SECRET, SP_USER_CLIENT_SECRET]
+        return {v for v in values if isinstance(v, str) and len(v) >= 16}
+
+    # Returns response body with secret JSON values masked
+    # Bodies of token endpoints and other non-JSON bodies (e.g. protobuf) cannot be masked, so they are not stored at all
+    # (images are the only exception)
+    def sanitize_body(self, url, content, content_type=""):
+        if self.is_token_endpoint(url):
+            return b""
+        try:
+            data = json.loads(content)
+        except (ValueError, UnicodeDecodeError):
+            return content if content_type.lower().startswith("image/") else b""
+
+        def _mask(obj):
+            if isinstance(obj, dict):
+                return {k: mask_secret(v) if k in self.SECRET_BODY_KEYS and isinstance(v, str) else _mask(v) for k, v in obj.items()}
+            if isinstance(obj, list):
+                return [_mask(v) for v in obj]
+            return obj
+
+        return json.dumps(_mask(data)).encode("utf-8")
+
+    def record(self, method, url, headers, response, elapsed):
+        response_headers = {k: v for k, v in sanitize_debug_headers(dict(response.headers)).items() if k.lower() != "set-cookie"}
+        body = self.sanitize_body(url, response._content or b"", response.headers.get("Content-Type", ""))
+        entry = {
+            "method": method,
+            "url": self.sanitize_url(url),
+            "request_headers": sanitize_debug_headers(dict(headers or {})),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": response_headers,
+            "body": base64.b64encode(body).decode("ascii"),
+            "elapsed": round(elapsed, 4),
+        }
+        line = json.dumps(entry)
+        # Last line of defence: never write an interaction containing any secret known at this point
+        if any(secret in line or secret.encode("utf-8") in body for secret in self.known_secrets()):
+            print(f"* Warning: Not recording HTTP {method} {entry['url']} to cassette, it contains a secret")
+            return
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def replay(self, method, url):
+        with self.lock:
+            exact = self.exact.get((method, self.sanitize_url(url))) or []
+            by_path = self.by_path.get((method, urlparse(url).path)) or []
+            entries = exact or by_path
+            if not entries:
+                raise req.ConnectionError(f"HTTP {method} {url}: no matching interaction in cassette '{self.path}'")
+            entry = entries[0]
+            # Consume the interaction from both indexes, but always keep the last one for repeated requests
+            for index in (self.exact.get((method, entry["url"]), []), by_path):
+                if len(index) > 1 and entry in index:
+                    index.remove(entry)
+
+        response = req.Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason", "")
+        response.headers = req.structures.CaseInsensitiveDict(entry.get("headers", {}))
+        response._content = base64.b64decode(entry["body"])
+        response.url = url
+        response.request = req.Request(method, url).prepare()
+        return response
+
+    # Checks the recorded cassette for secrets known at the end of the session (e.g. tokens obtained while recording)
+    # Returns list of offending line numbers, called at exit in record mode
+    def verify(self):
+        secrets_list = [secret.encode("utf-8") for secret in self.known_secrets()]
+        leaks = []
+        with self.lock:
+            with open(self.path, encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    data = line.encode("utf-8") + base64.b64decode(entry.get("body", ""))
+                    if any(secret in data for secret in secrets_list):
+                        leaks.append(line_no)
+        if leaks:
+            print(f"* Error: Cassette '{self.path}' contains secrets in lines {', '.join(map(str, leaks))}, do not share it")
+        return leaks
+
+
+# Cassette used to record or replay HTTP traffic, set in main() via --record / --replay
+HTTP_CASSETTE = None
+
+# Placeholder token returned by token functions in replay mode, so token endpoints are never contacted
+HTTP_REPLAY_TOKEN = "replay-token"
+
+
+# Checks whether HTTP responses are served from the cassette (replay mode)
+def http_replaying() -> bool:
+    return HTTP_CASSETTE is not None and HTTP_CASSETTE.mode == "replay"
+
+
+# Class used to profile monitoring cycles and one-shot commands
+# cProfile covers the calling thread, while the stack sampler covers all threads (including parallel fetches)
+class CodeProfiler(object):
+
+    def __init__(self, every=1, sample_interval=0.005):
+        self.every = max(int(every), 1)
+        self.sample_interval = sample_interval
+        self.profile = None
+        self.label = ""
+        self.samples = Counter()
+        self.sampler = None
+        self.stop_event = threading.Event()
+
+    # Starts profiling of the specified cycle, unless it is not one of every Nth cycles
+    def start_cycle(self, cycle):
+        self.stop()
+        if cycle % self.every == 0:
+            self.start(f"cycle{cycle}")
+
+    def start(self, label):
+        self.label = label
+        self.samples = Counter()
+        self.stop_event.clear()
+        self.sampler = threading.Thread(target=self.sample, name="profiler", daemon=True)
+        self.sampler.start()
+        import cProfile
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def sample(self):
+        own_id = threading.get_ident()
+        while not self.stop_event.wait(self.sample_interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    # Stops profiling and writes .pstats and .folded files next to the log file
+    def stop(self):
+        if self.profile is None:
+            return
+        self.profile.disable()
+        self.stop_event.set()
+        self.sampler.join()
+
+        log_path = Path(os.path.expanduser(SP_LOGFILE))
+        base = log_path.parent / f"{log_path.stem}_{FILE_SUFFIX or 'cli'}_profile_{self.label}_{now_local().strftime('%Y%m%d_%H%M%S')}"
+        try:
+            base.parent.mkdir(parents=True, exist_ok=True)
+            self.profile.dump_stats(f"{base}.pstats")
+            with open(f"{base}.folded", "w", encoding="utf-8") as f:
+                for stack, count in self.samples.items():
+                    f.write(f"{stack} {count}\n")
+            debug_print(f"Profile of {self.label} written to {base}.pstats / {base}.folded")
+        except Exception as e:
+            print(f"* Error: Cannot write profile of {self.label}: {e}")
+        self.profile = None
+
+
+# Code profiler, set in main() if CODE_PROFILING is enabled
+CODE_PROFILER = None
+
+
+# Context manager profiling the block (one-shot commands) if CODE_PROFILING is enabled
+@contextmanager
+def profile_section(label):
+    if CODE_PROFILER is None:
+        yield
+        return
+    CODE_PROFILER.start(label)
+    try:
+        yield
+    finally:
+        CODE_PROFILER.stop()
+
+
+# Thread-local overall deadline shared by all HTTP requests sent inside a time_budget() block
+HTTP_DEADLINE = threading.local()
+
+
+# Context manager setting an overall time budget for all HTTP requests sent by the current thread inside the block
+@contextmanager
+def time_budget(seconds):
+    previous = getattr(HTTP_DEADLINE, "deadline", None)
+    deadline = time.monotonic() + seconds
+    if previous is not None:
+        deadline = min(deadline, previous)
+    HTTP_DEADLINE.deadline = deadline
+    try:
+        yield
+    finally:
+        HTTP_DEADLINE.deadline = previous
+
+
+# Runs function under the time budget deadline captured in the submitting thread, used for thread pool tasks
+# since HTTP_DEADLINE is thread-local and worker threads would otherwise run without any deadline
+def run_with_deadline(deadline, func, *args, **kwargs):
+    if deadline is None:
+        return func(*args, **kwargs)
+    with time_budget(deadline - time.monotonic()):
+        return func(*args, **kwargs)
+
+
+# Sends HTTP request with separate connect / read timeouts and a total time budget covering the whole request
+# including the response body; unlike SIGALRM it works in any thread and on Windows
+# The session can be a requests.Session or the requests module itself
+def http_request(method, url, session=None, budget=None, **kwargs):
+    if session is None:
+        session = SESSION
+    if budget is None:
+        budget = FUNCTION_TIMEOUT
+
+    now = time.monotonic()
+    deadline = now + budget
+    outer_deadline = getattr(HTTP_DEADLINE, "deadline", None)
+    if outer_deadline is not None:
+        deadline = min(deadline, outer_deadline)
+
+    remaining = deadline - now
+    if remaining <= 0:
+        raise TimeoutException(f"HTTP {method} {url}: time budget exhausted before sending the request")
+
+    kwargs["timeout"] = (min(CONNECT_TIMEOUT, remaining), min(FUNCTION_TIMEOUT, remaining))
+    kwargs["stream"] = True
+
+    if HTTP_CASSETTE is not None and HTTP_CASSETTE.mode == "replay":
+        return HTTP_CASSETTE.replay(method, url if not kwargs.get("params") else req.Request(method, url, params=kwargs["params"]).prepare().url)
+
+    endpoint = get_metrics_endpoint(url) if METRICS.enabled else ""
+
+    try:
+        response = session.request(method, url, **kwargs)
+        try:
+            chunks = []
+            for chunk in response.iter_content(chunk_size=65536):
+                chunks.append(chunk)
+                if time.monotonic() > deadline:
+                    raise TimeoutException(f"HTTP {method} {url}: response not received within the time budget ({display_time(max(1, int(remaining)))})")
+            response._content = b"".join(chunks)
+        finally:
+            response.close()
+
+        if time.monotonic() > deadline:
+            raise TimeoutException(f"HTTP {method} {url}: response not received within the time budget ({display_time(max(1, int(remaining)))})")
+    except Exception as e:
+        METRICS.inc("spotify_http_errors_total", endpoint=endpoint, kind="timeout" if isinstance(e, TimeoutException) else type(e).__name__)
+        raise
+    finally:
+        METRICS.observe("spotify_http_request_duration_seconds", time.monotonic() - now, endpoint=endpoint)
+
+    METRICS.inc("spotify_http_requests_total", endpoint=endpoint, status=str(response.status_code))
+    METRICS.inc("spotify_http_response_bytes_total", len(response._content), endpoint=endpoint)
+    request_body = response.request.body if response.request is not None else None
+    if isinstance(request_body, str):
+        request_body = request_body.encode("utf-8")
+    METRICS.inc("spotify_http_request_bytes_total", len(request_body or b""), endpoint=endpoint)
+    if response.status_code >= 400:
+        METRICS.inc("spotify_http_errors_total", endpoint=endpoint, kind=f"http_{response.status_code}")
+
+    if HTTP_CASSETTE is not None:
+        try:
+            HTTP_CASSETTE.record(method, response.url or url, kwargs.get("headers"), response, time.monotonic() - now)
+        except Exception as e:
+            debug_print(f"Cannot record HTTP interaction to cassette: {e}")
+
+    return response
+
+
 # Truncates each line of a string to a specified number of characters including tab expansion and multi-line support
 def truncate_string_per_line(message, truncate_width, tabsize=8):
     try:
@@ -797,22 +1743,77 @@ def truncate_string_per_line(message, truncate_width, tabsize=8):
 
 
 # Logger class to output messages to stdout and log file
+# Log file writes are buffered (flushed periodically and at exit) and the file can be rotated by size or time
 class Logger(object):
-    def __init__(self, filename):
+    def __init__(self, filename, flush_interval=5, max_size=0, rotate_interval=0, backup_count=5, headless=False):
         self.terminal = sys.stdout
-        self.logfile = open(filename, "a", buffering=1, encoding="utf-8")
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.headless = headless
+        self.lock = threading.RLock()
+        self.open_logfile()
+
+        # Output is buffered, so flush it periodically and when the tool exits
+        if flush_interval > 0:
+            threading.Thread(target=self.flush_periodically, name="log-flush", daemon=True).start()
+        atexit.register(self.flush)
+
+    def open_logfile(self):
+        self.logfile = open(self.filename, "a", encoding="utf-8")
+        self.size = os.path.getsize(self.filename)
+        self.opened_at = time.time()
 
     def write(self, message):
-        # Expand tabs for file output (stdout remains untouched)
-        self.logfile.write(message.expandtabs(8))
+        self.write_log(message)
+        if self.headless:
+            return
         if (TRUNCATE_CHARS):
             message = truncate_string_per_line(message, TRUNCATE_CHARS)
         self.terminal.write(message)
-        self.terminal.flush()
-        self.logfile.flush()
+
+    # Writes to the log file only
+    def write_log(self, message):
+        # Expand tabs for file output (stdout remains untouched)
+        message = message.expandtabs(8)
+        with self.lock:
+            self.logfile.write(message)
+            # Count bytes as written to disk (UTF-8, newlines translated to os.linesep), so it matches os.path.getsize()
+            self.size += len(message.encode("utf-8")) + message.count("\n") * (len(os.linesep) - 1)
+            if message.endswith("\n") and ((self.max_size and self.size >= self.max_size) or (self.rotate_interval and time.time() - self.opened_at >= self.rotate_interval)):
+                self.rotate()
+
+    # Renames log file to <log>.1 (shifting older ones) and starts a new one
+    def rotate(self):
+        with self.lock:
+            try:
+                self.logfile.close()
+                for i in range(self.backup_count - 1, 0, -1):
+                    if os.path.exists(f"{self.filename}.{i}"):
+                        os.replace(f"{self.filename}.{i}", f"{self.filename}.{i + 1}")
+                if self.backup_count > 0:
+                    os.replace(self.filename, f"{self.filename}.1")
+                else:
+                    os.remove(self.filename)
+            except OSError as e:
+                self.terminal.write(f"* Error: Cannot rotate log file '{self.filename}': {e}\n")
+            self.open_logfile()
 
     def flush(self):
-        pass
+        with self.lock:
+            try:
+                self.logfile.flush()
+            except ValueError:
+                pass
+        if not self.headless:
+            self.terminal.flush()
+
+    def flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
 
 
 # Class used to generate timeout exceptions
@@ -830,9 +1831,113 @@ class PlaylistRestrictedError(Exception):
     pass
 
 
-# Signal handler for SIGALRM when the operation times out
-def timeout_handler(sig, frame):
-    raise TimeoutException
+# Class used to run tasks in a thread pool while counting submitted tasks which have not finished yet
+# The counter is incremented on submit and decremented by a done callback (used for the queue depth metric)
+class CountingThreadPoolExecutor(ThreadPoolExecutor):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pending_lock = threading.Lock()
+        self.pending_count = 0
+
+    def submit(self, fn, *args, **kwargs):
+        with self.pending_lock:
+            self.pending_count += 1
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except Exception:
+            self.task_done(None)
+            raise
+        future.add_done_callback(self.task_done)
+        return future
+
+    def task_done(self, future):
+        with self.pending_lock:
+            self.pending_count -= 1
+
+    # Number of submitted tasks which are queued or running
+    def pending(self):
+        return self.pending_count
+
+
+# Class used to schedule checks of independently polled entities (like playlists) with adaptive intervals
+# Entities which changed recently are checked every min_interval, dormant ones back off exponentially up to max_interval
+class AdaptivePollScheduler(object):
+    def __init__(self, min_interval, max_interval, backoff_factor):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff_factor = max(backoff_factor, 1)
+        self.entities = {}
+
+    # Returns True if the entity has never been checked or its next check time has passed
+    # Half of min_interval is allowed as slack, since cycles aligned to fixed slots (STAGGER_CHECKS) or shortened by
+    # negative jitter may start slightly before next_check; otherwise such entity would be checked every second cycle
+    def is_due(self, key, now=None):
+        entry = self.entities.get(key)
+        if entry is None:
+            return True
+        if now is None:
+            now = time.time()
+        return now >= entry["next_check"] - self.min_interval / 2
+
+    # Schedules the next check of the entity depending on whether it changed since the previous check
+    def record(self, key, changed, now=None):
+        if now is None:
+            now = time.time()
+        entry = self.entities.get(key)
+        if changed or entry is None:
+            interval = self.min_interval
+        else:
+            interval = min(entry["interval"] * self.backoff_factor, self.max_interval)
+        self.entities[key] = {"interval": interval, "next_check": now + interval}
+        return interval
+
+    # Removes entities which are no longer monitored
+    def retain(self, keys):
+        self.entities = {k: v for k, v in self.entities.items() if k in keys}
+
+
+# Returns deterministic phase of the user's checks within the check interval, derived from the user URI ID
+def get_user_check_phase(user_uri_id, interval):
+    digest = hashlib.sha256(str(user_uri_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % max(int(interval), 1)
+
+
+# Returns number of seconds to wait before the next check, applying the per-user phase and random jitter if enabled
+def get_next_check_delay(user_uri_id, interval):
+    delay = interval
+
+    if STAGGER_CHECKS and interval > 0:
+        delay = (get_user_check_phase(user_uri_id, interval) - time.time()) % interval
+        # Do not check again right away if the aligned slot is too close (e.g. just after start)
+        if delay < interval / 2:
+            delay += interval
+
+    if CHECK_INTERVAL_JITTER > 0:
+        delay += random.uniform(-CHECK_INTERVAL_JITTER, CHECK_INTERVAL_JITTER)
+
+    return max(delay, 1)
+
+
+# Returns number of seconds to wait before the first check, so several instances started together are spread over
+# the interval according to their per-user phase (plus random jitter) right from the start
+def get_initial_check_delay(user_uri_id, interval):
+    delay = 0
+
+    if STAGGER_CHECKS and interval > 0:
+        delay = (get_user_check_phase(user_uri_id, interval) - time.time()) % interval
+
+    if CHECK_INTERVAL_JITTER > 0:
+        delay += random.uniform(0, CHECK_INTERVAL_JITTER)
+
+    return int(delay)
+
+
+# Returns number of seconds to wait before retrying after an error, applying random jitter if enabled
+def get_retry_delay(interval):
+    if CHECK_INTERVAL_JITTER > 0:
+        return max(int(interval + random.uniform(-CHECK_INTERVAL_JITTER, CHECK_INTERVAL_JITTER)), 1)
+    return interval
 
 
 # Signal handler when user presses Ctrl+C
@@ -846,10 +1951,10 @@ def signal_handler(sig, frame):
 def check_internet(url=CHECK_INTERNET_URL, timeout=CHECK_INTERNET_TIMEOUT, verify=VERIFY_SSL):
     try:
         debug_print(f"HTTP GET {url} [connectivity check], timeout={timeout}, verify_ssl={verify}")
-        _ = req.get(url, headers={'User-Agent': USER_AGENT}, timeout=timeout, verify=verify)
+        _ = http_request("GET", url, budget=timeout, headers={'User-Agent': USER_AGENT}, verify=verify)
         debug_print(f"HTTP GET {url} -> OK")
         return True
-    except req.RequestException as e:
+    except (req.RequestException, TimeoutException) as e:
         debug_print(f"HTTP GET {url} -> failed: {e}")
         print(f"* No connectivity, please check your network:\n\n{e}")
         return False
@@ -947,7 +2052,7 @@ def calculate_timespan(timestamp1, timestamp2, show_weeks=True, show_hours=True,
 
     if isinstance(timestamp1, str):
         try:
-            timestamp1 = isoparse(timestamp1)
+            timestamp1 = parse_iso_datetime(timestamp1)
         except Exception:
             return ""
 
@@ -968,7 +2073,7 @@ def calculate_timespan(timestamp1, timestamp2, show_weeks=True, show_hours=True,
 
     if isinstance(timestamp2, str):
         try:
-            timestamp2 = isoparse(timestamp2)
+            timestamp2 = parse_iso_datetime(timestamp2)
         except Exception:
             return ""
 
@@ -994,7 +2099,8 @@ def calculate_timespan(timestamp1, timestamp2, show_weeks=True, show_hours=True,
         dt1, dt2 = dt2, dt1
 
     if ts_diff > 0:
-        date_diff = relativedelta.relativedelta(dt1, dt2)
+        from dateutil.relativedelta import relativedelta
+        date_diff = relativedelta(dt1, dt2)
         years = date_diff.years
         months = date_diff.months
         days_total = date_diff.days
@@ -1024,8 +2130,348 @@ def calculate_timespan(timestamp1, timestamp2, show_weeks=True, show_hours=True,
         return '0 seconds'
 
 
+# Opens authenticated connection to the SMTP server
+def smtp_connect(use_ssl, smtp_timeout=15):
+    import smtplib
+    import ssl
+
+    smtpObj = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=smtp_timeout)
+    try:
+        if use_ssl:
+            ssl_context = ssl.create_default_context()
+            smtpObj.starttls(context=ssl_context)
+        smtpObj.login(SMTP_USER, SMTP_PASSWORD)
+    except Exception:
+        smtpObj.close()
+        raise
+    return smtpObj
+
+
+# Class used to deliver email notifications in the background, reusing a single authenticated SMTP connection
+# Messages are spooled to disk before delivery, so they survive SMTP outages and restarts of the tool
+# The spool directory and the worker thread are only created once there is something to deliver
+class EmailQueue(object):
+
+    def __init__(self, spool_dir, idle_timeout=60, retry_interval=120, smtp_timeout=15):
+        self.spool_dir = spool_dir
+        self.idle_timeout = max(int(idle_timeout), 1)
+        self.retry_interval = max(int(retry_interval), 1)
+        self.smtp_timeout = smtp_timeout
+        self.queue = queue.Queue()
+        # The SMTP connection is guarded by lock, used only by the worker thread (and close() at exit), while producers
+        # only take enqueue_lock, so a slow or unavailable SMTP server never blocks enqueue()
+        self.lock = threading.Lock()
+        self.enqueue_lock = threading.Lock()
+        self.smtp = None
+        self.smtp_ssl = None
+        self.seq = 0
+        self.thread = None
+
+        # Messages left over from the previous run are delivered right away
+        if os.path.isdir(spool_dir):
+            for name in sorted(os.listdir(spool_dir)):
+                if name.endswith(".eml"):
+                    self.queue.put(os.path.join(spool_dir, name))
+            if self.queue.unfinished_tasks:
+                self.start()
+
+    def start(self):
+        with self.enqueue_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="email", daemon=True)
+                self.thread.start()
+
+    # Number of messages waiting for delivery
+    def pending(self):
+        return self.queue.unfinished_tasks
+
+    # Spools the message and hands it over to the worker thread
+    # Returns False if the message could not be spooled, so the caller can send it synchronously instead
+    def enqueue(self, email_str, use_ssl):
+        with self.enqueue_lock:
+            self.seq += 1
+            name = f"{time_ns()}_{self.seq:06d}_{'tls' if use_ssl else 'plain'}.eml"
+        path = os.path.join(self.spool_dir, name)
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(email_str)
+            os.replace(path + ".tmp", path)
+        except Exception as e:
+            print(f"Error spooling email to '{self.spool_dir}', sending it synchronously: {e}")
+            return False
+        self.start()
+        self.queue.put(path)
+        return True
+
+    def run(self):
+        while True:
+            try:
+                path = self.queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self.lock:
+                    self.disconnect()
+                continue
+            try:
+                self.deliver(path)
+            except Exception as e:
+                print(f"Error sending email: {e}")
+            finally:
+                self.queue.task_done()
+
+    def deliver(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                email_str = f.read()
+        except FileNotFoundError:
+            return
+
+        use_ssl = path.endswith("_tls.eml")
+
+        with self.lock:
+            for attempt in (1, 2):
+                try:
+                    if self.smtp is None or self.smtp_ssl != use_ssl:
+                        self.disconnect()
+                        self.smtp = smtp_connect(use_ssl, self.smtp_timeout)
+                        self.smtp_ssl = use_ssl
+                    self.smtp.sendmail(SENDER_EMAIL, RECEIVER_EMAIL, email_str)
+                    break
+                except Exception as e:
+                    self.disconnect()
+                    # The server might have dropped the reused connection, so reconnect once before giving up
+                    if attempt == 1 and type(e).__name__ == "SMTPServerDisconnected":
+                        continue
+                    print(f"Error sending email: {e} (message spooled, retrying in {display_time(self.retry_interval)})")
+                    retry = threading.Timer(self.retry_interval, self.queue.put, args=(path,))
+                    retry.daemon = True
+                    retry.start()
+                    return
+
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def disconnect(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except Exception:
+                try:
+                    self.smtp.close()
+                except Exception:
+                    pass
+            self.smtp = None
+            self.smtp_ssl = None
+
+    # Waits (up to timeout) for queued messages to be delivered and closes the SMTP connection; called at exit
+    def close(self, timeout=15):
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.1)
+        if self.lock.acquire(timeout=max(deadline - time.monotonic(), 0.1)):
+            try:
+                self.disconnect()
+            finally:
+                self.lock.release()
+
+
+# Outbound mail queue, started in main() if EMAIL_QUEUE is enabled
+EMAIL_QUEUE_WORKER = None
+
+
+# Class used to collect change notifications and send them as a single digest email
+class EmailDigest(object):
+
+    def __init__(self, username, window=0):
+        self.username = username
+        self.window = window
+        self.events = []
+        self.started = None
+        self.image_file = ""
+        self.image_name = "image1"
+        self.lock = threading.Lock()
+
+    def add(self, subject, body, body_html, image_file="", image_name="image1"):
+        with self.lock:
+            if not self.events:
+                self.started = time.time()
+            self.events.append((subject, body, body_html))
+            # Only one inline image is supported per email, the most recent one wins
+            if image_file:
+                self.image_file = image_file
+                self.image_name = image_name
+
+    # Returns True if there are collected notifications and the digest window has elapsed
+    def is_due(self):
+        with self.lock:
+            return bool(self.events) and (self.window <= 0 or time.time() - self.started >= self.window)
+
+    # Renders collected notifications into one email and sends it
+    def flush(self, use_ssl):
+        with self.lock:
+            events, self.events = self.events, []
+            image_file, image_name = self.image_file, self.image_name
+            self.image_file = ""
+            self.image_name = "image1"
+
+        if not events:
+            return 0
+
+        if len(events) == 1:
+            subject, body, body_html = events[0]
+            return send_email(subject, body, body_html, use_ssl, image_file, image_name)
+
+        subject = f"Spotify user {self.username}: {len(events)} changes detected"
+        body = f"{len(events)} changes detected for Spotify user {self.username}\n"
+        body_html = f"<html><head></head><body>{len(events)} changes detected for Spotify user <b>{escape(self.username)}</b><br>"
+        for e_subject, e_body, e_body_html in events:
+            body += f"\n{e_subject}\n{'-' * len(e_subject)}\n{e_body}\n"
+            html_match = re.search(r"<body>(.*)</body>", e_body_html or "", re.S)
+            body_html += f"<hr><h3>{escape(e_subject)}</h3>{html_match.group(1) if html_match else escape(e_body).replace(nl_ch, '<br>')}<br>"
+        body_html += "</body></html>"
+
+        return send_email(subject, body, body_html, use_ssl, image_file, image_name)
+
+
+# Change notifications digest, created in main() if EMAIL_DIGEST is enabled
+EMAIL_DIGEST_BUFFER = None
+
+
+# Class used to stream detected changes as newline-delimited JSON events
+class EventStream(object):
+
+    def __init__(self, path):
+        self.path = path
+        self.user_uri_id = ""
+        self.lock = threading.Lock()
+
+        if path == "-":
+            self.file = stdout_bck or sys.__stdout__
+        else:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self.file = open(path, "a", encoding="utf-8")
+
+    # Serializes values json does not handle natively (datetimes as ISO 8601)
+    @staticmethod
+    def serialize(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return str(value)
+
+    def emit(self, event_type, **fields):
+        now = time.time()
+        event = {"type": event_type, "ts": int(now), "time": datetime.fromtimestamp(now, get_local_timezone()).isoformat(timespec="seconds"), "user_uri_id": self.user_uri_id}
+        event.update(fields)
+        line = json.dumps(event, ensure_ascii=False, default=self.serialize) + "\n"
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+        METRICS.inc("spotify_events_total", type=event_type)
+
+    def close(self):
+        with self.lock:
+            if self.path != "-":
+                self.file.close()
+
+
+# Change events stream, created in main() if EVENTS_FILE is set
+EVENT_STREAM = None
+
+
+# Emits change event to the events stream (if enabled)
+def emit_event(event_type, **fields):
+    if EVENT_STREAM is None:
+        return
+    try:
+        EVENT_STREAM.emit(event_type, **fields)
+    except Exception as e:
+        print(f"* Error: Cannot write {event_type} event to '{EVENT_STREAM.path}': {e}")
+
+
+# Class used to space out requests sent from multiple threads so they do not exceed given rate (per second)
+class RateLimiter(object):
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self.next_ts = 0.0
+        self.lock = threading.Lock()
+
+    # Blocks until the caller is allowed to send the next request
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            ts = max(now, self.next_ts)
+            self.next_ts = ts + self.interval
+        if ts > now:
+            time.sleep(ts - now)
+
+
+# Class used to cache user search results on disk, entries older than ttl seconds are ignored and dropped on save
+class SearchCache(object):
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self.entries = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+
+        if path and os.path.isfile(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"* Warning: Cannot load search cache from '{path}': {e}")
+
+    @staticmethod
+    def key(username, limit, offset):
+        return f"{username.strip().lower()}|{limit}|{offset}"
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+        hit = entry is not None and time.time() - entry.get("ts", 0) < self.ttl
+        METRICS.inc("spotify_cache_lookups_total", cache="search", result="hit" if hit else "miss")
+        return entry["result"] if hit else None
+
+    def put(self, key, result):
+        with self.lock:
+            self.entries[key] = {"ts": int(time.time()), "result": result}
+            self.dirty = True
+
+    # Writes the cache atomically (via temporary file), skipped if nothing changed
+    def save(self):
+        with self.lock:
+            if not self.dirty or not self.path:
+                return
+            now = time.time()
+            self.entries = {k: v for k, v in self.entries.items() if now - v.get("ts", 0) < self.ttl}
+            try:
+                with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump(self.entries, f, ensure_ascii=False)
+                os.replace(self.path + ".tmp", self.path)
+                self.dirty = False
+            except Exception as e:
+                print(f"* Warning: Cannot save search cache to '{self.path}': {e}")
+
+
+# Search cache and rate limiter, created in main() when searching for users (-s / --search-file)
+SEARCH_CACHE = None
+SEARCH_RATE_LIMITER = None
+
+
 # Sends email notification
 def send_email(subject, body, body_html, use_ssl, image_file="", image_name="image1", smtp_timeout=15):
+    import ipaddress
+    from email.header import Header
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    from email.mime.image import MIMEImage
+
     fqdn_re = re.compile(r'(?=^.{4,253}$)(^((?!-)[a-zA-Z0-9-]{1,63}(?<!-)\.)+[a-zA-Z]{2,63}\.?$)')
     email_re = re.compile(r'[^@]+@[^@]+\.[^@]+')
 
@@ -1061,13 +2507,6 @@ def send_email(subject, body, body_html, use_ssl, image_file="", image_name="ima
         return 1
 
     try:
-        if use_ssl:
-            ssl_context = ssl.create_default_context()
-            smtpObj = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=smtp_timeout)
-            smtpObj.starttls(context=ssl_context)
-        else:
-            smtpObj = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=smtp_timeout)
-        smtpObj.login(SMTP_USER, SMTP_PASSWORD)
         email_msg = MIMEMultipart('alternative')
         email_msg["From"] = SENDER_EMAIL
         email_msg["To"] = RECEIVER_EMAIL
@@ -1089,7 +2528,17 @@ def send_email(subject, body, body_html, use_ssl, image_file="", image_name="ima
             img_part.add_header('Content-ID', f'<{image_name}>')
             email_msg.attach(img_part)
 
-        smtpObj.sendmail(SENDER_EMAIL, RECEIVER_EMAIL, email_msg.as_string())
+        email_str = email_msg.as_string()
+    except Exception as e:
+        print(f"Error sending email: {e}")
+        return 1
+
+    if EMAIL_QUEUE_WORKER is not None and EMAIL_QUEUE_WORKER.enqueue(email_str, use_ssl):
+        return 0
+
+    try:
+        smtpObj = smtp_connect(use_ssl, smtp_timeout)
+        smtpObj.sendmail(SENDER_EMAIL, RECEIVER_EMAIL, email_str)
         smtpObj.quit()
     except Exception as e:
         print(f"Error sending email: {e}")
@@ -1097,8 +2546,18 @@ def send_email(subject, body, body_html, use_ssl, image_file="", image_name="ima
     return 0
 
 
+# Sends email notification about detected change, or adds it to the digest if EMAIL_DIGEST is enabled
+def send_change_email(subject, body, body_html, use_ssl, image_file="", image_name="image1"):
+    if EMAIL_DIGEST_BUFFER is not None:
+        EMAIL_DIGEST_BUFFER.add(subject, body, body_html, image_file, image_name)
+        return 0
+    return send_email(subject, body, body_html, use_ssl, image_file, image_name)
+
+
 # Initializes the CSV file
 def init_csv_file(csv_file_name, format_type=1):
+    import csv
+
     try:
         csv_fields = csvfieldnames if format_type == 1 else csvfieldnames_export
         if not os.path.isfile(csv_file_name) or os.path.getsize(csv_file_name) == 0:
@@ -1111,6 +2570,8 @@ def init_csv_file(csv_file_name, format_type=1):
 
 # Writes CSV entry
 def write_csv_entry(csv_file_name, timestamp, object_type, object_name, old, new, format_type=1):
+    import csv
+
     try:
         if format_type == 1:
             csv_fields = csvfieldnames
@@ -1127,9 +2588,89 @@ def write_csv_entry(csv_file_name, timestamp, object_type, object_name, old, new
         raise RuntimeError(f"Failed to write to CSV file '{csv_file_name}': {e}")
 
 
+# Class used to write exported tracks to ndjson or parquet file, rows are buffered and written out in batches
+class TrackExportWriter(object):
+
+    COLUMNS = ["uri", "artist", "track", "duration", "added_at", "added_by"]
+
+    def __init__(self, path, export_format, batch_size=5000):
+        self.path = path
+        self.export_format = export_format
+        self.batch_size = max(1, batch_size)
+        self.rows = []
+        self.file = None
+        self.parquet_writer = None
+
+        if export_format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            self.pa = pa
+            self.schema = pa.schema([
+                ("uri", pa.string()),
+                ("artist", pa.string()),
+                ("track", pa.string()),
+                ("duration", pa.int32()),
+                ("added_at", pa.timestamp("s", tz="UTC")),
+                ("added_by", pa.string()),
+            ])
+            self.parquet_writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self.file = open(path, "w", buffering=1024 * 1024, encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Adds track row (dict with COLUMNS keys, added_at as aware datetime) and writes the batch out once it is full
+    def write(self, row):
+        added_at = row.get("added_at")
+        if isinstance(added_at, datetime):
+            added_at = added_at.astimezone(timezone.utc)
+        self.rows.append({"uri": row.get("uri") or "", "artist": row.get("artist") or "", "track": row.get("track") or "", "duration": int(row.get("duration") or 0), "added_at": added_at, "added_by": row.get("added_by") or ""})
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.parquet_writer is not None:
+            self.parquet_writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+        else:
+            for row in self.rows:
+                if row["added_at"] is not None:
+                    row["added_at"] = row["added_at"].strftime("%Y-%m-%dT%H:%M:%SZ")
+                self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.rows = []
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self.parquet_writer is not None:
+                self.parquet_writer.close()
+                self.parquet_writer = None
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+# Returns track export writer for the file if EXPORT_FORMAT is ndjson / parquet, None for CSV (or simplified) output
+def get_track_export_writer(file_name):
+    if not file_name or CLEAN_OUTPUT or EXPORT_FORMAT not in ("ndjson", "parquet"):
+        return None
+    return TrackExportWriter(file_name, EXPORT_FORMAT, EXPORT_BATCH_SIZE)
+
+
+# Returns file extension matching EXPORT_FORMAT
+def get_export_file_extension():
+    return ".parquet" if EXPORT_FORMAT == "parquet" else ".ndjson" if EXPORT_FORMAT == "ndjson" else ".csv"
+
+
 # Converts a datetime to local timezone and removes timezone info (naive)
 def convert_to_local_naive(dt: datetime | None = None):
-    tz = pytz.timezone(LOCAL_TIMEZONE)
+    tz = get_local_timezone()
 
     if dt is not None:
         if dt.tzinfo is None:
@@ -1142,14 +2683,54 @@ def convert_to_local_naive(dt: datetime | None = None):
         return None
 
 
+# Local timezone object, resolved once per LOCAL_TIMEZONE value
+LOCAL_TZ_CACHE = (None, None)
+
+
+# Returns pytz timezone object for LOCAL_TIMEZONE (cached, so hot loops do not repeat the pytz.timezone() lookup)
+def get_local_timezone():
+    global LOCAL_TZ_CACHE
+    if LOCAL_TZ_CACHE[0] != LOCAL_TIMEZONE:
+        LOCAL_TZ_CACHE = (LOCAL_TIMEZONE, pytz.timezone(LOCAL_TIMEZONE))
+    return LOCAL_TZ_CACHE[1]
+
+
 # Returns current local time without timezone info (naive)
 def now_local_naive():
-    return datetime.now(pytz.timezone(LOCAL_TIMEZONE)).replace(microsecond=0, tzinfo=None)
+    return datetime.now(get_local_timezone()).replace(microsecond=0, tzinfo=None)
 
 
 # Returns current local time with timezone info (aware)
 def now_local():
-    return datetime.now(pytz.timezone(LOCAL_TIMEZONE))
+    return datetime.now(get_local_timezone())
+
+
+# Parses ISO 8601 datetime string (dateutil is imported on first use as it is slow to load)
+def parse_iso_datetime(dt_str):
+    from dateutil.parser import isoparse
+    return isoparse(dt_str)
+
+
+# Parses ISO datetime string to aware UTC datetime
+# Spotify's fixed "YYYY-MM-DDTHH:MM:SSZ" format is handled by the fast built-in parser, other formats by dateutil
+def parse_iso_utc_datetime(dt_str):
+    if len(dt_str) == 20 and dt_str[19] == "Z":
+        return datetime.fromisoformat(dt_str[:19] + "+00:00")
+    utc_dt = parse_iso_datetime(dt_str)
+    if utc_dt.tzinfo is None:
+        utc_dt = pytz.utc.localize(utc_dt)
+    return utc_dt
+
+
+# Converts ISO datetime string to epoch timestamp (int)
+def convert_iso_str_to_ts(dt_str):
+    if not dt_str:
+        return None
+
+    try:
+        return int(parse_iso_utc_datetime(dt_str).timestamp())
+    except Exception:
+        return None
 
 
 # Converts ISO datetime string to localized datetime (aware)
@@ -1158,10 +2739,7 @@ def convert_iso_str_to_datetime(dt_str):
         return None
 
     try:
-        utc_dt = isoparse(dt_str)
-        if utc_dt.tzinfo is None:
-            utc_dt = pytz.utc.localize(utc_dt)
-        return utc_dt.astimezone(pytz.timezone(LOCAL_TIMEZONE))
+        return parse_iso_utc_datetime(dt_str).astimezone(get_local_timezone())
     except Exception:
         return None
 
@@ -1179,11 +2757,11 @@ def print_cur_ts(ts_str=""):
 
 # Returns the timestamp/datetime object in human readable format (long version); eg. Sun 21 Apr 2024, 15:08:45
 def get_date_from_ts(ts):
-    tz = pytz.timezone(LOCAL_TIMEZONE)
+    tz = get_local_timezone()
 
     if isinstance(ts, str):
         try:
-            ts = isoparse(ts)
+            ts = parse_iso_datetime(ts)
         except Exception:
             return ""
 
@@ -1213,13 +2791,13 @@ def get_date_from_ts(ts):
 # Sun 21 Apr 15:08:32 (if show_seconds == True)
 # 21 Apr 15:08 (if show_weekday == False)
 def get_short_date_from_ts(ts, show_year=False, show_hour=True, show_weekday=True, show_seconds=False, always_show_year=False):
-    tz = pytz.timezone(LOCAL_TIMEZONE)
+    tz = get_local_timezone()
     if always_show_year:
         show_year = True
 
     if isinstance(ts, str):
         try:
-            ts = isoparse(ts)
+            ts = parse_iso_datetime(ts)
         except Exception:
             return ""
 
@@ -1254,11 +2832,11 @@ def get_short_date_from_ts(ts, show_year=False, show_hour=True, show_weekday=Tru
 
 # Returns the timestamp/datetime object in human readable format (only hour, minutes and optionally seconds): eg. 15:08:12
 def get_hour_min_from_ts(ts, show_seconds=False):
-    tz = pytz.timezone(LOCAL_TIMEZONE)
+    tz = get_local_timezone()
 
     if isinstance(ts, str):
         try:
-            ts = isoparse(ts)
+            ts = parse_iso_datetime(ts)
         except Exception:
             return ""
 
@@ -1283,7 +2861,7 @@ def get_hour_min_from_ts(ts, show_seconds=False):
 
 # Returns the range between two timestamps/datetime objects; eg. Sun 21 Apr 14:09 - 14:15
 def get_range_of_dates_from_tss(ts1, ts2, between_sep=" - ", short=False):
-    tz = pytz.timezone(LOCAL_TIMEZONE)
+    tz = get_local_timezone()
 
     if isinstance(ts1, datetime):
         ts1_new = int(round(ts1.timestamp()))
@@ -1394,6 +2972,8 @@ def reload_secrets_signal_handler(sig, frame):
                 globals()[secret] = val
                 print(f"* Reloaded {secret} from {env_path}{suffix}")
 
+        refresh_credentials_pools()
+
     if TOKEN_SOURCE == 'client':
 
         # Process the login request body file
@@ -1607,24 +3187,18 @@ def check_token_validity(access_token: str, client_id: Optional[str] = None, use
             "Client-Id": client_id
         })
 
-    if platform.system() != 'Windows':
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(FUNCTION_TIMEOUT + 2)
     try:
         debug_print(
             f"Token validity check mode={check_mode}, url={url}, "
             f"client_id_header={'yes' if 'Client-Id' in headers else 'no'}"
         )
         debug_print(f"HTTP GET {url} [token validity] headers={sanitize_debug_headers(headers)}")
-        response = req.get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        response = http_request("GET", url, session=req, headers=headers, verify=VERIFY_SSL)
         valid = response.status_code == 200
         debug_print(f"HTTP GET {url} -> {response.status_code} [token validity mode={check_mode}] (valid={valid})")
     except Exception:
         valid = False
         debug_print(f"HTTP GET {url} -> failed during token validity check [mode={check_mode}]")
-    finally:
-        if platform.system() != 'Windows':
-            signal.alarm(0)
     return valid
 
 
@@ -1722,20 +3296,14 @@ def fetch_server_time(session: req.Session, ua: str) -> int:
     }
 
     try:
-        if platform.system() != 'Windows':
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(FUNCTION_TIMEOUT + 2)
         debug_print(f"HTTP HEAD {SERVER_TIME_URL} [server time] timeout={FUNCTION_TIMEOUT}")
-        response = session.head(SERVER_TIME_URL, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        response = http_request("HEAD", SERVER_TIME_URL, session=session, headers=headers, verify=VERIFY_SSL)
         response.raise_for_status()
         debug_print(f"HTTP HEAD {SERVER_TIME_URL} -> {response.status_code}")
     except TimeoutException as e:
-        raise Exception(f"fetch_server_time() head network request timeout after {display_time(FUNCTION_TIMEOUT + 2)}: {e}")
+        raise Exception(f"fetch_server_time() head network request timeout after {display_time(FUNCTION_TIMEOUT)}: {e}")
     except Exception as e:
         raise Exception(f"fetch_server_time() head network request error: {e}")
-    finally:
-        if platform.system() != 'Windows':
-            signal.alarm(0)
 
     date_hdr = response.headers.get("Date")
     if not date_hdr:
@@ -1805,7 +3373,7 @@ def fetch_and_update_secrets():
         else:
             print(f"Fetching Spotify web-player TOTP secrets from URL: {SECRET_CIPHER_DICT_URL}")
             debug_print(f"HTTP GET {SECRET_CIPHER_DICT_URL} [secrets update]")
-            response = req.get(SECRET_CIPHER_DICT_URL, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+            response = http_request("GET", SECRET_CIPHER_DICT_URL, session=req, verify=VERIFY_SSL)
             response.raise_for_status()
             debug_print(f"HTTP GET {SECRET_CIPHER_DICT_URL} -> {response.status_code}")
             if not response.text.strip():
@@ -1835,9 +3403,11 @@ def fetch_and_update_secrets():
 
 # Refreshes the Spotify access token using the sp_dc cookie, tries first with mode "transport" and if needed with "init"
 def refresh_access_token_from_sp_dc(sp_dc: str) -> dict:
+    METRICS.inc("spotify_token_refreshes_total", source="cookie")
     transport = True
     init = True
     session = req.Session()
+    session.hooks["response"].append(credentials_pool_response_hook)
     data: dict = {}
     token = ""
 
@@ -1875,12 +3445,8 @@ def refresh_access_token_from_sp_dc(sp_dc: str) -> dict:
     last_err = ""
 
     try:
-        if platform.system() != "Windows":
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(FUNCTION_TIMEOUT + 2)
-
         debug_print(f"HTTP GET {TOKEN_URL} [sp_dc transport] params={sanitize_debug_params(params)} headers={sanitize_debug_headers(headers)}")
-        response = session.get(TOKEN_URL, params=params, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        response = http_request("GET", TOKEN_URL, session=session, params=params, headers=headers, verify=VERIFY_SSL)
         response.raise_for_status()
         data = response.json()
         token = data.get("accessToken", "")
@@ -1890,20 +3456,13 @@ def refresh_access_token_from_sp_dc(sp_dc: str) -> dict:
         transport = False
         last_err = str(e)
         debug_print(f"HTTP GET {TOKEN_URL} [sp_dc transport] failed: {e}")
-    finally:
-        if platform.system() != "Windows":
-            signal.alarm(0)
 
     if not transport or (transport and not check_token_validity(token, data.get("clientId", ""), USER_AGENT)):
         params["reason"] = "init"
 
         try:
-            if platform.system() != "Windows":
-                signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(FUNCTION_TIMEOUT + 2)
-
             debug_print(f"HTTP GET {TOKEN_URL} [sp_dc init] params={sanitize_debug_params(params)} headers={sanitize_debug_headers(headers)}")
-            response = session.get(TOKEN_URL, params=params, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+            response = http_request("GET", TOKEN_URL, session=session, params=params, headers=headers, verify=VERIFY_SSL)
             response.raise_for_status()
             data = response.json()
             token = data.get("accessToken", "")
@@ -1913,9 +3472,6 @@ def refresh_access_token_from_sp_dc(sp_dc: str) -> dict:
             init = False
             last_err = str(e)
             debug_print(f"HTTP GET {TOKEN_URL} [sp_dc init] failed: {e}")
-        finally:
-            if platform.system() != "Windows":
-                signal.alarm(0)
 
     if not init or not data or "accessToken" not in data:
         raise Exception(f"refresh_access_token_from_sp_dc(): Unsuccessful token request{': ' + last_err if last_err else ''}")
@@ -1930,7 +3486,17 @@ def refresh_access_token_from_sp_dc(sp_dc: str) -> dict:
 
 # Fetches Spotify access token based on provided SP_DC value
 def spotify_get_access_token_from_sp_dc(sp_dc: str):
-    global SP_CACHED_ACCESS_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT, SP_CACHED_CLIENT_ID
+    global SP_CACHED_ACCESS_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT, SP_CACHED_CLIENT_ID, SP_CACHED_SP_DC
+
+    # When rotating across several sp_dc cookies, each of them keeps its own cached access token
+    if sp_dc != SP_CACHED_SP_DC:
+        if SP_CACHED_SP_DC is not None:
+            SP_DC_TOKENS_CACHE[SP_CACHED_SP_DC] = (SP_CACHED_ACCESS_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT, SP_CACHED_CLIENT_ID)
+        SP_CACHED_ACCESS_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT, SP_CACHED_CLIENT_ID = SP_DC_TOKENS_CACHE.pop(sp_dc, (None, 0, ""))
+        SP_CACHED_SP_DC = sp_dc
+
+    if http_replaying():
+        return HTTP_REPLAY_TOKEN
 
     now = time.time()
 
@@ -1966,6 +3532,7 @@ def spotify_get_access_token_from_sp_dc(sp_dc: str):
                 time.sleep(TOKEN_RETRY_TIMEOUT)
             else:
                 debug_print(f"Spotify access token obtained successfully, length={length}")
+                SP_DC_POOL.bind_token(SP_CACHED_ACCESS_TOKEN, sp_dc)
                 break
         except SecretsUnavailableError as e:
             last_error = str(e)
@@ -1997,6 +3564,7 @@ def spotify_get_access_token_from_sp_dc(sp_dc: str):
 
                 if SP_CACHED_ACCESS_TOKEN and check_token_validity(SP_CACHED_ACCESS_TOKEN, SP_CACHED_CLIENT_ID, USER_AGENT):
                     debug_print("Spotify access token obtained successfully after secrets update")
+                    SP_DC_POOL.bind_token(SP_CACHED_ACCESS_TOKEN, sp_dc)
                     return SP_CACHED_ACCESS_TOKEN
             except Exception as e:
                 last_error = str(e)
@@ -2017,11 +3585,14 @@ def spotify_get_access_token_from_sp_dc(sp_dc: str):
 
 # Fetches Spotify access token based on provided sp_client_id & sp_client_secret values (Client Credentials OAuth Flow)
 def spotify_get_access_token_from_oauth_app(sp_client_id, sp_client_secret):
-    global SP_CACHED_OAUTH_APP_TOKEN
+    global SP_CACHED_OAUTH_APP_TOKEN, SP_CACHED_OAUTH_APP_CLIENT_ID
 
     if not sp_client_id or not sp_client_secret:
         return None
 
+    if http_replaying():
+        return HTTP_REPLAY_TOKEN
+
     try:
         from spotipy.oauth2 import SpotifyClientCredentials
         from spotipy.cache_handler import CacheFileHandler, MemoryCacheHandler
@@ -2029,21 +3600,42 @@ def spotify_get_access_token_from_oauth_app(sp_client_id, sp_client_secret):
         print("* Warning: the 'spotipy' package is required for 'oauth_app' token source, install it with `pip install spotipy`")
         return None
 
+    # When rotating across several OAuth apps, each of them keeps its own cached access token
+    if sp_client_id != SP_CACHED_OAUTH_APP_CLIENT_ID:
+        if SP_CACHED_OAUTH_APP_CLIENT_ID is not None:
+            SP_OAUTH_APP_TOKENS_CACHE[SP_CACHED_OAUTH_APP_CLIENT_ID] = SP_CACHED_OAUTH_APP_TOKEN
+        SP_CACHED_OAUTH_APP_TOKEN = SP_OAUTH_APP_TOKENS_CACHE.pop(sp_client_id, None)
+        SP_CACHED_OAUTH_APP_CLIENT_ID = sp_client_id
+
     if SP_CACHED_OAUTH_APP_TOKEN and check_token_validity(SP_CACHED_OAUTH_APP_TOKEN, oauth_app=True):
         debug_print("Using cached OAuth app access token")
         return SP_CACHED_OAUTH_APP_TOKEN
 
     if SP_APP_TOKENS_FILE:
-        cache_handler = CacheFileHandler(cache_path=SP_APP_TOKENS_FILE)
+        # Additional apps from SP_APP_CREDS get their own cache file, so their tokens do not get mixed up
+        if sp_client_id == SP_APP_CLIENT_ID:
+            cache_handler = CacheFileHandler(cache_path=SP_APP_TOKENS_FILE)
+        else:
+            cache_handler = CacheFileHandler(cache_path=f"{SP_APP_TOKENS_FILE}.{sp_client_id[:8]}")
     else:
         cache_handler = MemoryCacheHandler()
 
+    # Sideline these app credentials if the token endpoint itself answers with 429 or 401
+    def sideline_hook(response, *args, **kwargs):
+        if response.status_code in (401, 429):
+            SP_APP_CREDS_POOL.sideline((sp_client_id, sp_client_secret), response.status_code)
+
     session = req.Session()
     session.headers.update({'User-Agent': USER_AGENT})
+    session.hooks["response"].append(sideline_hook)
 
     auth_manager = SpotifyClientCredentials(client_id=sp_client_id, client_secret=sp_client_secret, cache_handler=cache_handler, requests_session=session)  # type: ignore[arg-type]
 
-    SP_CACHED_OAUTH_APP_TOKEN = auth_manager.get_access_token(as_dict=False)
+    oauth_app_token = auth_manager.get_access_token(as_dict=False)
+    if oauth_app_token != SP_CACHED_OAUTH_APP_TOKEN:
+        METRICS.inc("spotify_token_refreshes_total", source="oauth_app")
+    SP_CACHED_OAUTH_APP_TOKEN = oauth_app_token
+    SP_APP_CREDS_POOL.bind_token(SP_CACHED_OAUTH_APP_TOKEN, (sp_client_id, sp_client_secret))
     debug_print("OAuth app access token refreshed successfully")
 
     return SP_CACHED_OAUTH_APP_TOKEN
@@ -2060,6 +3652,9 @@ def spotify_get_access_token_from_oauth_app(sp_client_id, sp_client_secret):
 def spotify_get_access_token_from_oauth_user(sp_client_id, sp_client_secret, redirect_uri, scope, init=False):
     global SP_CACHED_ACCESS_TOKEN
 
+    if http_replaying():
+        return HTTP_REPLAY_TOKEN
+
     try:
         from spotipy.oauth2 import SpotifyOAuth, SpotifyPKCE
         from spotipy.cache_handler import CacheFileHandler, MemoryCacheHandler
@@ -2110,6 +3705,7 @@ def spotify_get_access_token_from_oauth_user(sp_client_id, sp_client_secret, red
         refresh_token = token_info.get("refresh_token")
         if init and refresh_token:
             token_info = auth_manager.refresh_access_token(refresh_token)
+            METRICS.inc("spotify_token_refreshes_total", source="oauth_user")
         else:
             raise RuntimeError("User token expired - reauthorization required")
 
@@ -2444,6 +4040,9 @@ def build_clienttoken_request_protobuf(app_version, device_id, system_id, cpu_ar
 def spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refresh_token, client_token):
     global SP_CACHED_ACCESS_TOKEN, SP_CACHED_REFRESH_TOKEN, SP_ACCESS_TOKEN_EXPIRES_AT
 
+    if http_replaying():
+        return HTTP_REPLAY_TOKEN
+
     if SP_CACHED_ACCESS_TOKEN and time.time() < SP_ACCESS_TOKEN_EXPIRES_AT and check_token_validity(SP_CACHED_ACCESS_TOKEN, user_agent=USER_AGENT):
         debug_print("Using cached Spotify access token (client source)")
         return SP_CACHED_ACCESS_TOKEN
@@ -2451,6 +4050,8 @@ def spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refr
     if not client_token:
         raise Exception("Client token is missing")
 
+    METRICS.inc("spotify_token_refreshes_total", source="client")
+
     if SP_CACHED_REFRESH_TOKEN:
         debug_print("Using cached refresh token for client auth flow")
         refresh_token = SP_CACHED_REFRESH_TOKEN
@@ -2477,21 +4078,15 @@ def spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refr
     }
 
     try:
-        if platform.system() != 'Windows':
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(FUNCTION_TIMEOUT + 2)
         debug_print(f"HTTP POST {LOGIN_URL} [client auth] headers={sanitize_debug_headers(headers)} payload_len={len(protobuf_body)}")
-        response = req.post(LOGIN_URL, headers=headers, data=protobuf_body, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        response = http_request("POST", LOGIN_URL, session=req, headers=headers, data=protobuf_body, verify=VERIFY_SSL)
         debug_print(f"HTTP POST {LOGIN_URL} [client auth] -> {response.status_code}")
     except TimeoutException as e:
         debug_print(f"HTTP POST {LOGIN_URL} [client auth] timeout: {e}")
-        raise Exception(f"spotify_get_access_token_from_client() network request timeout after {display_time(FUNCTION_TIMEOUT + 2)}: {e}")
+        raise Exception(f"spotify_get_access_token_from_client() network request timeout after {display_time(FUNCTION_TIMEOUT)}: {e}")
     except Exception as e:
         debug_print(f"HTTP POST {LOGIN_URL} [client auth] failed: {e}")
         raise Exception(f"spotify_get_access_token_from_client() network request error: {e}")
-    finally:
-        if platform.system() != 'Windows':
-            signal.alarm(0)
 
     if response.status_code != 200:
         if response.headers.get("client-token-error") == "INVALID_CLIENTTOKEN":
@@ -2549,6 +4144,9 @@ def spotify_get_access_token_from_client(device_id, system_id, user_uri_id, refr
 def spotify_get_client_token(app_version, device_id, system_id, **device_overrides):
     global SP_CACHED_CLIENT_TOKEN, SP_CLIENT_TOKEN_EXPIRES_AT
 
+    if http_replaying():
+        return HTTP_REPLAY_TOKEN
+
     if SP_CACHED_CLIENT_TOKEN and time.time() < SP_CLIENT_TOKEN_EXPIRES_AT:
         debug_print("Using cached client token")
         return SP_CACHED_CLIENT_TOKEN
@@ -2572,21 +4170,15 @@ def spotify_get_client_token(app_version, device_id, system_id, **device_overrid
     }
 
     try:
-        if platform.system() != 'Windows':
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(FUNCTION_TIMEOUT + 2)
         debug_print(f"HTTP POST {CLIENTTOKEN_URL} [client token] app_version={app_version}, device_overrides={device_overrides}, payload_len={len(body)}")
-        response = req.post(CLIENTTOKEN_URL, headers=headers, data=body, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        response = http_request("POST", CLIENTTOKEN_URL, session=req, headers=headers, data=body, verify=VERIFY_SSL)
         debug_print(f"HTTP POST {CLIENTTOKEN_URL} [client token] -> {response.status_code}")
     except TimeoutException as e:
         debug_print(f"HTTP POST {CLIENTTOKEN_URL} [client token] timeout: {e}")
-        raise Exception(f"spotify_get_client_token() network request timeout after {display_time(FUNCTION_TIMEOUT + 2)}: {e}")
+        raise Exception(f"spotify_get_client_token() network request timeout after {display_time(FUNCTION_TIMEOUT)}: {e}")
     except Exception as e:
         debug_print(f"HTTP POST {CLIENTTOKEN_URL} [client token] failed: {e}")
         raise Exception(f"spotify_get_client_token() network request error: {e}")
-    finally:
-        if platform.system() != 'Windows':
-            signal.alarm(0)
 
     if response.status_code != 200:
         raise Exception(f"clienttoken request failed - status {response.status_code}\nHeaders: {response.headers}\nBody (raw): {response.content[:120]}...")
@@ -2668,10 +4260,11 @@ def remove_key_from_list_of_dicts_copy(list_of_dicts, del_key):
 
 # Displays the downloaded image for user's profile or playlist's artwork
 def display_tmp_pic(image_url, pic_file_tmp, imgcat_exe=None, is_profile=True):
+    import subprocess
 
     if image_url:
         if save_profile_pic(image_url, pic_file_tmp):
-            pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(pic_file_tmp)), pytz.timezone(LOCAL_TIMEZONE))
+            pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(pic_file_tmp)), get_local_timezone())
             if not is_profile:
                 delta_seconds = abs((now_local() - pic_mdate_dt).total_seconds())
                 if delta_seconds <= 60:
@@ -2764,7 +4357,7 @@ def spotify_convert_url_to_uri(url):
 def is_playlist_private(access_token, playlist_uri, oauth_app: bool = False):
     if TOKEN_SOURCE in {"cookie", "client"} and not oauth_app:
         debug_print("is_playlist_private(): requesting oauth_app token for cookie/client mode")
-        access_token = spotify_get_access_token_from_oauth_app(SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET)
+        access_token = spotify_get_access_token_from_oauth_app(*SP_APP_CREDS_POOL.acquire())
         oauth_app = True
         if not access_token:
             debug_print("is_playlist_private(): missing oauth_app token, returning False")
@@ -2785,7 +4378,7 @@ def is_playlist_private(access_token, playlist_uri, oauth_app: bool = False):
 
     try:
         debug_print(f"HTTP GET {url} [playlist private check] headers={sanitize_debug_headers(headers)}")
-        response = SESSION.get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        response = http_request("GET", url, headers=headers, verify=VERIFY_SSL)
         debug_print(f"HTTP GET {url} [playlist private check] -> {response.status_code}")
         if response.status_code == 404:
             debug_print(f"is_playlist_private(): playlist_uri={playlist_uri} resolved as private/restricted")
@@ -2805,7 +4398,7 @@ def is_user_removed(access_token, user_uri_id, oauth_app: bool = False):
         url = f"https://open.spotify.com/user/{user_uri_id}"
         try:
             debug_print(f"HTTP HEAD {url} [user removed check]")
-            response = req.head(url, timeout=FUNCTION_TIMEOUT, allow_redirects=True, verify=VERIFY_SSL)
+            response = http_request("HEAD", url, session=req, allow_redirects=True, verify=VERIFY_SSL)
             debug_print(f"HTTP HEAD {url} [user removed check] -> {response.status_code}")
             if response.status_code == 404:
                 return True
@@ -2828,16 +4421,12 @@ def is_user_removed(access_token, user_uri_id, oauth_app: bool = False):
             "Client-Id": SP_CACHED_CLIENT_ID
         })
 
-    if platform.system() != 'Windows':
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(FUNCTION_TIMEOUT + 2)
-
     try:
         temp_session = req.Session()
         temp_session.headers.update(headers)
 
         debug_print(f"HTTP GET {url} [user removed check] headers={sanitize_debug_headers(headers)}")
-        response = temp_session.get(url, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        response = http_request("GET", url, session=temp_session, verify=VERIFY_SSL)
         debug_print(f"HTTP GET {url} [user removed check] -> {response.status_code}")
 
         if response.status_code == 429:
@@ -2856,18 +4445,23 @@ def is_user_removed(access_token, user_uri_id, oauth_app: bool = False):
         return False
     except Exception:
         return False
-    finally:
-        if platform.system() != 'Windows':
-            signal.alarm(0)
 
 
 # Returns True if the access token owner's user ID matches the provided user_uri_id, False otherwise
 def is_token_owner(access_token, user_uri_id) -> bool:
+    global SP_CACHED_TOKEN_OWNER_ACCESS_TOKEN, SP_CACHED_TOKEN_OWNER_ID
+
     # /v1/me is only reliable/usable for oauth_user now
     if TOKEN_SOURCE != "oauth_user":
         debug_print(f"is_token_owner(): skipped because TOKEN_SOURCE={TOKEN_SOURCE}")
         return False
 
+    # The owner of a given access token never changes, so we only ask /v1/me again once the token is refreshed
+    if SP_CACHED_TOKEN_OWNER_ID and SP_CACHED_TOKEN_OWNER_ACCESS_TOKEN == access_token:
+        owner_match = SP_CACHED_TOKEN_OWNER_ID == user_uri_id
+        debug_print(f"is_token_owner(): cache hit, requested_user={user_uri_id}, owner_match={owner_match}")
+        return owner_match
+
     url = "https://api.spotify.com/v1/me"
 
     headers = {
@@ -2877,10 +4471,14 @@ def is_token_owner(access_token, user_uri_id) -> bool:
 
     try:
         debug_print(f"HTTP GET {url} [token owner check] headers={sanitize_debug_headers(headers)}")
-        response = SESSION.get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        response = http_request("GET", url, headers=headers, verify=VERIFY_SSL)
         debug_print(f"HTTP GET {url} [token owner check] -> {response.status_code}")
         response.raise_for_status()
-        owner_match = response.json().get("id") == user_uri_id
+        owner_id = response.json().get("id")
+        if owner_id:
+            SP_CACHED_TOKEN_OWNER_ACCESS_TOKEN = access_token
+            SP_CACHED_TOKEN_OWNER_ID = owner_id
+        owner_match = owner_id == user_uri_id
         debug_print(f"is_token_owner(): requested_user={user_uri_id}, owner_match={owner_match}")
         return owner_match
     except Exception as e:
@@ -2892,7 +4490,7 @@ def is_token_owner(access_token, user_uri_id) -> bool:
 def spotify_get_playlist_info(access_token, playlist_uri, get_tracks, oauth_app: bool = False):
     debug_print(f"spotify_get_playlist_info(): uri={playlist_uri}, get_tracks={get_tracks}, token_source={TOKEN_SOURCE}, oauth_app_override={oauth_app}")
     if TOKEN_SOURCE in {"cookie", "client"} and not oauth_app:
-        access_token = spotify_get_access_token_from_oauth_app(SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET)
+        access_token = spotify_get_access_token_from_oauth_app(*SP_APP_CREDS_POOL.acquire())
         oauth_app = True
         if not access_token:
             raise Exception("spotify_get_playlist_info(): oauth_app token is missing - set SP_APP_CLIENT_ID/SP_APP_CLIENT_SECRET (or pass -r / --oauth-app-creds)")
@@ -2925,7 +4523,7 @@ def spotify_get_playlist_info(access_token, playlist_uri, get_tracks, oauth_app:
 
     try:
         debug_print(f"HTTP GET {url1} [playlist info] headers={sanitize_debug_headers(headers)}")
-        response1 = SESSION.get(url1, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        response1 = http_request("GET", url1, headers=headers, verify=VERIFY_SSL)
         debug_print(f"HTTP GET {url1} [playlist info] -> {response1.status_code}")
         if response1.status_code == 404:
             raise PlaylistRestrictedError(f"404 Not Found for playlist endpoint: {url1}")
@@ -2938,7 +4536,7 @@ def spotify_get_playlist_info(access_token, playlist_uri, get_tracks, oauth_app:
         while next_url:
             page_idx += 1
             debug_print(f"HTTP GET {next_url} [playlist tracks page={page_idx}] headers={sanitize_debug_headers(headers)}")
-            response2 = SESSION.get(next_url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+            response2 = http_request("GET", next_url, headers=headers, verify=VERIFY_SSL)
             debug_print(f"HTTP GET {next_url} [playlist tracks page={page_idx}] -> {response2.status_code}")
             response2.raise_for_status()
             json_response2 = response2.json()
@@ -3076,7 +4674,7 @@ def spotify_get_user_info(access_token, user_uri_id, get_playlists, recently_pla
         if TOKEN_SOURCE == "cookie":
             headers["Client-Id"] = SP_CACHED_CLIENT_ID
         debug_print(f"HTTP GET {url} [user info] headers={sanitize_debug_headers(headers)}")
-        response = SESSION.get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL, **kw)
+        response = http_request("GET", url, headers=headers, verify=VERIFY_SSL, **kw)
         debug_print(f"HTTP GET {url} [user info] -> {response.status_code}")
         response.raise_for_status()
         return response.json()
@@ -3245,7 +4843,7 @@ def spotify_get_user_followings(access_token, user_uri_id):
                 params = {"type": "artist", "limit": 50}
                 if after:
                     params["after"] = after
-                response = SESSION.get("https://api.spotify.com/v1/me/following", headers=headers, params=params, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+                response = http_request("GET", "https://api.spotify.com/v1/me/following", headers=headers, params=params, verify=VERIFY_SSL)
                 debug_print(f"HTTP GET https://api.spotify.com/v1/me/following [followings] -> {response.status_code}")
                 response.raise_for_status()
                 data = response.json().get("artists", {})
@@ -3273,7 +4871,7 @@ def spotify_get_user_followings(access_token, user_uri_id):
 
     try:
         debug_print(f"HTTP GET {url} [followings] headers={sanitize_debug_headers(headers)}")
-        response = SESSION.get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        response = http_request("GET", url, headers=headers, verify=VERIFY_SSL)
         debug_print(f"HTTP GET {url} [followings] -> {response.status_code}")
         response.raise_for_status()
         json_response = response.json()
@@ -3310,7 +4908,7 @@ def spotify_get_user_followers(access_token, user_uri_id):
 
     try:
         debug_print(f"HTTP GET {url} [followers] headers={sanitize_debug_headers(headers)}")
-        response = SESSION.get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        response = http_request("GET", url, headers=headers, verify=VERIFY_SSL)
         debug_print(f"HTTP GET {url} [followers] -> {response.status_code}")
         response.raise_for_status()
         json_response = response.json()
@@ -3329,11 +4927,16 @@ def spotify_get_user_followers(access_token, user_uri_id):
 
 
 # Lists tracks for playlist with specified URI (-l flag)
-def spotify_list_tracks_for_playlist(sp_accessToken, playlist_url, csv_file_name, format_type=2):
+# If track_writer is passed, tracks are written to it (and it is left open) instead of csv_file_name
+def spotify_list_tracks_for_playlist(sp_accessToken, playlist_url, csv_file_name, format_type=2, track_writer=None):
     added_at_dt: datetime | None = None
+    close_track_writer = False
 
     try:
-        if csv_file_name:
+        if track_writer is None:
+            track_writer = get_track_export_writer(csv_file_name)
+            close_track_writer = track_writer is not None
+        if csv_file_name and track_writer is None:
             init_csv_file(csv_file_name, format_type)
     except Exception as e:
         print(f"* Error: {e}")
@@ -3373,6 +4976,7 @@ def spotify_list_tracks_for_playlist(sp_accessToken, playlist_url, csv_file_name
     added_at_ts_highest = 0
     duration_sum = 0
     tracks_list = []
+    local_tz = get_local_timezone()
 
     if p_tracks_list is not None:
         for index, track in enumerate(p_tracks_list or []):
@@ -3385,7 +4989,8 @@ def spotify_list_tracks_for_playlist(sp_accessToken, playlist_url, csv_file_name
             duration = int(str(duration_ms)[0:-3])
             duration_sum += duration
 
-            added_at_dt = convert_iso_str_to_datetime(track.get("added_at"))
+            added_at_ts = convert_iso_str_to_ts(track.get("added_at"))
+            added_at_dt = datetime.fromtimestamp(added_at_ts, local_tz) if added_at_ts is not None else None
 
             added_by = track.get("added_by", {}) or {}
             added_by_id = (added_by.get("id") or "").strip()
@@ -3420,14 +5025,10 @@ def spotify_list_tracks_for_playlist(sp_accessToken, playlist_url, csv_file_name
             user_track_counts[added_by_id] += 1
 
             if added_at_dt:
-                added_at_dt_ts = int(added_at_dt.timestamp())
-                if index == 0:
-                    added_at_ts_lowest = added_at_dt_ts
-                    added_at_ts_highest = added_at_dt_ts
-                if added_at_dt_ts < added_at_ts_lowest:
-                    added_at_ts_lowest = added_at_dt_ts
-                if added_at_dt_ts > added_at_ts_highest:
-                    added_at_ts_highest = added_at_dt_ts
+                if not added_at_ts_lowest or added_at_ts < added_at_ts_lowest:
+                    added_at_ts_lowest = added_at_ts
+                if added_at_ts > added_at_ts_highest:
+                    added_at_ts_highest = added_at_ts
                 added_at_dt_str = get_short_date_from_ts(added_at_dt, show_weekday=False, show_seconds=True, always_show_year=True)
                 added_at_dt_week_day = calendar.day_abbr[added_at_dt.weekday()]
                 if not CLEAN_OUTPUT and not EXPORT_ALL:
@@ -3440,11 +5041,19 @@ def spotify_list_tracks_for_playlist(sp_accessToken, playlist_url, csv_file_name
                     print(line_new)
 
                 try:
-                    if csv_file_name:
+                    if track_writer is not None:
+                        track_writer.write({"uri": track_info.get("uri"), "artist": p_artist, "track": p_track, "duration": duration, "added_at": added_at_dt, "added_by": added_by_name})
+                    elif csv_file_name:
                         write_csv_entry(csv_file_name, convert_to_local_naive(added_at_dt), *(("Added Track", p_name, added_by_name, artist_track) if format_type == 1 else ("", p_name, p_artist, p_track)), format_type)
                 except Exception as e:
                     print(f"* Error: {e}")
 
+    if close_track_writer:
+        try:
+            track_writer.close()
+        except Exception as e:
+            print(f"* Error: {e}")
+
     if not CLEAN_OUTPUT and not EXPORT_ALL:
         print(f"\nName:\t\t\t'{p_name}'")
         if p_descr:
@@ -3517,7 +5126,7 @@ def spotify_get_user_liked_tracks(access_token):
 
         while next_url:
             debug_print(f"HTTP GET {next_url} [liked tracks] headers={sanitize_debug_headers(headers)}")
-            response = SESSION.get(next_url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+            response = http_request("GET", next_url, headers=headers, verify=VERIFY_SSL)
             debug_print(f"HTTP GET {next_url} [liked tracks] -> {response.status_code}")
             response.raise_for_status()
             json_response = response.json()
@@ -3553,9 +5162,11 @@ def spotify_get_user_liked_tracks(access_token):
 def spotify_list_liked_tracks(sp_accessToken, csv_file_name, format_type=2):
     added_at_dt: datetime | None = None
     username = ""
+    track_writer = None
 
     try:
-        if csv_file_name:
+        track_writer = get_track_export_writer(csv_file_name)
+        if csv_file_name and track_writer is None:
             init_csv_file(csv_file_name, format_type)
     except Exception as e:
         print(f"* Error: {e}")
@@ -3573,6 +5184,7 @@ def spotify_list_liked_tracks(sp_accessToken, csv_file_name, format_type=2):
     added_at_ts_highest = 0
     duration_sum = 0
     tracks_list = []
+    local_tz = get_local_timezone()
 
     if p_tracks_list is not None:
         for index, track in enumerate(reversed(p_tracks_list or [])):
@@ -3585,17 +5197,14 @@ def spotify_list_liked_tracks(sp_accessToken, csv_file_name, format_type=2):
             artist_track = f"{p_artist} - {p_track}"
             duration = int(str(duration_ms)[0:-3])
             duration_sum = duration_sum + duration
-            added_at_dt = convert_iso_str_to_datetime(track.get("added_at"))
+            added_at_ts = convert_iso_str_to_ts(track.get("added_at"))
+            added_at_dt = datetime.fromtimestamp(added_at_ts, local_tz) if added_at_ts is not None else None
 
             if added_at_dt:
-                added_at_dt_ts = int(added_at_dt.timestamp())
-                if index == 0:
-                    added_at_ts_lowest = added_at_dt_ts
-                    added_at_ts_highest = added_at_dt_ts
-                if added_at_dt_ts < added_at_ts_lowest:
-                    added_at_ts_lowest = added_at_dt_ts
-                if added_at_dt_ts > added_at_ts_highest:
-                    added_at_ts_highest = added_at_dt_ts
+                if not added_at_ts_lowest or added_at_ts < added_at_ts_lowest:
+                    added_at_ts_lowest = added_at_ts
+                if added_at_ts > added_at_ts_highest:
+                    added_at_ts_highest = added_at_ts
                 added_at_dt_str = get_short_date_from_ts(added_at_dt, show_weekday=False, show_seconds=True, always_show_year=True)
                 added_at_dt_week_day = calendar.day_abbr[added_at_dt.weekday()]
                 if not CLEAN_OUTPUT:
@@ -3606,11 +5215,19 @@ def spotify_list_liked_tracks(sp_accessToken, csv_file_name, format_type=2):
                     tracks_list.append(line_new)
                 print(line_new)
                 try:
-                    if csv_file_name and not CLEAN_OUTPUT:
+                    if track_writer is not None:
+                        track_writer.write({"uri": track_info.get("uri"), "artist": p_artist, "track": p_track, "duration": duration, "added_at": added_at_dt, "added_by": username})
+                    elif csv_file_name and not CLEAN_OUTPUT:
                         write_csv_entry(csv_file_name, convert_to_local_naive(added_at_dt), *(("Added Track", "Liked Songs", username, artist_track) if format_type == 1 else ("", "Liked Songs", p_artist, p_track)), format_type)
                 except Exception as e:
                     print(f"* Error: {e}")
 
+    if track_writer is not None:
+        try:
+            track_writer.close()
+        except Exception as e:
+            print(f"* Error: {e}")
+
     if not CLEAN_OUTPUT:
         songs_display = f"{p_tracks} ({p_tracks_before_filtering - p_tracks} filtered out)" if p_tracks_before_filtering > p_tracks else f"{p_tracks}"
 
@@ -3647,9 +5264,17 @@ def compare_two_lists_of_dicts(list1: list, list2: list):
     return diff
 
 
-# Searches for Spotify users (-s flag)
-def spotify_search_users(access_token, username):
-    url = f"https://api-partner.spotify.com/pathfinder/v1/query?operationName=searchUsers&variables=%7B%22searchTerm%22%3A%22{username}%22%2C%22offset%22%3A0%2C%22limit%22%3A5%2C%22numberOfTopResults%22%3A5%2C%22includeAudiobooks%22%3Afalse%7D&extensions=%7B%22persistedQuery%22%3A%7B%22version%22%3A1%2C%22sha256Hash%22%3A%22{SP_SHA256}%22%7D%7D"
+# Returns Spotify users matching the name as a dict with total count and list of users (name, uri, id)
+# Results come from the search cache if still valid, otherwise requests are spaced out by the search rate limiter
+def spotify_search_users_query(access_token, username, limit=5, offset=0):
+    cache_key = SearchCache.key(username, limit, offset)
+    if SEARCH_CACHE is not None:
+        cached = SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+    variables = quote(json.dumps({"searchTerm": username, "offset": offset, "limit": limit, "numberOfTopResults": limit, "includeAudiobooks": False}, separators=(",", ":")))
+    url = f"https://api-partner.spotify.com/pathfinder/v1/query?operationName=searchUsers&variables={variables}&extensions=%7B%22persistedQuery%22%3A%7B%22version%22%3A1%2C%22sha256Hash%22%3A%22{SP_SHA256}%22%7D%7D"
 
     headers = {
         "Authorization": f"Bearer {access_token}",
@@ -3661,28 +5286,83 @@ def spotify_search_users(access_token, username):
             "Client-Id": SP_CACHED_CLIENT_ID
         })
 
-    print(f"* Searching for users with '{username}' string ...\n")
+    if SEARCH_RATE_LIMITER is not None:
+        SEARCH_RATE_LIMITER.wait()
 
     try:
         debug_print(f"HTTP GET {url} [search users] headers={sanitize_debug_headers(headers)}")
-        response = SESSION.get(url, headers=headers, timeout=FUNCTION_TIMEOUT, verify=VERIFY_SSL)
+        response = http_request("GET", url, headers=headers, verify=VERIFY_SSL)
         debug_print(f"HTTP GET {url} [search users] -> {response.status_code}")
         response.raise_for_status()
     except Exception:
         raise
 
     json_response = response.json()
-    if json_response["data"]["searchV2"]["users"].get("totalCount") > 0:
-        for user in json_response["data"]["searchV2"]["users"]["items"]:
-            print(f"Username:\t\t{user['data']['displayName']}")
-            print(f"User URI:\t\t{user['data']['uri']}")
-            print(f"User URI ID:\t\t{user['data']['id']}")
-            print(f"User URL:\t\t{spotify_convert_uri_to_url(user['data']['uri'])}")
+    users = json_response["data"]["searchV2"]["users"]
+    result = {"total": users.get("totalCount") or 0, "users": [{"name": user["data"]["displayName"], "uri": user["data"]["uri"], "id": user["data"]["id"]} for user in users.get("items") or []]}
+
+    if SEARCH_CACHE is not None:
+        SEARCH_CACHE.put(cache_key, result)
+
+    return result
+
+
+# Prints users returned by spotify_search_users_query()
+def spotify_print_search_results(result):
+    if result["users"]:
+        for user in result["users"]:
+            print(f"Username:\t\t{user['name']}")
+            print(f"User URI:\t\t{user['uri']}")
+            print(f"User URI ID:\t\t{user['id']}")
+            print(f"User URL:\t\t{spotify_convert_uri_to_url(user['uri'])}")
             print("─" * HORIZONTAL_LINE)
     else:
         print("No results")
 
 
+# Searches for Spotify users (-s flag)
+def spotify_search_users(access_token, username):
+    print(f"* Searching for users with '{username}' string ...\n")
+
+    result = spotify_search_users_query(access_token, username, SEARCH_LIMIT, SEARCH_OFFSET)
+    spotify_print_search_results(result)
+
+
+# Searches for Spotify users with names listed in the file concurrently through SEARCH_WORKERS threads (--search-file)
+def spotify_search_users_batch(access_token, usernames):
+    total = len(usernames)
+    workers = max(1, min(SEARCH_WORKERS, total))
+    print(f"* Searching for users with {total} strings ({workers} workers) ...\n")
+
+    results = {}
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search") as executor:
+        futures = {executor.submit(spotify_search_users_query, access_token, username, SEARCH_LIMIT, SEARCH_OFFSET): username for username in usernames}
+        for future in as_completed(futures):
+            username = futures[future]
+            done += 1
+            try:
+                results[username] = future.result()
+            except Exception as e:
+                results[username] = e
+            _display_progress(done, total, username, is_final=(done == total), prefix="Searched")
+
+    if not (isinstance(sys.stdout, Logger) and sys.stdout.headless):
+        terminal_out = stdout_bck if stdout_bck is not None else sys.stdout
+        terminal_out.write("\n")
+        terminal_out.flush()
+    if stdout_bck is not None and isinstance(sys.stdout, Logger):
+        sys.stdout.write_log("\n")
+
+    for username in usernames:
+        result = results[username]
+        if isinstance(result, Exception):
+            print(f"\n* Error: Search for '{username}' failed: {result}")
+            continue
+        print(f"\n* Users matching '{username}' ({len(result['users'])} of {result['total']}):\n")
+        spotify_print_search_results(result)
+
+
 # Returns playlist name and URL if available, otherwise just URL
 def spotify_format_playlist_reference(uri):
     uri = uri or ''
@@ -3696,7 +5376,7 @@ def spotify_format_playlist_reference(uri):
 
 
 # Displays a progress bar with percentage and current playlist name
-def _display_progress(current, total, playlist_name: str = "", bar_length: int = 40, is_final: bool = False) -> None:
+def _display_progress(current, total, playlist_name: str = "", bar_length: int = 40, is_final: bool = False, prefix: str = "Playlists") -> None:
     if total == 0:
         return
 
@@ -3713,7 +5393,6 @@ def _display_progress(current, total, playlist_name: str = "", bar_length: int =
     counter_str = f"({current}/{total})"
 
     display_name = playlist_name or ""
-    prefix = "Playlists"
 
     def compute_base_length(include_prefix: bool) -> int:
         base = ""
@@ -3787,24 +5466,39 @@ def _display_progress(current, total, playlist_name: str = "", bar_length: int =
 
     terminal_out = stdout_bck if stdout_bck is not None else sys.stdout
 
-    if is_final:
+    if not (isinstance(sys.stdout, Logger) and sys.stdout.headless):
         terminal_out.write("\r\033[K" + progress_str)
         terminal_out.flush()
 
-        if stdout_bck is not None and isinstance(sys.stdout, Logger):
-            sys.stdout.logfile.write(progress_str)
-            sys.stdout.logfile.flush()
-    else:
-        terminal_out.write("\r\033[K" + progress_str)
-        terminal_out.flush()
+    if is_final and stdout_bck is not None and isinstance(sys.stdout, Logger):
+        sys.stdout.write_log(progress_str)
+
+
+# Returns the set of playlist attributes whose change marks the playlist as active for adaptive polling
+def get_playlist_activity_signature(playlist):
+    if not playlist:
+        return None
+    return (playlist.get("name"), playlist.get("desc"), playlist.get("likes"), playlist.get("tracks_count"), playlist.get("update_date"), playlist.get("collaborators_count"), bool(playlist.get("restricted", False)))
+
+
+# Checks whether tracks of the playlist should not be fetched, because it (or its owner) is on the list of playlists to skip
+# or it is owned by Spotify while IGNORE_SPOTIFY_PLAYLISTS is enabled
+# Accepts both playlists from the user's profile (owner_name) and the ones processed by spotify_process_public_playlists() (owner)
+def is_playlist_skipped(playlist, playlists_to_skip):
+    p_uri_id = spotify_extract_id_or_name(playlist.get("uri", ""))
+    p_owner_name = spotify_extract_id_or_name(playlist.get("owner_name", playlist.get("owner", "")))
+    p_owner_id = spotify_extract_id_or_name(playlist.get("owner_uri", ""))
+    if playlists_to_skip and (p_uri_id in playlists_to_skip or p_owner_id in playlists_to_skip or p_owner_name in playlists_to_skip):
+        return True
+    return bool(IGNORE_SPOTIFY_PLAYLISTS and p_owner_id == "spotify")
 
 
 # Processes items from all the provided playlists and returns a list of dictionaries
-def spotify_process_public_playlists(sp_accessToken, playlists, get_tracks, playlists_to_skip=None, show_progress=True):
-    global PLAYLIST_INFO_CACHE
+def spotify_process_public_playlists(sp_accessToken, playlists, get_tracks, playlists_to_skip=None, show_progress=True, workers=1):
     list_of_playlists = []
     error_while_processing = False
     added_at_dt: datetime | None = None
+    local_tz = get_local_timezone()
 
     if playlists_to_skip is None:
         playlists_to_skip = []
@@ -3817,6 +5511,19 @@ def spotify_process_public_playlists(sp_accessToken, playlists, get_tracks, play
         if show_progress:
             print()
 
+        # With more workers all playlists are fetched up front in parallel, the loop below consumes results in order
+        prefetched = {}
+        prefetch_executor = None
+        if workers > 1:
+            prefetch_deadline = getattr(HTTP_DEADLINE, "deadline", None)
+            prefetch_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+            for playlist in playlists:
+                p_uri = playlist.get("uri", "")
+                p_uri_id = spotify_extract_id_or_name(p_uri) if p_uri else ""
+                if not p_uri_id or p_uri in prefetched or PLAYLIST_INFO_CACHE.get(p_uri, {}).get("status") == "restricted":
+                    continue
+                prefetched[p_uri] = prefetch_executor.submit(run_with_deadline, prefetch_deadline, spotify_get_playlist_info_for_cycle, sp_accessToken, p_uri, get_tracks and not is_playlist_skipped(playlist, playlists_to_skip))
+
         # Track current playlist name to keep it visible
         current_playlist_name = ""
 
@@ -3826,6 +5533,7 @@ def spotify_process_public_playlists(sp_accessToken, playlists, get_tracks, play
             p_uri = ""
             if "uri" in playlist:
                 list_of_tracks = []
+                incomplete_tracks = 0
                 try:
                     p_owner = playlist.get("owner_name", "")
                     p_owner_uri = playlist.get("owner_uri", "")
@@ -3852,7 +5560,7 @@ def spotify_process_public_playlists(sp_accessToken, playlists, get_tracks, play
                     p_owner_id = spotify_extract_id_or_name(p_owner_uri)
 
                     # We do not get a list of tracks for playlists that are ignored
-                    if (playlists_to_skip and (p_uri_id in playlists_to_skip or p_owner_id in playlists_to_skip or p_owner_name in playlists_to_skip)) or (IGNORE_SPOTIFY_PLAYLISTS and p_owner_id == "spotify"):
+                    if is_playlist_skipped(playlist, playlists_to_skip):
                         effective_get_tracks = False
                     else:
                         effective_get_tracks = get_tracks
@@ -3904,7 +5612,10 @@ def spotify_process_public_playlists(sp_accessToken, playlists, get_tracks, play
                         })
                     else:
                         try:
-                            sp_playlist_data = spotify_get_playlist_info(sp_accessToken, p_uri, effective_get_tracks)
+                            if p_uri in prefetched:
+                                sp_playlist_data = prefetched.pop(p_uri).result()
+                            else:
+                                sp_playlist_data = spotify_get_playlist_info_for_cycle(sp_accessToken, p_uri, effective_get_tracks)
                             PLAYLIST_INFO_CACHE[p_uri] = {
                                 "status": "ok",
                                 "timestamp": time.time(),
@@ -4005,21 +5716,20 @@ def spotify_process_public_playlists(sp_accessToken, playlists, get_tracks, play
                                 if not added_by_name:
                                     added_by_name = added_by_id
 
-                            if added_at:
-                                added_at_dt = convert_iso_str_to_datetime(added_at)
-                                if added_at_dt:
-                                    added_at_dt_ts = int(added_at_dt.timestamp())
-
-                                    if index == 0:
-                                        added_at_ts_lowest = added_at_dt_ts
-                                        added_at_ts_highest = added_at_dt_ts
-                                    if added_at_dt_ts < added_at_ts_lowest:
-                                        added_at_ts_lowest = added_at_dt_ts
-                                    if added_at_dt_ts > added_at_ts_highest:
-                                        added_at_ts_highest = added_at_dt_ts
+                            # Min / max are tracked on epoch ints, datetimes are only built for the tracks we keep
+                            added_at_ts = convert_iso_str_to_ts(added_at) if added_at else None
+                            if added_at_ts is not None:
+                                if not added_at_ts_lowest or added_at_ts < added_at_ts_lowest:
+                                    added_at_ts_lowest = added_at_ts
+                                if added_at_ts > added_at_ts_highest:
+                                    added_at_ts_highest = added_at_ts
 
                             if effective_get_tracks and added_at and p_artist and p_track:
+                                added_at_dt = datetime.fromtimestamp(added_at_ts, local_tz) if added_at_ts is not None else None
                                 list_of_tracks.append({"artist": p_artist, "track": p_track, "duration": track_duration, "added_at": added_at_dt, "uri": track_uri, "added_by": added_by_name, "added_by_id": added_by_id})
+                            elif effective_get_tracks and added_at_ts is not None:
+                                # Such tracks are still exported by spotify_list_tracks_for_playlist()
+                                incomplete_tracks += 1
 
                 except Exception as e:
                     debug_print(f"playlist loop: unexpected build error for uri={p_uri}: {e}")
@@ -4030,11 +5740,14 @@ def spotify_process_public_playlists(sp_accessToken, playlists, get_tracks, play
                         _display_progress(idx, total_playlists, current_playlist_name, is_final=(idx == total_playlists))
                     continue
 
-                p_creation_date = datetime.fromtimestamp(int(added_at_ts_lowest), pytz.timezone(LOCAL_TIMEZONE)) if added_at_ts_lowest > 0 else None
-                p_last_track_date = datetime.fromtimestamp(int(added_at_ts_highest), pytz.timezone(LOCAL_TIMEZONE)) if added_at_ts_highest > 0 else None
+                p_creation_date = datetime.fromtimestamp(int(added_at_ts_lowest), get_local_timezone()) if added_at_ts_lowest > 0 else None
+                p_last_track_date = datetime.fromtimestamp(int(added_at_ts_highest), get_local_timezone()) if added_at_ts_highest > 0 else None
 
                 p_collaborators_count = len(user_id_name_mapping)
 
+                # Whether list_of_tracks holds every track spotify_list_tracks_for_playlist() would export, so exports can reuse it
+                tracks_complete = bool(effective_get_tracks and p_tracks_list is not None and not restricted_playlist and not incomplete_tracks)
+
                 # Update cache with comprehensive playlist data
                 if p_uri in PLAYLIST_INFO_CACHE:
                     PLAYLIST_INFO_CACHE[p_uri].update({
@@ -4048,9 +5761,9 @@ def spotify_process_public_playlists(sp_accessToken, playlists, get_tracks, play
                     })
 
                 if list_of_tracks and effective_get_tracks:
-                    list_of_playlists.append({"uri": p_uri, "name": p_name, "desc": p_descr, "likes": p_likes, "tracks_count": p_tracks, "tracks_count_before_filtering": p_tracks_before_filtering, "url": p_url, "date": p_creation_date, "update_date": p_last_track_date, "list_of_tracks": list_of_tracks, "collaborators_count": p_collaborators_count, "collaborators": user_id_name_mapping, "owner": p_owner, "owner_uri": p_owner_uri, "unknown_added_by_tracks": unknown_added_by_tracks, "restricted": restricted_playlist})
+                    list_of_playlists.append({"uri": p_uri, "name": p_name, "desc": p_descr, "likes": p_likes, "tracks_count": p_tracks, "tracks_count_before_filtering": p_tracks_before_filtering, "url": p_url, "date": p_creation_date, "update_date": p_last_track_date, "list_of_tracks": list_of_tracks, "collaborators_count": p_collaborators_count, "collaborators": user_id_name_mapping, "owner": p_owner, "owner_uri": p_owner_uri, "unknown_added_by_tracks": unknown_added_by_tracks, "restricted": restricted_playlist, "tracks_complete": tracks_complete})
                 else:
-                    list_of_playlists.append({"uri": p_uri, "name": p_name, "desc": p_descr, "likes": p_likes, "tracks_count": p_tracks, "tracks_count_before_filtering": p_tracks_before_filtering, "url": p_url, "date": p_creation_date, "update_date": p_last_track_date, "collaborators_count": p_collaborators_count, "collaborators": {}, "owner": p_owner, "owner_uri": p_owner_uri, "unknown_added_by_tracks": unknown_added_by_tracks, "restricted": restricted_playlist})
+                    list_of_playlists.append({"uri": p_uri, "name": p_name, "desc": p_descr, "likes": p_likes, "tracks_count": p_tracks, "tracks_count_before_filtering": p_tracks_before_filtering, "url": p_url, "date": p_creation_date, "update_date": p_last_track_date, "collaborators_count": p_collaborators_count, "collaborators": {}, "owner": p_owner, "owner_uri": p_owner_uri, "unknown_added_by_tracks": unknown_added_by_tracks, "restricted": restricted_playlist, "tracks_complete": tracks_complete})
 
                 # Final refresh after successful processing
                 if show_progress:
@@ -4058,21 +5771,111 @@ def spotify_process_public_playlists(sp_accessToken, playlists, get_tracks, play
                     # If this is the last playlist, immediately add a newline after the progress bar
                     if idx == total_playlists:
                         # Write newline to terminal
-                        terminal_out = stdout_bck if stdout_bck is not None else sys.stdout
-                        terminal_out.write("\n")
-                        terminal_out.flush()
+                        if not (isinstance(sys.stdout, Logger) and sys.stdout.headless):
+                            terminal_out = stdout_bck if stdout_bck is not None else sys.stdout
+                            terminal_out.write("\n")
+                            terminal_out.flush()
                         # Also write to log file if logging is enabled
                         if stdout_bck is not None and isinstance(sys.stdout, Logger):
-                            sys.stdout.logfile.write("\n")
-                            sys.stdout.logfile.flush()
+                            sys.stdout.write_log("\n")
+
+        if prefetch_executor is not None:
+            prefetch_executor.shutdown(wait=False, cancel_futures=True)
 
     return list_of_playlists, error_while_processing
 
 
+# Exports already fetched tracks of the playlist to CSV file, same way as spotify_list_tracks_for_playlist() does
+# The file is opened once and written through a buffered writer, errors are raised to the caller
+# If track_writer is passed (ndjson / parquet export), tracks are written to it instead
+def spotify_export_playlist_tracks(p_name, list_of_tracks, csv_file_name, format_type=2, track_writer=None):
+    import csv
+
+    tracks = [track for track in list_of_tracks if track.get("added_at")]
+
+    if track_writer is not None:
+        for track in tracks:
+            track_writer.write(track)
+        return
+
+    if CLEAN_OUTPUT:
+        with open(csv_file_name, "w") as file:
+            file.writelines([f"{track['artist']} - {track['track']}\n" for track in tracks])
+        return
+
+    csv_fields = csvfieldnames if format_type == 1 else csvfieldnames_export
+    write_header = not os.path.isfile(csv_file_name) or os.path.getsize(csv_file_name) == 0
+
+    with open(csv_file_name, 'a', newline='', buffering=1024 * 1024, encoding="utf-8") as csv_file:
+        csvwriter = csv.DictWriter(csv_file, fieldnames=csv_fields, quoting=csv.QUOTE_NONNUMERIC)
+        if write_header:
+            csvwriter.writeheader()
+        for track in tracks:
+            timestamp = convert_to_local_naive(track["added_at"])
+            if format_type == 1:
+                csvwriter.writerow({'Date': timestamp, 'Type': "Added Track", 'Name': p_name, 'Old': track.get("added_by", ""), 'New': f"{track['artist']} - {track['track']}"})
+            else:
+                csvwriter.writerow({'Date': timestamp, 'Playlist Name': p_name, 'Artist': track["artist"], 'Track': track["track"]})
+
+
+# Exports playlists to CSV (or EXPORT_FORMAT) files in parallel through a bounded pool of EXPORT_WORKERS threads (--export-all-playlists)
+# Each job is a dict with playlist name, url, target file and already fetched tracks (if any)
+def spotify_export_playlists(sp_accessToken, export_jobs):
+    if not export_jobs:
+        return
+
+    # Playlists sharing the same (sanitized) name end up in one file, so they are exported by the same worker
+    jobs_by_file = {}
+    for job in export_jobs:
+        jobs_by_file.setdefault(job["file"], []).append(job)
+
+    def export_file(jobs):
+        # ndjson / parquet files are written from scratch, so one writer is shared by all jobs of the file
+        track_writer = get_track_export_writer(jobs[0]["file"])
+        try:
+            for job in jobs:
+                if job["tracks"] is not None:
+                    spotify_export_playlist_tracks(job["name"], job["tracks"], job["file"], CSV_FILE_FORMAT_EXPORT, track_writer)
+                else:
+                    spotify_list_tracks_for_playlist(sp_accessToken, job["url"], job["file"], CSV_FILE_FORMAT_EXPORT, track_writer)
+        finally:
+            if track_writer is not None:
+                track_writer.close()
+
+    total = len(jobs_by_file)
+    workers = max(1, min(EXPORT_WORKERS, total))
+    print(f"* Exporting {len(export_jobs)} playlists to {total} {EXPORT_FORMAT.upper()} files ({workers} workers) ...\n")
+
+    failed = []
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as executor:
+        futures = {executor.submit(export_file, jobs): file for file, jobs in jobs_by_file.items()}
+        for future in as_completed(futures):
+            file = futures[future]
+            done += 1
+            try:
+                future.result()
+            except Exception as e:
+                failed.append((file, e))
+            _display_progress(done, total, file, is_final=(done == total), prefix="Exported")
+
+    if not (isinstance(sys.stdout, Logger) and sys.stdout.headless):
+        terminal_out = stdout_bck if stdout_bck is not None else sys.stdout
+        terminal_out.write("\n")
+        terminal_out.flush()
+    if stdout_bck is not None and isinstance(sys.stdout, Logger):
+        sys.stdout.write_log("\n")
+
+    print(f"\n* Exported {total - len(failed)} of {total} {EXPORT_FORMAT.upper()} files" + (f", {len(failed)} failed:" if failed else ""))
+    for file, e in failed:
+        print(f"- '{file}': {e}")
+    print()
+
+
 # Prints detailed info about user's playlists
 def spotify_print_public_playlists(sp_accessToken, list_of_playlists, playlists_to_skip=None):
-    p_update = datetime.min.replace(tzinfo=pytz.timezone(LOCAL_TIMEZONE))
-    p_update_recent = datetime.min.replace(tzinfo=pytz.timezone(LOCAL_TIMEZONE))
+    p_update = datetime.min.replace(tzinfo=get_local_timezone())
+    p_update_recent = datetime.min.replace(tzinfo=get_local_timezone())
     p_name = ""
     p_name_recent = ""
     p_url = ""
@@ -4081,11 +5884,12 @@ def spotify_print_public_playlists(sp_accessToken, list_of_playlists, playlists_
     if playlists_to_skip is None:
         playlists_to_skip = []
 
+    export_jobs = []
+
     if list_of_playlists:
         print()
         for playlist in list_of_playlists:
             if "uri" in playlist:
-                p_uri = playlist.get("uri", "")
                 p_name = playlist.get("name", "")
                 p_descr = html.unescape(playlist.get("desc", ""))
                 p_likes = playlist.get("likes", 0)
@@ -4096,14 +5900,10 @@ def spotify_print_public_playlists(sp_accessToken, list_of_playlists, playlists_
                 p_collaborators_count = playlist.get("collaborators_count")
                 p_collaborators = playlist.get("collaborators")
                 p_owner = playlist.get("owner", "")
-                p_owner_uri = playlist.get("owner_uri", "")
                 p_restricted = bool(playlist.get("restricted", False))
-                p_uri_id = spotify_extract_id_or_name(p_uri)
-                p_owner_name = spotify_extract_id_or_name(p_owner)
-                p_owner_id = spotify_extract_id_or_name(p_owner_uri)
 
                 skipped_from_processing = ""
-                if (playlists_to_skip and (p_uri_id in playlists_to_skip or p_owner_id in playlists_to_skip or p_owner_name in playlists_to_skip)) or (IGNORE_SPOTIFY_PLAYLISTS and p_owner_id == "spotify"):
+                if is_playlist_skipped(playlist, playlists_to_skip):
                     skipped_from_processing = " [ IGNORED ]"
 
                 restricted_label = " [ RESTRICTED ]" if p_restricted else ""
@@ -4122,10 +5922,11 @@ def spotify_print_public_playlists(sp_accessToken, list_of_playlists, playlists_
                 if EXPORT_ALL and not skipped_from_processing and not p_restricted:
                     from pathvalidate import sanitize_filename
                     safe_filename = sanitize_filename(p_name)
-                    safe_filename_path = os.path.expanduser(safe_filename + '.csv')
-                    print(f"-- Exporting playlist to '{safe_filename_path}'")
-                    spotify_list_tracks_for_playlist(sp_accessToken, p_url, safe_filename_path, CSV_FILE_FORMAT_EXPORT)
-                    print(f"-- Export completed")
+                    safe_filename_path = os.path.expanduser(safe_filename + get_export_file_extension())
+                    print(f"[ export: {safe_filename_path} ]")
+                    # Exported in parallel once all playlists are printed, reusing tracks fetched by spotify_process_public_playlists()
+                    # if they are complete (None means the playlist has to be fetched again)
+                    export_jobs.append({"name": p_name, "url": p_url, "file": safe_filename_path, "tracks": playlist.get("list_of_tracks", []) if playlist.get("tracks_complete") else None})
                 print()
 
             if p_update is not None and p_update > p_update_recent:
@@ -4133,9 +5934,13 @@ def spotify_print_public_playlists(sp_accessToken, list_of_playlists, playlists_
                 p_name_recent = p_name
                 p_url_recent = p_url
 
-        if p_update_recent is not None and p_update_recent > datetime.min.replace(tzinfo=pytz.timezone(LOCAL_TIMEZONE)) and p_name_recent and p_url_recent:
+        if p_update_recent is not None and p_update_recent > datetime.min.replace(tzinfo=get_local_timezone()) and p_name_recent and p_url_recent:
             print(f"Recently updated playlist:\n\n- '{p_name_recent}'\n[ {p_url_recent} ]\n[ update: {get_date_from_ts(p_update_recent)} - {calculate_timespan(now_local(), p_update_recent)} ago ]")
 
+        if export_jobs:
+            print()
+            spotify_export_playlists(sp_accessToken, export_jobs)
+
 
 # Prints detailed info about the user with the specified URI ID (-i flag)
 def spotify_get_user_details(sp_accessToken, user_uri_id):
@@ -4214,7 +6019,7 @@ def spotify_get_user_details(sp_accessToken, user_uri_id):
             print(f"\nPublic playlists:\t{playlists_count}")
 
         if playlists:
-            list_of_playlists, error_while_processing = spotify_process_public_playlists(sp_accessToken, playlists, True)
+            list_of_playlists, error_while_processing = spotify_process_public_playlists(sp_accessToken, playlists, True, workers=EXPORT_WORKERS if EXPORT_ALL else 1)
             spotify_print_public_playlists(sp_accessToken, list_of_playlists)
 
 
@@ -4300,12 +6105,108 @@ def spotify_get_followers_and_followings(sp_accessToken, user_uri_id):
                 print(f"- {f_dict['name']} [ {spotify_convert_uri_to_url(f_dict['uri'])} ]")
 
 
+# Reads user URI IDs (or user URIs / profile URLs) from the file, one per line, empty lines and comments are ignored
+def read_user_ids_file(file_name):
+    user_ids = []
+    with open(file_name, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("https://open.spotify.com/"):
+                line = spotify_convert_url_to_uri(line)
+            user_ids.append(line.split(":")[-1])
+    return list(dict.fromkeys(user_id for user_id in user_ids if user_id))
+
+
+# Returns profile details (followers, followings, playlists) for user with specified URI as dict used in batch report
+def spotify_collect_user_details(sp_accessToken, user_uri_id):
+    sp_user_data = spotify_get_user_info(sp_accessToken, user_uri_id, DETECT_CHANGES_IN_PLAYLISTS, RECENTLY_PLAYED_ARTISTS_LIMIT_INFO)
+    followers = spotify_get_user_followers(sp_accessToken, user_uri_id)["sp_user_followers"] or []
+    followings = spotify_get_user_followings(sp_accessToken, user_uri_id)["sp_user_followings"] or []
+
+    playlists = []
+    if DETECT_CHANGES_IN_PLAYLISTS and sp_user_data["sp_user_public_playlists_uris"]:
+        list_of_playlists, _ = spotify_process_public_playlists(sp_accessToken, sp_user_data["sp_user_public_playlists_uris"], True, show_progress=False)
+        for playlist in list_of_playlists:
+            playlists.append({"name": playlist["name"], "url": playlist["url"], "owner": playlist["owner"], "tracks_count": playlist["tracks_count"], "likes": playlist["likes"], "collaborators_count": playlist["collaborators_count"], "date": playlist["date"], "update_date": playlist["update_date"], "restricted": playlist["restricted"]})
+
+    return {
+        "user_uri_id": user_uri_id,
+        "username": sp_user_data["sp_username"],
+        "url": spotify_convert_uri_to_url(f"spotify:user:{user_uri_id}"),
+        "profile_pic": sp_user_data["sp_user_image_url"] != "",
+        "followers_count": len(followers) or sp_user_data["sp_user_followers_count"],
+        "followings_count": len(followings) or sp_user_data["sp_user_followings_count"],
+        "playlists_count": sp_user_data["sp_user_public_playlists_count"] if DETECT_CHANGES_IN_PLAYLISTS else None,
+        "followers": [{"name": f.get("name"), "uri": f.get("uri")} for f in followers],
+        "followings": [{"name": f.get("name"), "uri": f.get("uri")} for f in followings],
+        "playlists": playlists,
+        "ok": True,
+        "error": "",
+    }
+
+
+# Writes consolidated batch report to JSON file or, for .csv extension, to CSV file with one row per user
+def write_batch_report(report, report_file):
+    import csv
+
+    if report_file.lower().endswith(".csv"):
+        csv_fields = ['User URI ID', 'Username', 'URL', 'Profile Pic', 'Followers', 'Followings', 'Playlists', 'Playlists Tracks', 'Playlists Likes', 'Error']
+        with open(report_file, 'w', newline='', encoding="utf-8") as csv_file:
+            csvwriter = csv.DictWriter(csv_file, fieldnames=csv_fields, quoting=csv.QUOTE_NONNUMERIC)
+            csvwriter.writeheader()
+            for user in report:
+                playlists = user.get("playlists") or []
+                csvwriter.writerow({'User URI ID': user["user_uri_id"], 'Username': user.get("username", ""), 'URL': user.get("url", ""), 'Profile Pic': user.get("profile_pic", ""), 'Followers': user.get("followers_count", ""), 'Followings': user.get("followings_count", ""), 'Playlists': user.get("playlists_count", ""), 'Playlists Tracks': sum(p["tracks_count"] or 0 for p in playlists), 'Playlists Likes': sum(p["likes"] or 0 for p in playlists), 'Error': user.get("error", "")})
+    else:
+        with open(report_file, 'w', encoding="utf-8") as json_file:
+            json.dump({"generated": now_local().isoformat(timespec="seconds"), "token_source": TOKEN_SOURCE, "users": report}, json_file, indent=2, ensure_ascii=False, default=EventStream.serialize)
+
+
+# Inspects profiles of many users concurrently (--batch-users-file) and writes one consolidated report
+# Users are fetched by a bounded pool of BATCH_WORKERS threads sharing the same HTTP session and access token
+def spotify_batch_user_details(sp_accessToken, user_uri_ids, report_file):
+    total = len(user_uri_ids)
+    workers = max(1, min(BATCH_WORKERS, total))
+    print(f"* Getting detailed info for {total} users ({workers} workers) ...\n")
+
+    results = {}
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as executor:
+        futures = {executor.submit(spotify_collect_user_details, sp_accessToken, user_uri_id): user_uri_id for user_uri_id in user_uri_ids}
+        for future in as_completed(futures):
+            user_uri_id = futures[future]
+            done += 1
+            try:
+                results[user_uri_id] = future.result()
+            except Exception as e:
+                results[user_uri_id] = {"user_uri_id": user_uri_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+            _display_progress(done, total, user_uri_id, is_final=(done == total), prefix="Users")
+
+    if not (isinstance(sys.stdout, Logger) and sys.stdout.headless):
+        terminal_out = stdout_bck if stdout_bck is not None else sys.stdout
+        terminal_out.write("\n")
+        terminal_out.flush()
+    if stdout_bck is not None and isinstance(sys.stdout, Logger):
+        sys.stdout.write_log("\n")
+
+    report = [results[user_uri_id] for user_uri_id in user_uri_ids]
+    write_batch_report(report, report_file)
+
+    failed = [user for user in report if not user["ok"]]
+    print(f"\n* Inspected {total - len(failed)} of {total} users" + (f", {len(failed)} failed:" if failed else ""))
+    for user in failed:
+        print(f"- '{user['user_uri_id']}': {user['error']}")
+    print(f"* Report saved to '{report_file}'")
+
+
 # Helper function to get playlist details (songs count, duration, creation date, update date)
 def get_playlist_details_for_notification(sp_accessToken, playlist_uri):
     try:
         # Check cache first
-        if playlist_uri in PLAYLIST_INFO_CACHE:
-            cache_entry = PLAYLIST_INFO_CACHE[playlist_uri]
+        cache_entry = PLAYLIST_INFO_CACHE.get(playlist_uri)
+        if cache_entry is not None:
             if cache_entry.get("status") == "ok":
                 tracks_count = cache_entry.get("tracks_count", 0)
                 duration_seconds = cache_entry.get("duration_seconds", 0)
@@ -4338,8 +6239,8 @@ def get_playlist_details_for_notification(sp_accessToken, playlist_uri):
                         "is_empty": is_empty
                     }
 
-        # Cache miss or incomplete data - fetch fresh
-        sp_playlist_data = spotify_get_playlist_info(sp_accessToken, playlist_uri, True)
+        # Cache miss or incomplete data - fetch fresh (unless already fetched with tracks in this cycle)
+        sp_playlist_data = spotify_get_playlist_info_for_cycle(sp_accessToken, playlist_uri, True)
         p_tracks = sp_playlist_data.get("sp_playlist_tracks_count", 0)
         p_tracks_list = sp_playlist_data.get("sp_playlist_tracks", [])
 
@@ -4409,15 +6310,18 @@ def get_playlist_details_for_notification(sp_accessToken, playlist_uri):
 # Prints and saves changed list of followers/followings/playlists (with email notifications)
 def spotify_print_changed_followers_followings_playlists(username, f_list, f_list_old, f_count, f_old_count, f_str, f_str_by_or_from, f_added_str, f_added_csv, f_removed_str, f_removed_csv, f_file, csv_file_name, profile_notification, is_playlist, sp_accessToken=None):
     global GLITCH_CACHE
-    global PLAYLIST_INFO_CACHE
 
     if is_playlist:
         now = time.time()
         GLITCH_CACHE = {uri: ts for uri, ts in GLITCH_CACHE.items() if now - ts < SPOTIFY_CHECK_INTERVAL}
-        PLAYLIST_INFO_CACHE = {uri: entry for uri, entry in PLAYLIST_INFO_CACHE.items() if now - entry.get("timestamp", 0) < PLAYLIST_INFO_CACHE_TTL}
+        PLAYLIST_INFO_CACHE.expire(now)
 
     f_diff = f_count - f_old_count
 
+    # Event types derived from CSV types, e.g. "Added Follower" -> "follower_added"
+    f_added_event = "_".join(reversed(f_added_csv.lower().split(" ", 1)))
+    f_removed_event = "_".join(reversed(f_removed_csv.lower().split(" ", 1)))
+
     f_diff_str = "+" + str(f_diff) if f_diff > 0 else str(f_diff)
 
     if is_playlist:
@@ -4543,6 +6447,7 @@ def spotify_print_changed_followers_followings_playlists(username, f_list, f_lis
                             write_csv_entry(csv_file_name, now_local_naive(), f_added_csv, username, "", p_name)
                     except Exception as e:
                         print(f"* Error: {e}")
+                    emit_event(f_added_event, uri=uri, name=p_name, likes=current_likes, count=f_count)
             else:
                 if "name" in f_dict and "uri" in f_dict:
                     print(f"- {f_dict['name']} [ {spotify_convert_uri_to_url(f_dict['uri'])} ]")
@@ -4563,6 +6468,7 @@ def spotify_print_changed_followers_followings_playlists(username, f_list, f_lis
                             write_csv_entry(csv_file_name, now_local_naive(), f_added_csv, username, "", f_dict["name"])
                     except Exception as e:
                         print(f"* Error: {e}")
+                    emit_event(f_added_event, uri=f_dict["uri"], name=f_dict["name"], count=f_count)
         if added_f_list:
             print()
     if removed_f_list:
@@ -4576,6 +6482,7 @@ def spotify_print_changed_followers_followings_playlists(username, f_list, f_lis
                     uri = f_dict["uri"]
                     old_meta = next((p for p in (f_list_old or []) if isinstance(p, dict) and p.get("uri") == uri), {})
 
+                    METRICS.inc("spotify_cache_lookups_total", cache="glitch", result="hit" if uri in GLITCH_CACHE else "miss")
                     if uri in GLITCH_CACHE:
                         print(f"- Skipping playlist {spotify_format_playlist_reference(uri)} due to recent glitch")
                         continue
@@ -4641,6 +6548,7 @@ def spotify_print_changed_followers_followings_playlists(username, f_list, f_lis
                                 write_csv_entry(csv_file_name, now_local_naive(), f_removed_csv, username, p_name, "")
                         except Exception as e:
                             print(f"* Error: {e}")
+                        emit_event(f_removed_event, uri=uri, name=p_name, likes=last_known_likes, count=f_count)
                         continue
 
                     # Check if playlist is private first
@@ -4763,6 +6671,7 @@ def spotify_print_changed_followers_followings_playlists(username, f_list, f_lis
                             write_csv_entry(csv_file_name, now_local_naive(), f_removed_csv, username, p_name, "")
                     except Exception as e:
                         print(f"* Error: {e}")
+                    emit_event(f_removed_event, uri=uri, name=p_name, likes=last_known_likes, count=f_count)
             else:
                 if "name" in f_dict and "uri" in f_dict:
                     print(f"- {f_dict['name']} [ {spotify_convert_uri_to_url(f_dict['uri'])} ]")
@@ -4783,6 +6692,7 @@ def spotify_print_changed_followers_followings_playlists(username, f_list, f_lis
                             write_csv_entry(csv_file_name, now_local_naive(), f_removed_csv, username, f_dict["name"], "")
                     except Exception as e:
                         print(f"* Error: {e}")
+                    emit_event(f_removed_event, uri=f_dict["uri"], name=f_dict["name"], count=f_count)
         if removed_f_list:
             print()
 
@@ -4805,6 +6715,7 @@ def spotify_print_changed_followers_followings_playlists(username, f_list, f_lis
             write_csv_entry(csv_file_name, now_local_naive(), f_str, username, f_old_count, f_count)
     except Exception as e:
         print(f"* Error: {e}")
+    emit_event(f"{f_str.lower()}_count_changed", old=f_old_count, new=f_count, diff=f_diff)
 
     if (f_str == "Followers" or f_str == "Followings") and not FOLLOWERS_FOLLOWINGS_NOTIFICATION:
         return False
@@ -4816,7 +6727,7 @@ def spotify_print_changed_followers_followings_playlists(username, f_list, f_lis
         m_body_html = f"<html><head></head><body>{escape(f_str)} number changed {escape(f_str_by_or_from)} user <b>{escape(username)}</b> from <b>{f_old_count}</b> to <b>{f_count}</b> (<b>{escape(f_diff_str)}</b>)<br>{removed_f_list_mbody_html}{list_of_removed_f_list_html}{added_f_list_mbody_html}{list_of_added_f_list_html}<br>Check interval: <b>{escape(display_time(SPOTIFY_CHECK_INTERVAL))}</b> ({escape(get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True))}){get_cur_ts('<br>Timestamp: ')}</body></html>"
 
         print(f"Sending email notification to {RECEIVER_EMAIL}")
-        send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+        send_change_email(m_subject, m_body, m_body_html, SMTP_SSL)
 
     return False
 
@@ -4824,21 +6735,20 @@ def spotify_print_changed_followers_followings_playlists(username, f_list, f_lis
 # Saves user's profile pic to selected file name
 def save_profile_pic(user_image_url, image_file_name):
     try:
-        debug_print(f"HTTP GET {user_image_url} [profile image] stream=True")
-        image_response = req.get(user_image_url, headers={'User-Agent': USER_AGENT}, timeout=FUNCTION_TIMEOUT, stream=True, verify=VERIFY_SSL)
+        debug_print(f"HTTP GET {user_image_url} [profile image]")
+        image_response = http_request("GET", user_image_url, headers={'User-Agent': USER_AGENT}, verify=VERIFY_SSL)
         debug_print(f"HTTP GET {user_image_url} [profile image] -> {image_response.status_code}")
         image_response.raise_for_status()
         url_time = image_response.headers.get('last-modified')
 
         url_time_in_tz_ts = 0
         if url_time:
-            url_time_in_tz = parsedate_to_datetime(url_time).astimezone(pytz.timezone(LOCAL_TIMEZONE))
+            url_time_in_tz = parsedate_to_datetime(url_time).astimezone(get_local_timezone())
             url_time_in_tz_ts = int(url_time_in_tz.timestamp())
 
         if image_response.status_code == 200:
             with open(image_file_name, 'wb') as f:
-                image_response.raw.decode_content = True
-                shutil.copyfileobj(image_response.raw, f)
+                f.write(image_response.content)
             if url_time_in_tz_ts:
                 os.utime(image_file_name, (url_time_in_tz_ts, url_time_in_tz_ts))
             debug_print(f"save_profile_pic(): saved image to {image_file_name}")
@@ -4910,9 +6820,85 @@ def resolve_executable(path):
     raise FileNotFoundError(f"Could not find executable '{path}'")
 
 
+# Helper for json.dump() used by save_glitch_state(), sets are stored as tagged lists
+def glitch_state_encode(value):
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted(value, key=str)}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Helper for json.load() used by load_glitch_state(), restores sets stored by glitch_state_encode()
+def glitch_state_decode(obj):
+    if len(obj) == 1 and "__set__" in obj:
+        return set(obj["__set__"])
+    return obj
+
+
+# Saves glitch suppression state (caches and zeroed counters) atomically via temporary file
+# Returns serialized state, the file is not rewritten if it matches last_saved
+def save_glitch_state(state_file, counters, last_saved=None):
+    state = {
+        "glitch": GLITCH_CACHE,
+        "collaborators_baseline": COLLABORATORS_BASELINE_CACHE,
+        "collaborators_pending": COLLABORATORS_PENDING_CACHE,
+        "playlists_baseline": PLAYLISTS_BASELINE_CACHE,
+        "playlists_pending": PLAYLISTS_PENDING_CACHE,
+        "counters": counters,
+    }
+    state_str = json.dumps(state, default=glitch_state_encode, ensure_ascii=False)
+    if state_str == last_saved:
+        return last_saved
+
+    with open(state_file + ".tmp", "w", encoding="utf-8") as f:
+        f.write(state_str)
+    os.replace(state_file + ".tmp", state_file)
+    return state_str
+
+
+# Restores glitch suppression state saved by save_glitch_state(), returns saved zeroed counters and number of pending changes
+def load_glitch_state(state_file):
+    with open(state_file, encoding="utf-8") as f:
+        state = json.load(f, object_hook=glitch_state_decode)
+
+    GLITCH_CACHE.update(state.get("glitch") or {})
+    COLLABORATORS_BASELINE_CACHE.update(state.get("collaborators_baseline") or {})
+    COLLABORATORS_PENDING_CACHE.update(state.get("collaborators_pending") or {})
+    PLAYLISTS_BASELINE_CACHE.update(state.get("playlists_baseline") or {})
+    PLAYLISTS_PENDING_CACHE.update(state.get("playlists_pending") or {})
+
+    return state.get("counters") or {}, len(COLLABORATORS_PENDING_CACHE) + len(PLAYLISTS_PENDING_CACHE)
+
+
+# Finishes monitoring cycle before sleeping: checkpoints glitch suppression state, sends digest email if it is due,
+# records the cycle duration and stops the cycle's code profiling (so the sleep is not profiled)
+# Called at the end of every cycle and before retry sleeps after errors, returns the serialized state for next call
+def finish_monitoring_cycle(state_file, counters, username, glitch_state_saved, cycle_start):
+    HTTP_DEADLINE.deadline = None
+
+    if PERSIST_GLITCH_STATE:
+        try:
+            glitch_state_saved = save_glitch_state(state_file, counters, glitch_state_saved)
+        except Exception as e:
+            print(f"* Error while saving glitch suppression state to file '{state_file}': {e}")
+
+    if EMAIL_DIGEST_BUFFER is not None:
+        EMAIL_DIGEST_BUFFER.username = username
+        if EMAIL_DIGEST_BUFFER.is_due():
+            print(f"Sending digest email notification to {RECEIVER_EMAIL}")
+            EMAIL_DIGEST_BUFFER.flush(SMTP_SSL)
+
+    METRICS.observe("spotify_cycle_duration_seconds", time.monotonic() - cycle_start, buckets=Metrics.CYCLE_BUCKETS)
+
+    if CODE_PROFILER is not None:
+        CODE_PROFILER.stop()
+
+    return glitch_state_saved
+
+
 # Monitors profile changes of the specified Spotify user URI ID
 def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
-    global SP_CACHED_ACCESS_TOKEN, SP_CACHED_OAUTH_APP_TOKEN
+    import subprocess
+    global SP_CACHED_ACCESS_TOKEN, SP_CACHED_OAUTH_APP_TOKEN, PLAYLIST_CYCLE_STORE
     playlists_count = 0
     playlists_old_count = 0
     playlists = None
@@ -4922,6 +6908,11 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
     followings_zeroed_counter = 0
     sp_accessToken = ""
 
+    if EVENT_STREAM is not None:
+        EVENT_STREAM.user_uri_id = user_uri_id
+
+    PLAYLIST_CYCLE_STORE = PlaylistCycleStore()
+
     try:
         if csv_file_name:
             init_csv_file(csv_file_name)
@@ -4935,15 +6926,20 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
     # print("-" * len(out))
     print("─" * HORIZONTAL_LINE)
 
+    initial_delay = get_initial_check_delay(user_uri_id, SPOTIFY_CHECK_INTERVAL)
+    if initial_delay > 0:
+        print(f"Delaying first check by {display_time(initial_delay)} (check staggering)")
+        time.sleep(initial_delay)
+
     try:
         if TOKEN_SOURCE == "client":
             sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
         elif TOKEN_SOURCE == "oauth_app":
-            sp_accessToken = spotify_get_access_token_from_oauth_app(SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET)
+            sp_accessToken = spotify_get_access_token_from_oauth_app(*SP_APP_CREDS_POOL.acquire())
         elif TOKEN_SOURCE == "oauth_user":
             sp_accessToken = spotify_get_access_token_from_oauth_user(SP_USER_CLIENT_ID, SP_USER_CLIENT_SECRET, SP_USER_REDIRECT_URI, SP_USER_SCOPE, init=True)
         else:
-            sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_COOKIE)
+            sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_POOL.acquire())
         sp_user_data = spotify_get_user_info(sp_accessToken, user_uri_id, DETECT_CHANGES_IN_PLAYLISTS, 0)
         sp_user_followers_data = spotify_get_user_followers(sp_accessToken, user_uri_id)
         sp_user_followings_data = spotify_get_user_followings(sp_accessToken, user_uri_id)
@@ -5048,6 +7044,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
     followers_file = f"spotify_profile_{FILE_SUFFIX}_followers.json"
     followings_file = f"spotify_profile_{FILE_SUFFIX}_followings.json"
     playlists_file = f"spotify_profile_{FILE_SUFFIX}_playlists.json"
+    state_file = f"spotify_profile_{FILE_SUFFIX}_state.json"
     profile_pic_file = f"spotify_profile_{FILE_SUFFIX}_pic.jpeg"
     profile_pic_file_old = f"spotify_profile_{FILE_SUFFIX}_pic_old.jpeg"
     profile_pic_file_tmp = f"spotify_profile_{FILE_SUFFIX}_pic_tmp.jpeg"
@@ -5081,7 +7078,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
             if playlists_read:
                 playlists_old_count = playlists_read[0]
                 playlists_old = playlists_read[1]
-                playlists_mdate = datetime.fromtimestamp(int(os.path.getmtime(playlists_file)), pytz.timezone(LOCAL_TIMEZONE))
+                playlists_mdate = datetime.fromtimestamp(int(os.path.getmtime(playlists_file)), get_local_timezone())
                 print(f"* Playlists ({playlists_old_count}) loaded from file '{playlists_file}' ({get_short_date_from_ts(playlists_mdate, show_weekday=False, always_show_year=True)})")
         if not playlists_read:
             playlists_to_save = []
@@ -5109,7 +7106,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
         if followers_read:
             followers_old_count = followers_read[0]
             followers_old = followers_read[1]
-            followers_mdate = datetime.fromtimestamp(int(os.path.getmtime(followers_file)), pytz.timezone(LOCAL_TIMEZONE))
+            followers_mdate = datetime.fromtimestamp(int(os.path.getmtime(followers_file)), get_local_timezone())
             print(f"* Followers ({followers_old_count}) loaded from file '{followers_file}' ({get_short_date_from_ts(followers_mdate, show_weekday=False, always_show_year=True)})")
     if not followers_read:
         followers_to_save = []
@@ -5137,7 +7134,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
         if followings_read:
             followings_old_count = followings_read[0]
             followings_old = followings_read[1]
-            followings_mdate = datetime.fromtimestamp(int(os.path.getmtime(followings_file)), pytz.timezone(LOCAL_TIMEZONE))
+            followings_mdate = datetime.fromtimestamp(int(os.path.getmtime(followings_file)), get_local_timezone())
             print(f"* Followings ({followings_old_count}) loaded from file '{followings_file}' ({get_short_date_from_ts(followings_mdate, show_weekday=False, always_show_year=True)})")
     if not followings_read:
         followings_to_save = []
@@ -5161,7 +7158,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
 
         # User has no profile pic, but it exists in the filesystem
         if not image_url and os.path.isfile(profile_pic_file):
-            profile_pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file)), pytz.timezone(LOCAL_TIMEZONE))
+            profile_pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file)), get_local_timezone())
             print(f"* User {username} has removed profile picture added on {get_short_date_from_ts(profile_pic_mdate_dt, always_show_year=True)} ! (after {calculate_timespan(now_local(), profile_pic_mdate_dt, show_seconds=False, granularity=2)})")
             os.replace(profile_pic_file, profile_pic_file_old)
 
@@ -5170,13 +7167,14 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                     write_csv_entry(csv_file_name, now_local_naive(), "Profile Picture Removed", username, convert_to_local_naive(profile_pic_mdate_dt), "")
             except Exception as e:
                 print(f"* Error: {e}")
+            emit_event("profile_picture_removed", old=profile_pic_mdate_dt)
 
             print_cur_ts("Timestamp:\t\t\t")
 
         # User has profile pic, but it does not exist in the filesystem
         elif image_url and not os.path.isfile(profile_pic_file):
             if save_profile_pic(image_url, profile_pic_file):
-                profile_pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file)), pytz.timezone(LOCAL_TIMEZONE))
+                profile_pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file)), get_local_timezone())
                 print(f"* User {username} profile picture saved to '{profile_pic_file}'")
                 print(f"* Profile picture has been added on {get_short_date_from_ts(profile_pic_mdate_dt, always_show_year=True)} ({calculate_timespan(now_local(), profile_pic_mdate_dt, show_seconds=False)} ago)")
 
@@ -5192,6 +7190,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                         write_csv_entry(csv_file_name, now_local_naive(), "Profile Picture Created", username, "", convert_to_local_naive(profile_pic_mdate_dt))
                 except Exception as e:
                     print(f"* Error: {e}")
+                emit_event("profile_picture_created", new=profile_pic_mdate_dt)
 
             else:
                 print(f"* Error saving profile picture !")
@@ -5200,9 +7199,9 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
 
         # User has profile pic and it exists in the filesystem, but we check if it has not changed
         elif image_url and os.path.isfile(profile_pic_file):
-            profile_pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file)), pytz.timezone(LOCAL_TIMEZONE))
+            profile_pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file)), get_local_timezone())
             if save_profile_pic(image_url, profile_pic_file_tmp):
-                profile_pic_tmp_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file_tmp)), pytz.timezone(LOCAL_TIMEZONE))
+                profile_pic_tmp_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file_tmp)), get_local_timezone())
 
                 if not compare_images(profile_pic_file, profile_pic_file_tmp) and profile_pic_mdate_dt != profile_pic_tmp_mdate_dt:
                     print(f"* User {username} has changed profile picture ! (previous one added on {get_short_date_from_ts(profile_pic_mdate_dt, always_show_year=True)} - {calculate_timespan(now_local(), profile_pic_mdate_dt, show_seconds=False, granularity=2)} ago)")
@@ -5213,6 +7212,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                             write_csv_entry(csv_file_name, now_local_naive(), "Profile Picture Changed", username, convert_to_local_naive(profile_pic_mdate_dt), convert_to_local_naive(profile_pic_tmp_mdate_dt))
                     except Exception as e:
                         print(f"* Error: {e}")
+                    emit_event("profile_picture_changed", old=profile_pic_mdate_dt, new=profile_pic_tmp_mdate_dt)
 
                     try:
                         if imgcat_exe:
@@ -5243,44 +7243,70 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
         playlists_old = playlists
         playlists_old_count = playlists_count
 
-    time.sleep(SPOTIFY_CHECK_INTERVAL)
+    followers_profile_count_old = sp_user_data["sp_user_followers_count"]
+    followings_profile_count_old = sp_user_data["sp_user_followings_count"]
+    followers_followings_cycle = 0
+
+    glitch_state_saved = None
+    if PERSIST_GLITCH_STATE and os.path.isfile(state_file):
+        try:
+            counters, pending_count = load_glitch_state(state_file)
+            playlists_zeroed_counter = int(counters.get("playlists_zeroed", 0))
+            followers_zeroed_counter = int(counters.get("followers_zeroed", 0))
+            followings_zeroed_counter = int(counters.get("followings_zeroed", 0))
+            print(f"* Glitch suppression state loaded from file '{state_file}' ({pending_count} pending changes)")
+        except Exception as e:
+            print(f"* Warning: Cannot load glitch suppression state from file '{state_file}': {e}")
+
+    fetch_executor = CountingThreadPoolExecutor(max_workers=3, thread_name_prefix="fetch")
+    METRICS.gauge("spotify_queue_depth", fetch_executor.pending, queue="fetch")
+
+    playlists_scheduler = AdaptivePollScheduler(PLAYLIST_MIN_CHECK_INTERVAL or SPOTIFY_CHECK_INTERVAL, PLAYLIST_MAX_CHECK_INTERVAL, PLAYLIST_BACKOFF_FACTOR)
+
+    PLAYLIST_CYCLE_STORE.clear()
+    time.sleep(get_next_check_delay(user_uri_id, SPOTIFY_CHECK_INTERVAL))
     email_sent = False
     alive_counter = 0
 
+    cycle = 0
+
     # Primary loop
     while True:
+        cycle += 1
+        PLAYLIST_CYCLE_STORE.clear()
+        if CODE_PROFILER is not None:
+            CODE_PROFILER.start_cycle(cycle)
+        cycle_start = time.monotonic()
+        # All HTTP requests of the cycle (also those sent by worker threads via run_with_deadline) share one deadline,
+        # it is cleared again in finish_monitoring_cycle() before sleeping
+        cycle_deadline = cycle_start + CYCLE_TIME_BUDGET
+        HTTP_DEADLINE.deadline = cycle_deadline
         debug_print(f"Loop tick: token_source={TOKEN_SOURCE}, check_interval={SPOTIFY_CHECK_INTERVAL}, error_interval={SPOTIFY_ERROR_INTERVAL}")
         # Sometimes Spotify network functions halt even though we specified the timeout
-        # To overcome this we use alarm signal functionality to kill it inevitably, not available on Windows
-        if platform.system() != 'Windows':
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(ALARM_TIMEOUT)
+        # To overcome this all HTTP requests sent below share a total time budget (works on every platform)
         try:
-            if TOKEN_SOURCE == "client":
-                sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
-            elif TOKEN_SOURCE == "oauth_app":
-                sp_accessToken = spotify_get_access_token_from_oauth_app(SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET)
-            elif TOKEN_SOURCE == "oauth_user":
-                sp_accessToken = spotify_get_access_token_from_oauth_user(SP_USER_CLIENT_ID, SP_USER_CLIENT_SECRET, SP_USER_REDIRECT_URI, SP_USER_SCOPE)
-            else:
-                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_COOKIE)
-            sp_user_data = spotify_get_user_info(sp_accessToken, user_uri_id, DETECT_CHANGES_IN_PLAYLISTS, 0)
+            with time_budget(CHECK_TIME_BUDGET):
+                if TOKEN_SOURCE == "client":
+                    sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
+                elif TOKEN_SOURCE == "oauth_app":
+                    sp_accessToken = spotify_get_access_token_from_oauth_app(*SP_APP_CREDS_POOL.acquire())
+                elif TOKEN_SOURCE == "oauth_user":
+                    sp_accessToken = spotify_get_access_token_from_oauth_user(SP_USER_CLIENT_ID, SP_USER_CLIENT_SECRET, SP_USER_REDIRECT_URI, SP_USER_SCOPE)
+                else:
+                    sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_POOL.acquire())
+                sp_user_data = spotify_get_user_info(sp_accessToken, user_uri_id, DETECT_CHANGES_IN_PLAYLISTS, 0)
             email_sent = False
-            if platform.system() != 'Windows':
-                signal.alarm(0)
         except TimeoutException:
-            if platform.system() != 'Windows':
-                signal.alarm(0)
-            print(f"spotify_*() function timeout after {display_time(ALARM_TIMEOUT)}, retrying in {display_time(ALARM_RETRY)}")
+            retry_delay = get_retry_delay(CHECK_TIME_BUDGET_RETRY)
+            print(f"spotify_*() function timeout after {display_time(CHECK_TIME_BUDGET)}, retrying in {display_time(retry_delay)}")
             print_cur_ts("Timestamp:\t\t\t")
-            time.sleep(ALARM_RETRY)
+            glitch_state_saved = finish_monitoring_cycle(state_file, {"playlists_zeroed": playlists_zeroed_counter, "followers_zeroed": followers_zeroed_counter, "followings_zeroed": followings_zeroed_counter}, username, glitch_state_saved, cycle_start)
+            time.sleep(retry_delay)
             continue
         except Exception as e:
-            if platform.system() != 'Windows':
-                signal.alarm(0)
-
             debug_print(f"Main monitor loop error: {e}")
-            print(f"* Error, retrying in {display_time(SPOTIFY_ERROR_INTERVAL)}: {e}")
+            retry_delay = get_retry_delay(SPOTIFY_ERROR_INTERVAL)
+            print(f"* Error, retrying in {display_time(retry_delay)}: {e}")
 
             err = str(e).lower()
 
@@ -5354,7 +7380,8 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                         email_sent = True
 
             print_cur_ts("Timestamp:\t\t\t")
-            time.sleep(SPOTIFY_ERROR_INTERVAL)
+            glitch_state_saved = finish_monitoring_cycle(state_file, {"playlists_zeroed": playlists_zeroed_counter, "followers_zeroed": followers_zeroed_counter, "followings_zeroed": followings_zeroed_counter}, username, glitch_state_saved, cycle_start)
+            time.sleep(retry_delay)
             continue
 
         username = sp_user_data["sp_username"]
@@ -5369,28 +7396,66 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                     write_csv_entry(csv_file_name, now_local_naive(), "Username", username, username_old, username)
             except Exception as e:
                 print(f"* Error: {e}")
+            emit_event("username_changed", old=username_old, new=username)
 
             if PROFILE_NOTIFICATION:
                 m_subject = f"Spotify user {username_old} has changed username to {username}"
                 m_body = f"Spotify user '{username_old}' has changed username to '{username}'\n\nCheck interval: {display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
                 m_body_html = f"<html><head></head><body>Spotify user '<b>{escape(username_old)}</b>' has changed username to '<b>{escape(username)}</b>'<br><br>Check interval: <b>{escape(display_time(SPOTIFY_CHECK_INTERVAL))}</b> ({escape(get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True))}){get_cur_ts('<br>Timestamp: ')}</body></html>"
                 print(f"Sending email notification to {RECEIVER_EMAIL}")
-                send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                send_change_email(m_subject, m_body, m_body_html, SMTP_SSL)
 
             username_old = username
 
             print(f"Check interval:\t\t\t{display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)})")
             print_cur_ts("Timestamp:\t\t\t")
 
+        # With count gating, the full lists of followers / followings are fetched only when the counts reported by
+        # the profile changed (or are zero / in a zeroed streak), plus a full reconciliation every few checks
+        followers_followings_cycle += 1
+        full_reconcile = not FOLLOWERS_FOLLOWINGS_COUNT_GATING or TOKEN_SOURCE not in {"cookie", "client"} or (FOLLOWERS_FOLLOWINGS_RECONCILE_CYCLES > 0 and followers_followings_cycle >= FOLLOWERS_FOLLOWINGS_RECONCILE_CYCLES)
+        followers_profile_count = sp_user_data["sp_user_followers_count"]
+        followings_profile_count = sp_user_data["sp_user_followings_count"]
+        fetch_followers = full_reconcile or not sp_user_data["sp_user_followers_count_available"] or followers_profile_count != followers_profile_count_old or followers_profile_count == 0 or followers_zeroed_counter > 0
+        fetch_followings = full_reconcile or followings_profile_count != followings_profile_count_old or followings_profile_count == 0 or followings_zeroed_counter > 0
+
+        # Followers, followings and the profile picture are fetched in parallel and joined before change detection
+        fetch_futures = {}
+        if fetch_followings:
+            fetch_futures["followings"] = fetch_executor.submit(run_with_deadline, cycle_deadline, spotify_get_user_followings, sp_accessToken, user_uri_id)
+        if fetch_followers:
+            fetch_futures["followers"] = fetch_executor.submit(run_with_deadline, cycle_deadline, spotify_get_user_followers, sp_accessToken, user_uri_id)
+        if DETECT_CHANGED_PROFILE_PIC and image_url and os.path.isfile(profile_pic_file):
+            fetch_futures["profile_pic"] = fetch_executor.submit(run_with_deadline, cycle_deadline, save_profile_pic, image_url, profile_pic_file_tmp)
+
         try:
-            sp_user_followings_data = spotify_get_user_followings(sp_accessToken, user_uri_id)
-            sp_user_followers_data = spotify_get_user_followers(sp_accessToken, user_uri_id)
+            if fetch_followings:
+                sp_user_followings_data = fetch_futures["followings"].result()
+            else:
+                sp_user_followings_data = {"sp_user_followings": followings_old}
+            if fetch_followers:
+                sp_user_followers_data = fetch_futures["followers"].result()
+            else:
+                sp_user_followers_data = {"sp_user_followers": followers_old}
         except Exception as e:
-            print(f"* Error while getting followers & followings, retrying in {display_time(SPOTIFY_ERROR_INTERVAL)}: {e}")
+            if "profile_pic" in fetch_futures:
+                fetch_futures["profile_pic"].result()
+            retry_delay = get_retry_delay(SPOTIFY_ERROR_INTERVAL)
+            print(f"* Error while getting followers & followings, retrying in {display_time(retry_delay)}: {e}")
             print_cur_ts("Timestamp:\t\t\t")
-            time.sleep(SPOTIFY_ERROR_INTERVAL)
+            glitch_state_saved = finish_monitoring_cycle(state_file, {"playlists_zeroed": playlists_zeroed_counter, "followers_zeroed": followers_zeroed_counter, "followings_zeroed": followings_zeroed_counter}, username, glitch_state_saved, cycle_start)
+            time.sleep(retry_delay)
             continue
 
+        if FOLLOWERS_FOLLOWINGS_COUNT_GATING:
+            debug_print(f"Followers/followings count gating: fetch_followers={fetch_followers}, fetch_followings={fetch_followings}, full_reconcile={full_reconcile}")
+        if full_reconcile:
+            followers_followings_cycle = 0
+        if fetch_followers:
+            followers_profile_count_old = followers_profile_count
+        if fetch_followings:
+            followings_profile_count_old = followings_profile_count
+
         followers = sp_user_followers_data["sp_user_followers"]
         followings = sp_user_followings_data["sp_user_followings"]
 
@@ -5498,7 +7563,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
 
             # User has no profile pic, but it exists in the filesystem
             if not image_url and os.path.isfile(profile_pic_file):
-                profile_pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file)), pytz.timezone(LOCAL_TIMEZONE))
+                profile_pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file)), get_local_timezone())
                 print(f"* User {username} has removed profile picture added on {get_short_date_from_ts(profile_pic_mdate_dt, always_show_year=True)} ! (after {calculate_timespan(now_local(), profile_pic_mdate_dt, show_seconds=False, granularity=2)})\n")
                 os.replace(profile_pic_file, profile_pic_file_old)
 
@@ -5507,13 +7572,14 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                         write_csv_entry(csv_file_name, now_local_naive(), "Profile Picture Removed", username, convert_to_local_naive(profile_pic_mdate_dt), "")
                 except Exception as e:
                     print(f"* Error: {e}")
+                emit_event("profile_picture_removed", old=profile_pic_mdate_dt)
 
                 if PROFILE_NOTIFICATION:
                     m_subject = f"Spotify user {username} has removed profile picture ! (after {calculate_timespan(now_local(), profile_pic_mdate_dt, show_seconds=False, granularity=2)})"
                     m_body = f"Spotify user {username} has removed profile picture added on {get_short_date_from_ts(profile_pic_mdate_dt, always_show_year=True)} (after {calculate_timespan(now_local(), profile_pic_mdate_dt, show_seconds=False, granularity=2)})\n\nCheck interval: {display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
                     m_body_html = f"<html><head></head><body>Spotify user <b>{escape(username)}</b> has removed profile picture added on <b>{escape(get_short_date_from_ts(profile_pic_mdate_dt, always_show_year=True))}</b> (after <b>{escape(calculate_timespan(now_local(), profile_pic_mdate_dt, show_seconds=False, granularity=2))}</b>)<br><br>Check interval: <b>{escape(display_time(SPOTIFY_CHECK_INTERVAL))}</b> ({escape(get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True))}){get_cur_ts('<br>Timestamp: ')}</body></html>"
                     print(f"Sending email notification to {RECEIVER_EMAIL}")
-                    send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                    send_change_email(m_subject, m_body, m_body_html, SMTP_SSL)
 
                 print(f"Check interval:\t\t\t{display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)})")
                 print_cur_ts("Timestamp:\t\t\t")
@@ -5523,7 +7589,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                 print(f"* User {username} has set profile picture !")
                 m_body_html_pic_saved_text = ""
                 if save_profile_pic(image_url, profile_pic_file):
-                    profile_pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file)), pytz.timezone(LOCAL_TIMEZONE))
+                    profile_pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file)), get_local_timezone())
                     print(f"* User profile picture saved to '{profile_pic_file}'")
                     print(f"* Profile picture has been added on {get_short_date_from_ts(profile_pic_mdate_dt, always_show_year=True)} ({calculate_timespan(now_local(), profile_pic_mdate_dt, show_seconds=False)} ago)\n")
                     m_body_html_pic_saved_text = f'<br><br><img src="cid:profile_pic">'
@@ -5540,6 +7606,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                             write_csv_entry(csv_file_name, now_local_naive(), "Profile Picture Created", username, "", convert_to_local_naive(profile_pic_mdate_dt))
                     except Exception as e:
                         print(f"* Error: {e}")
+                    emit_event("profile_picture_created", new=profile_pic_mdate_dt)
 
                     if PROFILE_NOTIFICATION:
                         m_subject = f"Spotify user {username} has set profile picture ! ({get_short_date_from_ts(profile_pic_mdate_dt, always_show_year=True)})"
@@ -5547,7 +7614,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                         m_body_html = f"<html><head></head><body>Spotify user <b>{username}</b> has set profile picture !{m_body_html_pic_saved_text}<br><br>Profile picture has been added on <b>{get_short_date_from_ts(profile_pic_mdate_dt, always_show_year=True)}</b> ({calculate_timespan(now_local(), profile_pic_mdate_dt, show_seconds=False)} ago)<br><br>Check interval: <b>{display_time(SPOTIFY_CHECK_INTERVAL)}</b> ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts('<br>Timestamp: ')}</body></html>"
                         print(f"Sending email notification to {RECEIVER_EMAIL}")
 
-                        send_email(m_subject, m_body, m_body_html, SMTP_SSL, profile_pic_file, "profile_pic")
+                        send_change_email(m_subject, m_body, m_body_html, SMTP_SSL, profile_pic_file, "profile_pic")
 
                 else:
                     print(f"* Error saving profile picture !\n")
@@ -5557,9 +7624,9 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
 
             # User has profile pic and it exists in the filesystem, but we check if it has not changed
             elif image_url and os.path.isfile(profile_pic_file):
-                profile_pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file)), pytz.timezone(LOCAL_TIMEZONE))
-                if save_profile_pic(image_url, profile_pic_file_tmp):
-                    profile_pic_tmp_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file_tmp)), pytz.timezone(LOCAL_TIMEZONE))
+                profile_pic_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file)), get_local_timezone())
+                if (fetch_futures["profile_pic"].result() if "profile_pic" in fetch_futures else save_profile_pic(image_url, profile_pic_file_tmp)):
+                    profile_pic_tmp_mdate_dt = datetime.fromtimestamp(int(os.path.getmtime(profile_pic_file_tmp)), get_local_timezone())
 
                     if not compare_images(profile_pic_file, profile_pic_file_tmp) and profile_pic_mdate_dt != profile_pic_tmp_mdate_dt:
                         print(f"* User {username} has changed profile picture ! (previous one added on {get_short_date_from_ts(profile_pic_mdate_dt, always_show_year=True)} - {calculate_timespan(now_local(), profile_pic_mdate_dt, show_seconds=False, granularity=2)} ago)")
@@ -5571,6 +7638,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                 write_csv_entry(csv_file_name, now_local_naive(), "Profile Picture Changed", username, convert_to_local_naive(profile_pic_mdate_dt), convert_to_local_naive(profile_pic_tmp_mdate_dt))
                         except Exception as e:
                             print(f"* Error: {e}")
+                        emit_event("profile_picture_changed", old=profile_pic_mdate_dt, new=profile_pic_tmp_mdate_dt)
 
                         try:
                             if imgcat_exe:
@@ -5587,7 +7655,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                             m_body = f"Spotify user {username} has changed profile picture !\n\nPrevious one added on {get_short_date_from_ts(profile_pic_mdate_dt, always_show_year=True)} ({calculate_timespan(now_local(), profile_pic_mdate_dt, show_seconds=False, granularity=2)} ago)\n\nProfile picture has been added on {get_short_date_from_ts(profile_pic_tmp_mdate_dt, always_show_year=True)} ({calculate_timespan(now_local(), profile_pic_tmp_mdate_dt, show_seconds=False)} ago)\n\nCheck interval: {display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
                             m_body_html = f"<html><head></head><body>Spotify user <b>{username}</b> has changed profile picture !{m_body_html_pic_saved_text}<br><br>Previous one added on <b>{get_short_date_from_ts(profile_pic_mdate_dt, always_show_year=True)}</b> ({calculate_timespan(now_local(), profile_pic_mdate_dt, show_seconds=False, granularity=2)} ago)<br><br>Profile picture has been added on <b>{get_short_date_from_ts(profile_pic_tmp_mdate_dt, always_show_year=True)}</b> ({calculate_timespan(now_local(), profile_pic_tmp_mdate_dt, show_seconds=False)} ago)<br><br>Check interval: <b>{display_time(SPOTIFY_CHECK_INTERVAL)}</b> ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts('<br>Timestamp: ')}</body></html>"
                             print(f"Sending email notification to {RECEIVER_EMAIL}")
-                            send_email(m_subject, m_body, m_body_html, SMTP_SSL, profile_pic_file, "profile_pic")
+                            send_change_email(m_subject, m_body, m_body_html, SMTP_SSL, profile_pic_file, "profile_pic")
 
                         print(f"Check interval:\t\t\t{display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)})")
                         print_cur_ts("Timestamp:\t\t\t")
@@ -5606,19 +7674,40 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
 
         if DETECT_CHANGES_IN_PLAYLISTS:
             if playlists:
-                list_of_playlists, error_while_processing = spotify_process_public_playlists(sp_accessToken, playlists, True, playlists_to_skip, show_progress=False)
+                playlists_to_check = playlists
+                playlists_deferred = []
+
+                # With adaptive polling, playlists which are not due yet keep their previous snapshot
+                if PLAYLIST_ADAPTIVE_POLLING:
+                    # Next checks are scheduled relative to when this pass started, not when it finished
+                    playlists_check_ts = time.time()
+                    playlists_old_by_uri = {pl.get("uri"): pl for pl in list_of_playlists_old if "uri" in pl}
+                    playlists_to_check = []
+                    for pl in playlists:
+                        pl_uri = pl.get("uri", "")
+                        if pl_uri in playlists_old_by_uri and not playlists_scheduler.is_due(pl_uri, playlists_check_ts):
+                            playlists_deferred.append(playlists_old_by_uri[pl_uri])
+                        else:
+                            playlists_to_check.append(pl)
+                    debug_print(f"Adaptive playlist polling: {len(playlists_to_check)} due, {len(playlists_deferred)} deferred")
+
+                list_of_playlists, error_while_processing = spotify_process_public_playlists(sp_accessToken, playlists_to_check, True, playlists_to_skip, show_progress=False)
+
+                if PLAYLIST_ADAPTIVE_POLLING:
+                    for pl in list_of_playlists:
+                        if "uri" in pl:
+                            pl_changed = get_playlist_activity_signature(pl) != get_playlist_activity_signature(playlists_old_by_uri.get(pl["uri"]))
+                            pl_interval = playlists_scheduler.record(pl["uri"], pl_changed, playlists_check_ts)
+                            debug_print(f"Adaptive playlist polling: {pl['uri']} changed={pl_changed}, next check in {display_time(pl_interval)}")
+                    list_of_playlists.extend(playlists_deferred)
+                    playlists_scheduler.retain({pl.get("uri") for pl in playlists})
 
             for playlist in list_of_playlists:
                 if "uri" in playlist:
                     p_uri = playlist.get("uri", "")
-                    p_owner = playlist.get("owner", "")
-                    p_owner_uri = playlist.get("owner_uri", "")
-                    p_uri_id = spotify_extract_id_or_name(p_uri)
-                    p_owner_name = spotify_extract_id_or_name(p_owner)
-                    p_owner_id = spotify_extract_id_or_name(p_owner_uri)
 
                     # We do not process playlists that are ignored
-                    if (playlists_to_skip and (p_uri_id in playlists_to_skip or p_owner_id in playlists_to_skip or p_owner_name in playlists_to_skip)) or (IGNORE_SPOTIFY_PLAYLISTS and p_owner_id == "spotify"):
+                    if is_playlist_skipped(playlist, playlists_to_skip):
                         continue
                     p_name = playlist.get("name", "")
                     p_url = spotify_convert_uri_to_url(p_uri)
@@ -5680,13 +7769,14 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                             write_csv_entry(csv_file_name, now_local_naive(), "Playlist Likes", p_name, likes_display_old, likes_display_new)
                                     except Exception as e:
                                         print(f"* Error: {e}")
+                                    emit_event("playlist_likes_changed", uri=p_uri, name=p_name, old=p_likes_old, new=p_likes)
 
                                     m_subject = f"Spotify user {username} number of likes for playlist '{p_name}' has changed! ({p_likes_diff_str}, {likes_display_old} -> {likes_display_new})"
                                     m_body = f"{p_message}\nCheck interval: {display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
                                     m_body_html = f"<html><head></head><body>Playlist '<b><a href=\"{p_url}\">{escape(p_name)}</a></b>': number of likes changed from <b>{escape(str(likes_display_old))}</b> to <b>{escape(str(likes_display_new))}</b> (<b>{escape(p_likes_diff_str)}</b>)<br><br>Check interval: <b>{escape(display_time(SPOTIFY_CHECK_INTERVAL))}</b> ({escape(get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True))}){get_cur_ts('<br>Timestamp: ')}</body></html>"
                                     if PROFILE_NOTIFICATION:
                                         print(f"Sending email notification to {RECEIVER_EMAIL}")
-                                        send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                                        send_change_email(m_subject, m_body, m_body_html, SMTP_SSL)
                                     print(f"Check interval:\t\t\t{display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)})")
                                     print_cur_ts("Timestamp:\t\t\t")
 
@@ -5699,12 +7789,13 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                                 write_csv_entry(csv_file_name, now_local_naive(), "Playlist Name", username, p_name_old, p_name)
                                         except Exception as e:
                                             print(f"* Error: {e}")
+                                        emit_event("playlist_name_changed", uri=p_uri, old=p_name_old, new=p_name)
                                         m_subject = f"Spotify user {username} playlist '{p_name_old}' name changed to '{p_name}'! [RESTRICTED]"
                                         m_body = f"{p_message}\nMetadata source: profile-view only\n\nCheck interval: {display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
                                         m_body_html = f"<html><head></head><body>Playlist '<b>{escape(p_name_old)}</b>': name changed to new name '<b><a href=\"{p_url}\">{escape(p_name)}</a></b>' [<b>RESTRICTED</b>]<br><br>Metadata source: profile-view only<br><br>Check interval: <b>{escape(display_time(SPOTIFY_CHECK_INTERVAL))}</b> ({escape(get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True))}){get_cur_ts('<br>Timestamp: ')}</body></html>"
                                         if PROFILE_NOTIFICATION:
                                             print(f"Sending email notification to {RECEIVER_EMAIL}")
-                                            send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                                            send_change_email(m_subject, m_body, m_body_html, SMTP_SSL)
                                         print(f"Check interval:\t\t\t{display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)})")
                                         print_cur_ts("Timestamp:\t\t\t")
                                     continue
@@ -5797,6 +7888,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                             write_csv_entry(csv_file_name, now_local_naive(), "Collaborators Number", p_name, p_collaborators_old, p_collaborators)
                                     except Exception as e:
                                         print(f"* Error: {e}")
+                                    emit_event("playlist_collaborators_changed", uri=p_uri, name=p_name, old=p_collaborators_old, new=p_collaborators)
 
                                     try:
 
@@ -5824,6 +7916,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                                         write_csv_entry(csv_file_name, now_local_naive(), "Added Collaborator", p_name, "", collab_name)
                                                 except Exception as e:
                                                     print(f"* Error: {e}")
+                                                emit_event("collaborator_added", playlist_uri=p_uri, playlist_name=p_name, uri=f"spotify:user:{collab_id}", name=collab_name)
 
                                             p_message_added_collaborators += "\n"
                                             print(p_message_added_collaborators, end="")
@@ -5841,6 +7934,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                                         write_csv_entry(csv_file_name, now_local_naive(), "Removed Collaborator", p_name, collab_name, "")
                                                 except Exception as e:
                                                     print(f"* Error: {e}")
+                                                emit_event("collaborator_removed", playlist_uri=p_uri, playlist_name=p_name, uri=f"spotify:user:{collab_id}", name=collab_name)
 
                                             p_message_removed_collaborators += "\n"
                                             print(p_message_removed_collaborators, end="")
@@ -5855,7 +7949,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                     m_body_html = f"<html><head></head><body>Playlist '<b><a href=\"{p_url}\">{escape(p_name)}</a></b>': number of collaborators changed from <b>{p_collaborators_old}</b> to <b>{p_collaborators}</b> (<b>{escape(p_collaborators_diff_str)}</b>)<br>{p_message_added_collaborators_html}{p_message_removed_collaborators_html}<br>Check interval: <b>{escape(display_time(SPOTIFY_CHECK_INTERVAL))}</b> ({escape(get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True))}){get_cur_ts('<br>Timestamp: ')}</body></html>"
                                     if PROFILE_NOTIFICATION:
                                         print(f"Sending email notification to {RECEIVER_EMAIL}")
-                                        send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                                        send_change_email(m_subject, m_body, m_body_html, SMTP_SSL)
                                     print(f"Check interval:\t\t\t{display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)})")
                                     print_cur_ts("Timestamp:\t\t\t")
 
@@ -5898,6 +7992,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                             write_csv_entry(csv_file_name, now_local_naive(), "Playlist Number of Tracks", p_name, p_tracks_old, p_tracks)
                                     except Exception as e:
                                         print(f"* Error: {e}")
+                                    emit_event("playlist_tracks_count_changed", uri=p_uri, name=p_name, old=p_tracks_old, new=p_tracks)
 
                                     try:
 
@@ -5962,6 +8057,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                                             write_csv_entry(csv_file_name, convert_to_local_naive(added_at_dt), "Added Track", p_name, f_dict['added_by'], f_dict["artist"] + " - " + f_dict["track"])
                                                     except Exception as e:
                                                         print(f"* Error: {e}")
+                                                    emit_event("playlist_track_added", playlist_uri=p_uri, playlist_name=p_name, uri=f_dict.get("uri"), artist=f_dict["artist"], track=f_dict["track"], added_by=f_dict.get("added_by"), added_by_id=f_dict.get("added_by_id"), added_at=added_at_dt)
 
                                         if removed_tracks:
                                             print("Removed tracks:\n")
@@ -6020,6 +8116,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                                             write_csv_entry(csv_file_name, now_local_naive(), "Removed Track", p_name, f_dict["artist"] + " - " + f_dict["track"], "")
                                                     except Exception as e:
                                                         print(f"* Error: {e}")
+                                                    emit_event("playlist_track_removed", playlist_uri=p_uri, playlist_name=p_name, uri=f_dict.get("uri"), artist=f_dict["artist"], track=f_dict["track"], added_by=f_dict.get("added_by"), added_by_id=f_dict.get("added_by_id"), added_at=f_dict.get("added_at"))
 
                                     except Exception as e:
                                         print(f"* Error while processing added/removed tracks for playlist {spotify_format_playlist_reference(p_uri)}, skipping for now" + (f": {e}" if e else ""))
@@ -6047,7 +8144,7 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                     m_body_html = f"<html><head></head><body>{m_body_html_p_message}{p_message_added_tracks_html}{p_message_removed_tracks_html}Check interval: <b>{escape(display_time(SPOTIFY_CHECK_INTERVAL))}</b> ({escape(get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True))}){get_cur_ts('<br>Timestamp: ')}</body></html>"
                                     if PROFILE_NOTIFICATION:
                                         print(f"Sending email notification to {RECEIVER_EMAIL}")
-                                        send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                                        send_change_email(m_subject, m_body, m_body_html, SMTP_SSL)
                                     print(f"Check interval:\t\t\t{display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)})")
                                     print_cur_ts("Timestamp:\t\t\t")
 
@@ -6060,12 +8157,13 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                             write_csv_entry(csv_file_name, now_local_naive(), "Playlist Name", username, p_name_old, p_name)
                                     except Exception as e:
                                         print(f"* Error: {e}")
+                                    emit_event("playlist_name_changed", uri=p_uri, old=p_name_old, new=p_name)
                                     m_subject = f"Spotify user {username} playlist '{p_name_old}' name changed to '{p_name}'!"
                                     m_body = f"{p_message}\nCheck interval: {display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
                                     m_body_html = f"<html><head></head><body>Playlist '<b>{escape(p_name_old)}</b>': name changed to new name '<b><a href=\"{p_url}\">{escape(p_name)}</a></b>'<br><br>Check interval: <b>{escape(display_time(SPOTIFY_CHECK_INTERVAL))}</b> ({escape(get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True))}){get_cur_ts('<br>Timestamp: ')}</body></html>"
                                     if PROFILE_NOTIFICATION:
                                         print(f"Sending email notification to {RECEIVER_EMAIL}")
-                                        send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                                        send_change_email(m_subject, m_body, m_body_html, SMTP_SSL)
                                     print(f"Check interval:\t\t\t{display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)})")
                                     print_cur_ts("Timestamp:\t\t\t")
 
@@ -6078,12 +8176,13 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
                                             write_csv_entry(csv_file_name, now_local_naive(), "Playlist Description", p_name, p_descr_old, p_descr)
                                     except Exception as e:
                                         print(f"* Error: {e}")
+                                    emit_event("playlist_description_changed", uri=p_uri, name=p_name, old=p_descr_old, new=p_descr)
                                     m_subject = f"Spotify user {username} playlist '{p_name}' description has changed !"
                                     m_body = f"{p_message}\nCheck interval: {display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
                                     m_body_html = f"<html><head></head><body>Playlist '<b><a href=\"{p_url}\">{escape(p_name)}</a></b>' description changed from:<br><br>'<i>{escape(p_descr_old)}</i>'<br><br>to:<br><br>'<i>{escape(p_descr)}</i>'<br><br>Check interval: <b>{escape(display_time(SPOTIFY_CHECK_INTERVAL))}</b> ({escape(get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True))}){get_cur_ts('<br>Timestamp: ')}</body></html>"
                                     if PROFILE_NOTIFICATION:
                                         print(f"Sending email notification to {RECEIVER_EMAIL}")
-                                        send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                                        send_change_email(m_subject, m_body, m_body_html, SMTP_SSL)
                                     print(f"Check interval:\t\t\t{display_time(SPOTIFY_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - SPOTIFY_CHECK_INTERVAL, int(time.time()), short=True)})")
                                     print_cur_ts("Timestamp:\t\t\t")
 
@@ -6229,11 +8328,15 @@ def spotify_profile_monitor_uri(user_uri_id, csv_file_name, playlists_to_skip):
             print_cur_ts("Liveness check, timestamp:\t")
             alive_counter = 0
 
-        time.sleep(SPOTIFY_CHECK_INTERVAL)
+        glitch_state_saved = finish_monitoring_cycle(state_file, {"playlists_zeroed": playlists_zeroed_counter, "followers_zeroed": followers_zeroed_counter, "followings_zeroed": followings_zeroed_counter}, username, glitch_state_saved, cycle_start)
+
+        # Results are not reused across cycles, so do not keep them (with full track lists) in memory while sleeping
+        PLAYLIST_CYCLE_STORE.clear()
+        time.sleep(get_next_check_delay(user_uri_id, SPOTIFY_CHECK_INTERVAL))
 
 
 def main():
-    global CLI_CONFIG_PATH, DOTENV_FILE, LOCAL_TIMEZONE, LIVENESS_CHECK_COUNTER, SP_DC_COOKIE, SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET, SP_USER_CLIENT_ID, SP_USER_CLIENT_SECRET, LOGIN_REQUEST_BODY_FILE, CLIENTTOKEN_REQUEST_BODY_FILE, REFRESH_TOKEN, LOGIN_URL, USER_AGENT, DEVICE_ID, SYSTEM_ID, USER_URI_ID, CSV_FILE, PLAYLISTS_TO_SKIP_FILE, FILE_SUFFIX, DISABLE_LOGGING, DEBUG_MODE, SP_LOGFILE, PROFILE_NOTIFICATION, SPOTIFY_CHECK_INTERVAL, SPOTIFY_ERROR_INTERVAL, FOLLOWERS_FOLLOWINGS_NOTIFICATION, ERROR_NOTIFICATION, DETECT_CHANGED_PROFILE_PIC, DETECT_CHANGES_IN_PLAYLISTS, GET_ALL_PLAYLISTS, imgcat_exe, SMTP_PASSWORD, SP_SHA256, stdout_bck, APP_VERSION, CPU_ARCH, OS_BUILD, PLATFORM, OS_MAJOR, OS_MINOR, CLIENT_MODEL, TOKEN_SOURCE, ALARM_TIMEOUT, pyotp, CLEAN_OUTPUT, USER_AGENT, SP_APP_TOKENS_FILE, SP_USER_TOKENS_FILE, TRUNCATE_CHARS
+    global EVENTS_FILE, EVENT_STREAM, EXPORT_FORMAT, SEARCH_LIMIT, SEARCH_OFFSET, SEARCH_CACHE_FILE, SEARCH_CACHE, SEARCH_RATE_LIMITER, HEADLESS, EMAIL_QUEUE_WORKER, EMAIL_DIGEST_BUFFER, METRICS_PORT, HTTP_CASSETTE, HTTP_RECORD_FILE, HTTP_REPLAY_FILE, CODE_PROFILER, CODE_PROFILING, CODE_PROFILING_EVERY, CLI_CONFIG_PATH, DOTENV_FILE, LOCAL_TIMEZONE, LIVENESS_CHECK_COUNTER, SP_DC_COOKIE, SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET, SP_USER_CLIENT_ID, SP_USER_CLIENT_SECRET, LOGIN_REQUEST_BODY_FILE, CLIENTTOKEN_REQUEST_BODY_FILE, REFRESH_TOKEN, LOGIN_URL, USER_AGENT, DEVICE_ID, SYSTEM_ID, USER_URI_ID, CSV_FILE, PLAYLISTS_TO_SKIP_FILE, FILE_SUFFIX, DISABLE_LOGGING, DEBUG_MODE, SP_LOGFILE, PROFILE_NOTIFICATION, SPOTIFY_CHECK_INTERVAL, SPOTIFY_ERROR_INTERVAL, FOLLOWERS_FOLLOWINGS_NOTIFICATION, ERROR_NOTIFICATION, DETECT_CHANGED_PROFILE_PIC, DETECT_CHANGES_IN_PLAYLISTS, GET_ALL_PLAYLISTS, imgcat_exe, SMTP_PASSWORD, SP_SHA256, stdout_bck, APP_VERSION, CPU_ARCH, OS_BUILD, PLATFORM, OS_MAJOR, OS_MINOR, CLIENT_MODEL, TOKEN_SOURCE, pyotp, CLEAN_OUTPUT, USER_AGENT, SP_APP_TOKENS_FILE, SP_USER_TOKENS_FILE, TRUNCATE_CHARS
     global EXPORT_ALL
 
     if "--generate-config" in sys.argv:
@@ -6445,6 +8548,21 @@ def main():
         action="store_true",
         help="List followers & followings for a user"
     )
+    listing.add_argument(
+        "--batch-users-file",
+        dest="batch_users_file",
+        metavar="USERS_FILE",
+        type=str,
+        help="Show profile details for all users listed in the file (one user URI ID / URL per line) concurrently"
+    )
+    listing.add_argument(
+        "--batch-report",
+        dest="batch_report",
+        metavar="REPORT_FILE",
+        type=str,
+        default="spotify_profile_monitor_batch_report.json",
+        help="Consolidated report file for --batch-users-file, JSON or CSV (.csv extension); default: spotify_profile_monitor_batch_report.json"
+    )
     listing.add_argument(
         "-s", "--search-username",
         dest="search_username",
@@ -6452,6 +8570,27 @@ def main():
         type=str,
         help="Search for Spotify users by name"
     )
+    listing.add_argument(
+        "--search-file",
+        dest="search_file",
+        metavar="NAMES_FILE",
+        type=str,
+        help="Search for Spotify users with all names listed in the file (one per line) concurrently"
+    )
+    listing.add_argument(
+        "--search-limit",
+        dest="search_limit",
+        metavar="N",
+        type=int,
+        help="Max number of users returned per search query (-s / --search-file)"
+    )
+    listing.add_argument(
+        "--search-offset",
+        dest="search_offset",
+        metavar="N",
+        type=int,
+        help="Number of search results to skip, to page through results (-s / --search-file)"
+    )
 
     # Features & output
     opts = parser.add_argument_group("Features & output")
@@ -6475,6 +8614,12 @@ def main():
         action="store_true",
         help="Simplified output for exporting playlists (-l) or liked songs (-x) into 'spotify_monitor'",
     )
+    opts.add_argument(
+        "--export-format",
+        dest="export_format",
+        choices=["csv", "ndjson", "parquet"],
+        help="Output format for exported playlists (-l, --export-all-playlists) or liked songs (-x); parquet requires pyarrow",
+    )
     opts.add_argument(
         "-j", "--no-profile-pic-detect",
         dest="do_not_detect_changed_profile_pic",
@@ -6517,6 +8662,20 @@ def main():
         default=None,
         help="Disable logging to spotify_profile_monitor_<user_uri_id/file_suffix>.log"
     )
+    opts.add_argument(
+        "--events-file",
+        dest="events_file",
+        metavar="EVENTS_FILE",
+        type=str,
+        help="Stream detected changes as newline-delimited JSON events to the file ('-' for stdout)"
+    )
+    opts.add_argument(
+        "--headless",
+        dest="headless",
+        action="store_true",
+        default=None,
+        help="Do not render output to the terminal, write it only to the log file"
+    )
     opts.add_argument(
         "--debug",
         dest="debug_mode",
@@ -6524,6 +8683,41 @@ def main():
         default=None,
         help="Enable debug mode for technical logging"
     )
+    opts.add_argument(
+        "--record",
+        dest="record_file",
+        metavar="CASSETTE",
+        type=str,
+        help="Record all HTTP requests and responses (with secrets masked) to the cassette file"
+    )
+    opts.add_argument(
+        "--replay",
+        dest="replay_file",
+        metavar="CASSETTE",
+        type=str,
+        help="Replay HTTP responses from the cassette file instead of querying Spotify; never touches the network (placeholder token is used)"
+    )
+    opts.add_argument(
+        "--profile",
+        dest="code_profiling",
+        action="store_true",
+        default=None,
+        help="Profile monitoring cycles (or -l / -i / -x commands) and write pstats and collapsed stacks next to the log file"
+    )
+    opts.add_argument(
+        "--profile-every",
+        dest="code_profiling_every",
+        metavar="N",
+        type=int,
+        help="Profile only every Nth monitoring cycle (used with --profile)"
+    )
+    opts.add_argument(
+        "--metrics-port",
+        dest="metrics_port",
+        metavar="PORT",
+        type=int,
+        help="Expose runtime metrics in Prometheus text format on http://METRICS_HOST:PORT/metrics"
+    )
     opts.add_argument(
         "--truncate",
         dest="truncate",
@@ -6612,11 +8806,11 @@ def main():
 
     local_tz = None
     if LOCAL_TIMEZONE == "Auto":
-        if get_localzone is not None:
-            try:
-                local_tz = get_localzone()
-            except Exception:
-                pass
+        try:
+            from tzlocal import get_localzone
+            local_tz = get_localzone()
+        except Exception:
+            pass
         if local_tz:
             LOCAL_TIMEZONE = str(local_tz)
         else:
@@ -6637,7 +8831,6 @@ def main():
     debug_print(f"Effective TOKEN_SOURCE={TOKEN_SOURCE}")
 
     if TOKEN_SOURCE == "cookie":
-        ALARM_TIMEOUT = int((TOKEN_MAX_RETRIES * TOKEN_RETRY_TIMEOUT) + 5)
         try:
             import pyotp
         except ModuleNotFoundError:
@@ -6669,7 +8862,38 @@ def main():
     else:
         debug_print("Using USER_AGENT from config/environment")
 
-    if not check_internet():
+    if args.record_file:
+        HTTP_RECORD_FILE = args.record_file
+
+    if args.replay_file:
+        HTTP_REPLAY_FILE = args.replay_file
+
+    if HTTP_RECORD_FILE and HTTP_REPLAY_FILE:
+        print("* Error: --record and --replay cannot be used together")
+        sys.exit(1)
+
+    try:
+        if HTTP_REPLAY_FILE:
+            HTTP_CASSETTE = HttpCassette(os.path.expanduser(HTTP_REPLAY_FILE), "replay")
+            print(f"* Replaying {len(HTTP_CASSETTE)} recorded HTTP interactions from '{HTTP_REPLAY_FILE}'\n")
+        elif HTTP_RECORD_FILE:
+            HTTP_CASSETTE = HttpCassette(os.path.expanduser(HTTP_RECORD_FILE), "record")
+            atexit.register(HTTP_CASSETTE.verify)
+            print(f"* Recording HTTP interactions to '{HTTP_RECORD_FILE}'\n")
+    except Exception as e:
+        print(f"* Error: Cannot open HTTP cassette file: {e}")
+        sys.exit(1)
+
+    if args.code_profiling:
+        CODE_PROFILING = True
+
+    if args.code_profiling_every:
+        CODE_PROFILING_EVERY = args.code_profiling_every
+
+    if CODE_PROFILING:
+        CODE_PROFILER = CodeProfiler(CODE_PROFILING_EVERY)
+
+    if not HTTP_REPLAY_FILE and not check_internet():
         sys.exit(1)
 
     if args.send_test_email:
@@ -6721,7 +8945,7 @@ def main():
                     print(f"* Error: Protobuf file ({LOGIN_REQUEST_BODY_FILE}) cannot be processed: {e}")
                     sys.exit(1)
                 else:
-                    if not args.user_id and not args.list_tracks_for_playlist and not args.search_username and not args.user_profile_details and not args.recently_played_artists and not args.followers_and_followings and not args.list_liked_tracks and login_request_body_file_param:
+                    if not args.user_id and not args.list_tracks_for_playlist and not args.search_username and not args.user_profile_details and not args.recently_played_artists and not args.followers_and_followings and not args.list_liked_tracks and not args.batch_users_file and not args.search_file and login_request_body_file_param:
                         print(f"* Login data correctly read from Protobuf file ({LOGIN_REQUEST_BODY_FILE}):")
                         print(" - Device ID:\t\t", DEVICE_ID)
                         print(" - System ID:\t\t", SYSTEM_ID)
@@ -6773,7 +8997,7 @@ def main():
                     print(f"* Error: Protobuf file ({CLIENTTOKEN_REQUEST_BODY_FILE}) cannot be processed: {e}")
                     sys.exit(1)
                 else:
-                    if not args.user_id and not args.list_tracks_for_playlist and not args.search_username and not args.user_profile_details and not args.recently_played_artists and not args.followers_and_followings and not args.list_liked_tracks and clienttoken_request_body_file_param:
+                    if not args.user_id and not args.list_tracks_for_playlist and not args.search_username and not args.user_profile_details and not args.recently_played_artists and not args.followers_and_followings and not args.list_liked_tracks and not args.batch_users_file and not args.search_file and clienttoken_request_body_file_param:
                         print(f"* Client token data correctly read from Protobuf file ({CLIENTTOKEN_REQUEST_BODY_FILE}):")
                         print(" - App version:\t\t", APP_VERSION)
                         print(" - CPU arch:\t\t", CPU_ARCH)
@@ -6841,6 +9065,12 @@ def main():
             print("* Error: SP_APP_CLIENT_ID or SP_APP_CLIENT_SECRET (-r / --oauth-app-creds) value is empty or incorrect (required for cookie/client hybrid mode since 22 Dec 2025)")
             sys.exit(1)
 
+    if CREDENTIALS_ROTATION not in ("round_robin", "least_loaded"):
+        print(f"* Error: CREDENTIALS_ROTATION value '{CREDENTIALS_ROTATION}' is incorrect, use 'round_robin' or 'least_loaded'")
+        sys.exit(1)
+
+    refresh_credentials_pools()
+
     if IMGCAT_PATH:
         try:
             imgcat_exe = resolve_executable(IMGCAT_PATH)
@@ -6867,6 +9097,20 @@ def main():
             print(f"* Error: CSV file cannot be opened for writing: {e}")
             sys.exit(1)
 
+    if args.export_format:
+        EXPORT_FORMAT = args.export_format
+
+    EXPORT_FORMAT = (EXPORT_FORMAT or "csv").lower()
+    if EXPORT_FORMAT not in ("csv", "ndjson", "parquet"):
+        print(f"* Error: EXPORT_FORMAT value '{EXPORT_FORMAT}' is incorrect, use 'csv', 'ndjson' or 'parquet'")
+        sys.exit(1)
+
+    if EXPORT_FORMAT == "parquet" and (args.list_tracks_for_playlist or args.list_liked_tracks or args.export_all_playlists):
+        try:
+            import pyarrow.parquet
+        except ModuleNotFoundError:
+            raise SystemExit("Error: Couldn't find the pyarrow library required for parquet export format !\n\nTo install it, run:\n    pip install pyarrow\n\nOnce installed, re-run this tool")
+
     if args.export_all_playlists:
         if not args.user_profile_details:
             print("Error: --export-all-playlists requires -i / --show-user-profile flag !")
@@ -6882,12 +9126,13 @@ def main():
             if TOKEN_SOURCE == "client":
                 sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
             elif TOKEN_SOURCE == "oauth_app":
-                sp_accessToken = spotify_get_access_token_from_oauth_app(SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET)
+                sp_accessToken = spotify_get_access_token_from_oauth_app(*SP_APP_CREDS_POOL.acquire())
             elif TOKEN_SOURCE == "oauth_user":
                 sp_accessToken = spotify_get_access_token_from_oauth_user(SP_USER_CLIENT_ID, SP_USER_CLIENT_SECRET, SP_USER_REDIRECT_URI, SP_USER_SCOPE, init=True)
             else:
-                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_COOKIE)
-            spotify_list_tracks_for_playlist(sp_accessToken, args.list_tracks_for_playlist, CSV_FILE, CSV_FILE_FORMAT_EXPORT)
+                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_POOL.acquire())
+            with profile_section("list"):
+                spotify_list_tracks_for_playlist(sp_accessToken, args.list_tracks_for_playlist, CSV_FILE, CSV_FILE_FORMAT_EXPORT)
         except Exception as e:
             if 'Not Found' in str(e) or '400 Client' in str(e):
                 print(f"* Error: Playlist does not exist or is set to private: {e}")
@@ -6904,12 +9149,13 @@ def main():
             if TOKEN_SOURCE == "client":
                 sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
             elif TOKEN_SOURCE == "oauth_app":
-                sp_accessToken = spotify_get_access_token_from_oauth_app(SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET)
+                sp_accessToken = spotify_get_access_token_from_oauth_app(*SP_APP_CREDS_POOL.acquire())
             elif TOKEN_SOURCE == "oauth_user":
                 sp_accessToken = spotify_get_access_token_from_oauth_user(SP_USER_CLIENT_ID, SP_USER_CLIENT_SECRET, SP_USER_REDIRECT_URI, SP_USER_SCOPE, init=True)
             else:
-                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_COOKIE)
-            spotify_list_liked_tracks(sp_accessToken, CSV_FILE, CSV_FILE_FORMAT_EXPORT)
+                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_POOL.acquire())
+            with profile_section("liked"):
+                spotify_list_liked_tracks(sp_accessToken, CSV_FILE, CSV_FILE_FORMAT_EXPORT)
         except Exception as e:
             if 'Not Found' in str(e) or '400 Client' in str(e):
                 print(f"* Error: Playlist does not exist or is set to private: {e}")
@@ -6918,23 +9164,76 @@ def main():
             sys.exit(1)
         sys.exit(0)
 
-    if args.search_username:
+    if args.search_username or args.search_file:
         if TOKEN_SOURCE not in ("cookie", "client"):
             print(f"* Error: Search feature is not supported with the '{TOKEN_SOURCE}' method ! Use a different token source !")
             sys.exit(2)
         if not SP_SHA256 or SP_SHA256 == "your_spotify_client_sha256":
             print("* Error: Wrong SP_SHA256 value !")
             sys.exit(1)
+        if args.search_limit is not None:
+            SEARCH_LIMIT = args.search_limit
+        if args.search_offset is not None:
+            SEARCH_OFFSET = args.search_offset
+        if SEARCH_LIMIT < 1 or SEARCH_OFFSET < 0:
+            print("* Error: SEARCH_LIMIT (--search-limit) must be at least 1 and SEARCH_OFFSET (--search-offset) cannot be negative !")
+            sys.exit(1)
+        search_names = []
+        if args.search_file:
+            try:
+                with open(os.path.expanduser(args.search_file), encoding="utf-8") as file:
+                    search_names = list(dict.fromkeys(line.strip() for line in file if line.strip() and not line.strip().startswith("#")))
+            except Exception as e:
+                print(f"* Error: File with names to search ({args.search_file}) cannot be read: {e}")
+                sys.exit(1)
+            if not search_names:
+                print(f"* Error: File with names to search ({args.search_file}) is empty !")
+                sys.exit(1)
+        if SEARCH_CACHE_FILE:
+            SEARCH_CACHE_FILE = os.path.expanduser(SEARCH_CACHE_FILE)
+            SEARCH_CACHE = SearchCache(SEARCH_CACHE_FILE, SEARCH_CACHE_TTL)
+        SEARCH_RATE_LIMITER = RateLimiter(SEARCH_RATE_LIMIT)
+        try:
+            if TOKEN_SOURCE == "client":
+                sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
+            elif TOKEN_SOURCE == "oauth_app":
+                sp_accessToken = spotify_get_access_token_from_oauth_app(*SP_APP_CREDS_POOL.acquire())
+            elif TOKEN_SOURCE == "oauth_user":
+                sp_accessToken = spotify_get_access_token_from_oauth_user(SP_USER_CLIENT_ID, SP_USER_CLIENT_SECRET, SP_USER_REDIRECT_URI, SP_USER_SCOPE, init=True)
+            else:
+                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_POOL.acquire())
+            if args.search_username:
+                spotify_search_users(sp_accessToken, args.search_username)
+            if search_names:
+                spotify_search_users_batch(sp_accessToken, search_names)
+        except Exception as e:
+            print(f"* Error: {e}")
+            sys.exit(1)
+        finally:
+            if SEARCH_CACHE is not None:
+                SEARCH_CACHE.save()
+        sys.exit(0)
+
+    if args.batch_users_file:
+        try:
+            batch_user_ids = read_user_ids_file(os.path.expanduser(args.batch_users_file))
+        except Exception as e:
+            print(f"* Error: File with user URI IDs ({args.batch_users_file}) cannot be read: {e}")
+            sys.exit(1)
+        if not batch_user_ids:
+            print(f"* Error: File with user URI IDs ({args.batch_users_file}) is empty !")
+            sys.exit(1)
         try:
             if TOKEN_SOURCE == "client":
                 sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
             elif TOKEN_SOURCE == "oauth_app":
-                sp_accessToken = spotify_get_access_token_from_oauth_app(SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET)
+                sp_accessToken = spotify_get_access_token_from_oauth_app(*SP_APP_CREDS_POOL.acquire())
             elif TOKEN_SOURCE == "oauth_user":
                 sp_accessToken = spotify_get_access_token_from_oauth_user(SP_USER_CLIENT_ID, SP_USER_CLIENT_SECRET, SP_USER_REDIRECT_URI, SP_USER_SCOPE, init=True)
             else:
-                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_COOKIE)
-            spotify_search_users(sp_accessToken, args.search_username)
+                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_POOL.acquire())
+            with profile_section("batch"):
+                spotify_batch_user_details(sp_accessToken, batch_user_ids, os.path.expanduser(args.batch_report))
         except Exception as e:
             print(f"* Error: {e}")
             sys.exit(1)
@@ -6950,12 +9249,13 @@ def main():
             if TOKEN_SOURCE == "client":
                 sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
             elif TOKEN_SOURCE == "oauth_app":
-                sp_accessToken = spotify_get_access_token_from_oauth_app(SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET)
+                sp_accessToken = spotify_get_access_token_from_oauth_app(*SP_APP_CREDS_POOL.acquire())
             elif TOKEN_SOURCE == "oauth_user":
                 sp_accessToken = spotify_get_access_token_from_oauth_user(SP_USER_CLIENT_ID, SP_USER_CLIENT_SECRET, SP_USER_REDIRECT_URI, SP_USER_SCOPE, init=True)
             else:
-                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_COOKIE)
-            spotify_get_user_details(sp_accessToken, args.user_id)
+                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_POOL.acquire())
+            with profile_section("info"):
+                spotify_get_user_details(sp_accessToken, args.user_id)
         except Exception as e:
             err = str(e).lower()
             if 'not found' in err or '404' in err:
@@ -6977,11 +9277,11 @@ def main():
             if TOKEN_SOURCE == "client":
                 sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
             elif TOKEN_SOURCE == "oauth_app":
-                sp_accessToken = spotify_get_access_token_from_oauth_app(SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET)
+                sp_accessToken = spotify_get_access_token_from_oauth_app(*SP_APP_CREDS_POOL.acquire())
             elif TOKEN_SOURCE == "oauth_user":
                 sp_accessToken = spotify_get_access_token_from_oauth_user(SP_USER_CLIENT_ID, SP_USER_CLIENT_SECRET, SP_USER_REDIRECT_URI, SP_USER_SCOPE, init=True)
             else:
-                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_COOKIE)
+                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_POOL.acquire())
             if TOKEN_SOURCE != "oauth_user" or (TOKEN_SOURCE == "oauth_user" and is_token_owner(sp_accessToken, args.user_id)):
                 spotify_get_recently_played_artists(sp_accessToken, args.user_id)
             else:
@@ -7006,11 +9306,11 @@ def main():
             if TOKEN_SOURCE == "client":
                 sp_accessToken = spotify_get_access_token_from_client_auto(DEVICE_ID, SYSTEM_ID, USER_URI_ID, REFRESH_TOKEN)
             elif TOKEN_SOURCE == "oauth_app":
-                sp_accessToken = spotify_get_access_token_from_oauth_app(SP_APP_CLIENT_ID, SP_APP_CLIENT_SECRET)
+                sp_accessToken = spotify_get_access_token_from_oauth_app(*SP_APP_CREDS_POOL.acquire())
             elif TOKEN_SOURCE == "oauth_user":
                 sp_accessToken = spotify_get_access_token_from_oauth_user(SP_USER_CLIENT_ID, SP_USER_CLIENT_SECRET, SP_USER_REDIRECT_URI, SP_USER_SCOPE, init=True)
             else:
-                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_COOKIE)
+                sp_accessToken = spotify_get_access_token_from_sp_dc(SP_DC_POOL.acquire())
             spotify_get_followers_and_followings(sp_accessToken, args.user_id)
         except Exception as e:
             err = str(e).lower()
@@ -7066,6 +9366,9 @@ def main():
     if args.disable_logging is True:
         DISABLE_LOGGING = True
 
+    if args.headless is True:
+        HEADLESS = True
+
     if not DISABLE_LOGGING:
         log_path = Path(os.path.expanduser(SP_LOGFILE))
         if log_path.parent != Path('.'):
@@ -7076,7 +9379,7 @@ def main():
                 log_path = Path(f"{log_path.name}_{FILE_SUFFIX}.log")
         log_path.parent.mkdir(parents=True, exist_ok=True)
         FINAL_LOG_PATH = str(log_path)
-        sys.stdout = Logger(FINAL_LOG_PATH)
+        sys.stdout = Logger(FINAL_LOG_PATH, LOG_FLUSH_INTERVAL, LOG_MAX_SIZE, LOG_ROTATE_INTERVAL, LOG_BACKUP_COUNT, HEADLESS)
     else:
         FINAL_LOG_PATH = None
 
@@ -7096,21 +9399,76 @@ def main():
         PROFILE_NOTIFICATION = False
         FOLLOWERS_FOLLOWINGS_NOTIFICATION = False
         ERROR_NOTIFICATION = False
+    elif EMAIL_QUEUE:
+        try:
+            EMAIL_QUEUE_WORKER = EmailQueue(os.path.expanduser(EMAIL_SPOOL_DIR) if EMAIL_SPOOL_DIR else f"spotify_profile_{FILE_SUFFIX}_mail_spool", SMTP_IDLE_TIMEOUT, EMAIL_RETRY_INTERVAL)
+            atexit.register(EMAIL_QUEUE_WORKER.close)
+        except Exception as e:
+            print(f"* Warning: Cannot start outbound mail queue, emails will be sent synchronously: {e}")
+
+    if args.metrics_port is not None:
+        METRICS_PORT = args.metrics_port
+
+    if METRICS_PORT:
+        try:
+            start_metrics_server(METRICS_HOST, METRICS_PORT)
+        except Exception as e:
+            print(f"* Error: Cannot start metrics endpoint on {METRICS_HOST}:{METRICS_PORT}: {e}")
+            sys.exit(1)
+        METRICS.gauge("spotify_cache_entries", lambda: len(PLAYLIST_INFO_CACHE), cache="playlist_info")
+        METRICS.gauge("spotify_cache_hit_ratio", lambda: PLAYLIST_INFO_CACHE.hits / max(1, PLAYLIST_INFO_CACHE.hits + PLAYLIST_INFO_CACHE.misses), cache="playlist_info")
+        METRICS.gauge("spotify_cache_entries", lambda: len(GLITCH_CACHE), cache="glitch")
+        METRICS.gauge("spotify_queue_depth", lambda: EMAIL_QUEUE_WORKER.pending() if EMAIL_QUEUE_WORKER is not None else 0, queue="email")
+        METRICS.gauge("spotify_queue_depth", lambda: len(EMAIL_DIGEST_BUFFER.events) if EMAIL_DIGEST_BUFFER is not None else 0, queue="digest")
+
+    if args.events_file:
+        EVENTS_FILE = args.events_file
+
+    if EVENTS_FILE:
+        try:
+            EVENT_STREAM = EventStream(EVENTS_FILE if EVENTS_FILE == "-" else os.path.expanduser(EVENTS_FILE))
+            atexit.register(EVENT_STREAM.close)
+        except Exception as e:
+            print(f"* Error: Cannot open events file '{EVENTS_FILE}': {e}")
+            sys.exit(1)
+
+    if EMAIL_DIGEST and not SMTP_HOST.startswith("your_smtp_server_"):
+        EMAIL_DIGEST_BUFFER = EmailDigest(args.user_id, EMAIL_DIGEST_WINDOW)
+        # Registered after the mail queue, so pending digest is flushed before the queue is drained at exit
+        atexit.register(EMAIL_DIGEST_BUFFER.flush, SMTP_SSL)
 
     print(f"* Spotify polling intervals:\t[check: {display_time(SPOTIFY_CHECK_INTERVAL)}] [error: {display_time(SPOTIFY_ERROR_INTERVAL)}]")
+    if STAGGER_CHECKS or CHECK_INTERVAL_JITTER > 0:
+        print(f"* Check staggering:\t\t[phase: {display_time(get_user_check_phase(args.user_id, SPOTIFY_CHECK_INTERVAL)) if STAGGER_CHECKS else 'disabled'}] [jitter: ±{display_time(CHECK_INTERVAL_JITTER) if CHECK_INTERVAL_JITTER > 0 else '0'}]")
     print(f"* Email notifications:\t\t[profile changes = {PROFILE_NOTIFICATION}] [followers/followings = {FOLLOWERS_FOLLOWINGS_NOTIFICATION}]\n*\t\t\t\t[errors = {ERROR_NOTIFICATION}]")
+    if EMAIL_QUEUE_WORKER is not None:
+        print(f"* Outbound mail queue:\t\t{EMAIL_QUEUE_WORKER.spool_dir}" + (f" ({EMAIL_QUEUE_WORKER.pending()} spooled)" if EMAIL_QUEUE_WORKER.pending() else ""))
+    if METRICS_PORT:
+        print(f"* Metrics endpoint:\t\thttp://{METRICS_HOST}:{METRICS_PORT}/metrics")
+    if EMAIL_DIGEST_BUFFER is not None:
+        print("* Digest email notifications:\t" + (f"every {display_time(EMAIL_DIGEST_WINDOW)}" if EMAIL_DIGEST_WINDOW > 0 else "per check cycle"))
     print(f"* Token source:\t\t\t{TOKEN_SOURCE}" + (" + oauth_app" if TOKEN_SOURCE in {"cookie", "client"} else ""))
+    if len(SP_DC_POOL) > 1 or len(SP_APP_CREDS_POOL) > 1:
+        print(f"* Credentials rotation:\t\t{CREDENTIALS_ROTATION} [sp_dc: {len(SP_DC_POOL) if TOKEN_SOURCE == 'cookie' else 0}] [oauth_app: {len(SP_APP_CREDS_POOL)}]")
     print(f"* Profile pic changes:\t\t{DETECT_CHANGED_PROFILE_PIC}")
     print(f"* Playlist changes:\t\t{DETECT_CHANGES_IN_PLAYLISTS}")
     print(f"* All public playlists:\t\t{GET_ALL_PLAYLISTS}")
+    if DETECT_CHANGES_IN_PLAYLISTS and PLAYLIST_ADAPTIVE_POLLING:
+        print(f"* Adaptive playlist polling:\t{display_time(PLAYLIST_MIN_CHECK_INTERVAL or SPOTIFY_CHECK_INTERVAL)} - {display_time(PLAYLIST_MAX_CHECK_INTERVAL)} (x{PLAYLIST_BACKOFF_FACTOR} back-off)")
     # print(f"* User agent:\t\t\t{USER_AGENT}")
     print(f"* Liveness check:\t\t{bool(LIVENESS_CHECK_INTERVAL)}" + (f" ({display_time(LIVENESS_CHECK_INTERVAL)})" if LIVENESS_CHECK_INTERVAL else ""))
     print(f"* CSV logging enabled:\t\t{bool(CSV_FILE)}" + (f" ({CSV_FILE})" if CSV_FILE else ""))
+    if EVENT_STREAM is not None:
+        print(f"* Events stream:\t\t" + ("stdout" if EVENTS_FILE == "-" else EVENTS_FILE))
     print(f"* Ignore Spotify playlists:\t{IGNORE_SPOTIFY_PLAYLISTS}")
     print(f"* Ignore listed playlists:\t{bool(PLAYLISTS_TO_SKIP_FILE)}" + (f" ({PLAYLISTS_TO_SKIP_FILE})" if PLAYLISTS_TO_SKIP_FILE else ""))
     print(f"* Display profile pics:\t\t{bool(imgcat_exe)}" + (f" (via {imgcat_exe})" if imgcat_exe else ""))
     print(f"* Output logging enabled:\t{not DISABLE_LOGGING}" + (f" ({FINAL_LOG_PATH})" if not DISABLE_LOGGING else ""))
+    if not DISABLE_LOGGING and (LOG_MAX_SIZE or LOG_ROTATE_INTERVAL):
+        print(f"* Log rotation:\t\t\t" + (f"[size: {LOG_MAX_SIZE} bytes] " if LOG_MAX_SIZE else "") + (f"[interval: {display_time(LOG_ROTATE_INTERVAL)}] " if LOG_ROTATE_INTERVAL else "") + f"[backups: {LOG_BACKUP_COUNT}]")
     print(f"* Debug mode:\t\t\t{DEBUG_MODE}")
+    if CODE_PROFILER is not None:
+        print(f"* Code profiling:\t\t" + ("every cycle" if CODE_PROFILER.every == 1 else f"every {CODE_PROFILER.every} cycles") + f" ({Path(os.path.expanduser(SP_LOGFILE)).parent})")
     if not DISABLE_LOGGING and TRUNCATE_CHARS > 0:
         print(f"* Truncate terminal lines:\t{TRUNCATE_CHARS} chars")
     if TOKEN_SOURCE == 'oauth_user':